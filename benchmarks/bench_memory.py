@@ -0,0 +1,137 @@
+"""
+==========================================================================
+BENCHMARK MEMORI: PUNCAK RSS PERSIAPAN DATA TRAINING
+==========================================================================
+Membandingkan dua cara menyiapkan data training (notebook tahap 5):
+- asli    : dataset bersih lengkap (43 kolom, teks mentah + float64),
+            X float64, salinan X_train_imputed dan X_train_scaled terpisah
+- ringkas : frames.read_compact (tanpa teks mentah, int8 / float32),
+            X float32, imputasi + scaling in-place (frames.preprocess_inplace)
+Keduanya lanjut ke oversampling (tahap 5.5) dan fit Random Forest.
+
+Setiap mode dijalankan di proses terpisah agar puncak RSS tidak saling
+tercampur. Dengan --scale > 1 dataset bersih direplikasi ke file CSV
+sementara (teks tetap berupa string terpisah saat dibaca), simulasi data
+skala provinsi.
+
+Contoh: python benchmarks/bench_memory.py --scale 100
+==========================================================================
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.impute import SimpleImputer
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import StandardScaler
+
+from common import DATA_PATH
+from frames import memory_table, peak_rss_mb, preprocess_inplace, read_compact
+from oversampling import resample_training_data
+from schema import FEATURE_SCHEMA
+from training import make_forest
+
+
+def prepare_original(path):
+    """Tahap 5 seperti notebook sebelum frames.py"""
+    df = pd.read_csv(path)
+    X = FEATURE_SCHEMA.assemble(df)
+    y = df["label_obesitas"]
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
+    imputer = SimpleImputer(strategy='median')
+    X_train_imputed = imputer.fit_transform(X_train)
+    X_test_imputed = imputer.transform(X_test)
+    scaler = StandardScaler()
+    X_train_scaled = scaler.fit_transform(X_train_imputed)
+    X_test_scaled = scaler.transform(X_test_imputed)
+    objects = {'df': df, 'X': X, 'X_train': X_train, 'X_train_imputed': X_train_imputed,
+               'X_train_scaled': X_train_scaled, 'X_test_scaled': X_test_scaled}
+    return X_train_scaled, np.asarray(y_train), objects
+
+
+def prepare_compact(path):
+    """Tahap 5 dengan DataFrame ringkas dan preprocessing in-place"""
+    df = read_compact(path)
+    X = FEATURE_SCHEMA.assemble(df, dtype=np.float32)
+    y = df["label_obesitas"]
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
+    _, _, X_train_scaled, X_test_scaled = preprocess_inplace(X_train, X_test)
+    objects = {'df': df, 'X': X, 'X_train': X_train,
+               'X_train_scaled': X_train_scaled, 'X_test_scaled': X_test_scaled}
+    return X_train_scaled, np.asarray(y_train), objects
+
+
+def child(mode, path):
+    """Dijalankan di proses anak: cetak hasil pengukuran sebagai JSON"""
+    prepare = {'asli': prepare_original, 'ringkas': prepare_compact}[mode]
+    rss_start = peak_rss_mb()
+    start = time.perf_counter()
+    X_train_scaled, y_train, objects = prepare(path)
+    t_prepare = time.perf_counter() - start
+    rss_prepare = peak_rss_mb()
+    X_sm, y_sm = resample_training_data(X_train_scaled, y_train, method="smote_kdtree", random_state=42)
+    make_forest(n_estimators=20).fit(X_sm, y_sm)
+    print(json.dumps({
+        'mode': mode,
+        'rss_awal_mb': rss_start,
+        'puncak_rss_persiapan_mb': rss_prepare,
+        'puncak_rss_total_mb': peak_rss_mb(),
+        'waktu_persiapan_s': t_prepare,
+        'objek': memory_table(objects).to_dict('records')
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=int, default=1, help="Faktor replikasi dataset bersih")
+    parser.add_argument("--child", choices=["asli", "ringkas"], help=argparse.SUPPRESS)
+    parser.add_argument("--path", type=Path, default=DATA_PATH, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.path)
+        return
+    if peak_rss_mb() is None:
+        raise SystemExit("Puncak RSS tidak tersedia di platform ini (modul resource)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = DATA_PATH
+        if args.scale > 1:
+            # Replikasi baris sebagai teks: proses induk tidak memuat DataFrame besar
+            # (puncak RSS induk ikut terwarisi proses anak)
+            path = Path(tmp) / "dataset_bersih_besar.csv"
+            header, body = DATA_PATH.read_text(encoding="utf-8").split("\n", 1)
+            body = body.rstrip("\n") + "\n"
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(header + "\n")
+                for _ in range(args.scale):
+                    f.write(body)
+        results = []
+        for mode in ("asli", "ringkas"):
+            out = subprocess.run(
+                [sys.executable, __file__, "--child", mode, "--path", str(path)],
+                check=True, capture_output=True, text=True
+            )
+            results.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    print(f"Dataset: {DATA_PATH.name} x {args.scale}")
+    for r in results:
+        print(f"\n[{r['mode']}] ukuran objek:")
+        print(pd.DataFrame(r.pop('objek')).round(2).to_string(index=False))
+    summary = pd.DataFrame(results)
+    print("\n" + summary.round(2).to_string(index=False))
+    # Kenaikan di atas RSS awal (interpreter + library) = memori milik data
+    growth = summary["puncak_rss_total_mb"] - summary["rss_awal_mb"]
+    print(f"\nKenaikan puncak RSS di atas RSS awal: asli {growth.iloc[0]:.1f} MB, "
+          f"ringkas {growth.iloc[1]:.1f} MB (hemat {growth.iloc[0] - growth.iloc[1]:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+==========================================================================
+BENCHMARK MODEL: LOGISTIC REGRESSION vs RANDOM FOREST vs HIST GB
+==========================================================================
+Membandingkan waktu training, latency inferensi (satu siswa dan batch)
+serta F1/AUC pada data uji. Model pohon juga diukur dalam format flat
+(flat_trees.py). LR dan RF dilatih pada data oversampling seperti notebook
+tahap 5.5; HistGradientBoosting pada data asli dengan class_weight
+(lihat boosting.py).
+
+Contoh: python benchmarks/bench_models.py --scale 20
+==========================================================================
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics import f1_score, roc_auc_score, roc_curve
+
+from common import prepare_data, measure
+from boosting import make_hist_gb
+from flat_trees import flatten_forest, flatten_hist_gb, predict_flat
+from oversampling import resample_training_data
+from training import make_forest, make_logreg
+
+
+def youden_threshold(y_true, y_prob):
+    """Threshold Youden's J seperti find_optimal_threshold di notebook"""
+    fpr, tpr, thresholds = roc_curve(y_true, y_prob)
+    return thresholds[np.argmax(tpr - fpr)]
+
+
+def latency_ms(predict, X, repeat):
+    """Median latency (ms) dari repeat kali pemanggilan predict(X)"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        predict(X)
+        times.append(time.perf_counter() - start)
+    return float(np.median(times) * 1000)
+
+
+def make_models(n_jobs):
+    return {
+        "logreg": make_logreg(),
+        "rf": make_forest(n_jobs=n_jobs),
+        "hist_gb": make_hist_gb()
+    }
+
+
+def run_model(name, model, X_train, y_train, X_test, y_test, repeat):
+    _, t_fit, mem_fit = measure(model.fit, X_train, y_train)
+    prob = model.predict_proba(X_test)[:, 1]
+    threshold = youden_threshold(y_test, prob)
+    one = X_test[:1]
+    row = {
+        "model": name,
+        "waktu_fit_s": t_fit,
+        "memori_fit_mb": mem_fit,
+        "latency_1_ms": latency_ms(lambda X: model.predict_proba(X), one, repeat),
+        "latency_batch_ms": latency_ms(lambda X: model.predict_proba(X), X_test, max(repeat // 10, 3)),
+        "latency_1_flat_ms": np.nan,
+        "latency_batch_flat_ms": np.nan,
+        "auc": roc_auc_score(y_test, prob),
+        "f1": f1_score(y_test, (prob >= threshold).astype(int))
+    }
+
+    exporter = {"rf": flatten_forest, "hist_gb": flatten_hist_gb}.get(name)
+    if exporter is not None:
+        flat = exporter(model)
+        max_diff = np.abs(predict_flat(flat, X_test) - prob).max()
+        if max_diff > 1e-9:
+            raise AssertionError(f"Format flat {name} berbeda dari sklearn (selisih {max_diff:.2e})")
+        row["latency_1_flat_ms"] = latency_ms(lambda X: predict_flat(flat, X), one, repeat)
+        row["latency_batch_flat_ms"] = latency_ms(lambda X: predict_flat(flat, X), X_test, max(repeat // 10, 3))
+    if name == "hist_gb":
+        row["model"] = f"hist_gb ({model.n_iter_} iter)"
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=int, default=1, help="Faktor replikasi dataset (simulasi data besar)")
+    parser.add_argument("--repeat", type=int, default=100, help="Jumlah pengulangan pengukuran latency")
+    parser.add_argument("--n-jobs", type=int, default=None, help="n_jobs Random Forest")
+    args = parser.parse_args()
+
+    X_train, X_test, y_train, y_test = prepare_data(scale=args.scale)
+    X_train_sm, y_train_sm = resample_training_data(X_train, y_train, method="smote_kdtree", random_state=42)
+    print(f"Data train: {X_train.shape} (oversampling: {X_train_sm.shape}), uji: {X_test.shape}")
+
+    rows = []
+    for name, model in make_models(args.n_jobs).items():
+        X_fit, y_fit = (X_train, y_train) if name == "hist_gb" else (X_train_sm, y_train_sm)
+        rows.append(run_model(name, model, X_fit, y_fit, X_test, y_test, args.repeat))
+    print(pd.DataFrame(rows).round(4).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+==========================================================================
+BENCHMARK OVERSAMPLING (TAHAP 5.5)
+==========================================================================
+Membandingkan waktu, puncak memori dan F1 untuk:
+- imblearn SMOTE (perilaku lama)
+- smote_kdtree (KD-tree pada minoritas, output float32 per chunk)
+- class weight saja (tanpa resampling)
+- balanced bagging
+
+Contoh: python benchmarks/bench_oversampling.py --scale 50
+==========================================================================
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import f1_score
+
+from common import prepare_data, measure
+from oversampling import resample_training_data, make_balanced_bagging
+
+
+def run_resampled(method, X_train, y_train, X_test, y_test):
+    """Resampling + Logistic Regression, diukur terpisah per tahap"""
+    (X_res, y_res), t_res, mem_res = measure(
+        resample_training_data, X_train, y_train, method=method, k_neighbors=5
+    )
+    logreg = LogisticRegression(max_iter=1000, random_state=42, class_weight="balanced")
+    _, t_fit, mem_fit = measure(logreg.fit, X_res, y_res)
+    f1 = f1_score(y_test, logreg.predict(X_test))
+    return {
+        "metode": method,
+        "n_train": len(y_res),
+        "waktu_resample_s": t_res,
+        "waktu_fit_s": t_fit,
+        "memori_puncak_mb": max(mem_res, mem_fit),
+        "f1": f1
+    }
+
+
+def run_balanced_bagging(X_train, y_train, X_test, y_test):
+    model = make_balanced_bagging(n_estimators=50, random_state=42)
+    _, t_fit, mem_fit = measure(model.fit, X_train, y_train)
+    return {
+        "metode": "balanced_bagging",
+        "n_train": len(y_train),
+        "waktu_resample_s": 0.0,
+        "waktu_fit_s": t_fit,
+        "memori_puncak_mb": mem_fit,
+        "f1": f1_score(y_test, model.predict(X_test))
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=int, default=1, help="Faktor replikasi dataset (simulasi data besar)")
+    parser.add_argument("--skip-imblearn", action="store_true", help="Lewati imblearn SMOTE dan balanced bagging")
+    args = parser.parse_args()
+
+    X_train, X_test, y_train, y_test = prepare_data(scale=args.scale)
+    print(f"Data train: {X_train.shape}, minoritas={int(np.sum(y_train))}")
+
+    methods = ["smote_kdtree", "class_weight"]
+    if not args.skip_imblearn:
+        methods.insert(0, "smote")
+
+    rows = [run_resampled(m, X_train, y_train, X_test, y_test) for m in methods]
+    if not args.skip_imblearn:
+        rows.append(run_balanced_bagging(X_train, y_train, X_test, y_test))
+
+    print(pd.DataFrame(rows).round(4).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+==========================================================================
+BENCHMARK TRAINING PARALEL: SPEEDUP vs JUMLAH CORE
+==========================================================================
+Mengukur waktu fit Random Forest (tahap 7) dan jalur regularisasi LR
+(training.regularization_path, fold paralel) untuk beberapa nilai n_jobs.
+speedup = waktu n_jobs=1 / waktu n_jobs=k. Setiap hutan dicek identik
+bit-per-bit dengan hasil n_jobs=1 (forest_fingerprint), begitu juga
+koefisien jalur LR.
+
+Speedup tidak akan melebihi jumlah core fisik mesin (dicetak di awal).
+
+Contoh: python benchmarks/bench_parallel.py --scale 20 --jobs 1 2 4
+==========================================================================
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from common import prepare_data
+from oversampling import resample_training_data
+from training import make_forest, forest_fingerprint, regularization_path
+
+
+def best_time(func, repeat):
+    """Waktu tercepat (detik) dari repeat kali pemanggilan; hasil pemanggilan terakhir ikut dikembalikan"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return result, min(times)
+
+
+def resample(X, y):
+    return resample_training_data(X, y, method="smote_kdtree", random_state=42)
+
+
+def main():
+    cpu_count = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=int, default=1, help="Faktor replikasi dataset (simulasi data besar)")
+    parser.add_argument("--jobs", type=int, nargs="+", default=sorted({1, 2, 4, cpu_count}),
+                        help="Nilai n_jobs yang diukur")
+    parser.add_argument("--repeat", type=int, default=3, help="Jumlah pengulangan (diambil yang tercepat)")
+    args = parser.parse_args()
+
+    X_train, _, y_train, _ = prepare_data(scale=args.scale)
+    X_train_sm, y_train_sm = resample(X_train, y_train)
+    print(f"Data train: {X_train.shape} (oversampling: {X_train_sm.shape}), core tersedia: {cpu_count}")
+
+    jobs = sorted(set(args.jobs) | {1})
+    rows, reference = [], {}
+    for n_jobs in jobs:
+        rf, t_rf = best_time(lambda: make_forest(n_jobs=n_jobs).fit(X_train_sm, y_train_sm), args.repeat)
+        path, t_path = best_time(
+            lambda: regularization_path(X_train, y_train, resample=resample, n_jobs=n_jobs), args.repeat
+        )
+        fingerprint = forest_fingerprint(rf)
+        reference.setdefault('rf', fingerprint)
+        reference.setdefault('path', path['coef'])
+        rows.append({
+            "n_jobs": n_jobs,
+            "waktu_rf_s": t_rf,
+            "waktu_jalur_lr_s": t_path,
+            "rf_identik": fingerprint == reference['rf'],
+            "jalur_lr_identik": bool(np.array_equal(path['coef'], reference['path']))
+        })
+
+    result = pd.DataFrame(rows)
+    result["speedup_rf"] = result["waktu_rf_s"].iloc[0] / result["waktu_rf_s"]
+    result["speedup_jalur_lr"] = result["waktu_jalur_lr_s"].iloc[0] / result["waktu_jalur_lr_s"]
+    print(result.round(3).to_string(index=False))
+    print(f"\nJalur LR: {len(path['Cs'])} nilai C, best_C = {path['best_C']:.4g}, "
+          f"iterasi warm start total = {int(path['n_iter'].sum())}")
+    if not (result["rf_identik"].all() and result["jalur_lr_identik"].all()):
+        raise AssertionError("Hasil training berbeda antar n_jobs")
+
+
+if __name__ == "__main__":
+    main()
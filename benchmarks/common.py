@@ -0,0 +1,66 @@
+"""
+==========================================================================
+UTILITAS BERSAMA UNTUK BENCHMARK
+==========================================================================
+Memuat dataset bersih, memperbesarnya (opsional) untuk simulasi data skala
+provinsi, lalu menjalankan tahap 5.2 - 5.4 notebook (split, imputasi, scaling).
+==========================================================================
+"""
+
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.impute import SimpleImputer
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import StandardScaler
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+DATA_PATH = ROOT_DIR / "data" / "dataset_bersih.csv"
+
+# Agar modul di src/ dapat diimpor dari skrip benchmark
+sys.path.insert(0, str(ROOT_DIR / "src"))
+
+from schema import FEATURE_SCHEMA  # noqa: E402
+
+
+
+def load_dataset(scale=1, random_state=42):
+    """Muat fitur & label; scale > 1 mereplikasi baris dengan sedikit jitter"""
+    df = pd.read_csv(DATA_PATH)
+    X = FEATURE_SCHEMA.assemble(df, validate=True).to_numpy()
+    y = df["label_obesitas"].to_numpy()
+
+    if scale > 1:
+        rng = np.random.default_rng(random_state)
+        X = np.tile(X, (scale, 1))
+        y = np.tile(y, scale)
+        X += rng.normal(0, 0.05, size=X.shape)
+    return X, y
+
+
+def prepare_data(scale=1, random_state=42):
+    """Split, imputasi median dan StandardScaler seperti notebook tahap 5"""
+    X, y = load_dataset(scale, random_state)
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.2, random_state=random_state, stratify=y
+    )
+    imputer = SimpleImputer(strategy="median")
+    scaler = StandardScaler()
+    X_train = scaler.fit_transform(imputer.fit_transform(X_train))
+    X_test = scaler.transform(imputer.transform(X_test))
+    return X_train, X_test, y_train, y_test
+
+
+def measure(func, *args, **kwargs):
+    """Jalankan func dan kembalikan (hasil, waktu detik, puncak memori MB)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / 1024 ** 2
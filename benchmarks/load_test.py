@@ -0,0 +1,416 @@
+"""
+==========================================================================
+LOAD TEST: SIMULASI BANYAK PENGGUNA DASHBOARD BERSAMAAN
+==========================================================================
+Berapa siswa yang dapat dilayani satu replica Streamlit (src/app.py)
+sebelum latency melonjak? Setiap sesi simulasi mengisi sidebar secara acak
+dari himpunan opsi MAPPING_* (encoding.py) lalu menekan
+"Prediksi Risiko Obesitas", diselingi waktu berpikir acak.
+
+Driver:
+- core : jalur komputasi tombol prediksi di src/app.py (LR, RF, ensemble,
+         kategori & regresi BMI lewat inti micro-batch serving.py, what-if,
+         atribusi) dipanggil langsung, satu thread per sesi seperti thread
+         script Streamlit
+- app  : src/app.py lengkap lewat streamlit.testing AppTest (seluruh
+         halaman dijalankan ulang per klik, termasuk render)
+
+Setiap replica adalah satu proses; sesi dibagi rata antar replica.
+Per tingkat jumlah pengguna dicatat persentil latency, throughput, error,
+CPU, memori dan rata-rata ukuran micro-batch per replica. Kapasitas = jumlah pengguna terbesar dengan
+p95 <= SLO tanpa error. Laporan JSON (beserta commit, versi model dan
+library) dapat dibandingkan antar rilis dengan --compare. Pengaturan
+batching mengikuti environment app (PREDICTION_MAX_BATCH=1 mematikan
+batching, PREDICTION_MAX_WAIT_MS).
+
+Contoh:
+    python benchmarks/load_test.py --users 1 4 16 64 --duration 20
+    python benchmarks/load_test.py --driver app --users 1 2 4 8 --think-ms 1000
+    python benchmarks/load_test.py --compare benchmarks/results/load_test_core_rilis_lama.json
+    PREDICTION_MAX_BATCH=1 python benchmarks/load_test.py --users 16 64 --think-ms 100
+==========================================================================
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from common import ROOT_DIR
+from encoding import (
+    ENCODINGS, MAPPING_TIDUR, MAPPING_MAKAN, MAPPING_JAJAN, MAPPING_FASTFOOD,
+    MAPPING_MINUMAN, MAPPING_MAKAN_MALAM, MAPPING_AKTIVITAS, MAPPING_STRES,
+    MAPPING_TEMAN, MAPPING_MAKAN_STRES, MAPPING_VIDEO_MAKANAN
+)
+from frames import peak_rss_mb
+
+APP_PATH = ROOT_DIR / "src" / "app.py"
+RESULTS_DIR = ROOT_DIR / "benchmarks" / "results"
+
+# Fitur -> (label widget sidebar di app.py, opsi label -> nilai)
+SIDEBAR_FIELDS = {
+    'jenis_kelamin': ("Jenis Kelamin", ENCODINGS["jenis_kelamin"].options),
+    'keluarga_obesitas': ("Riwayat Keluarga Obesitas", ENCODINGS["keluarga_obesitas"].options),
+    'makan_per_hari': ("Frekuensi Makan/Hari", MAPPING_MAKAN),
+    'minuman_manis_per_minggu': ("Minuman Manis", MAPPING_MINUMAN),
+    'fastfood_per_minggu': ("Fast Food", MAPPING_FASTFOOD),
+    'jajan_per_minggu': ("Jajan", MAPPING_JAJAN),
+    'makan_setelah_21': ("Makan Setelah Jam 21:00", MAPPING_MAKAN_MALAM),
+    'makan_karena_stres': ("Makan Karena Stres", MAPPING_MAKAN_STRES),
+    'video_makanan': ("Menonton Video Makanan", MAPPING_VIDEO_MAKANAN),
+    'aktivitas_fisik': ("Tingkat Aktivitas Fisik", MAPPING_AKTIVITAS),
+    'durasi_tidur_jam': ("Durasi Tidur/Hari", MAPPING_TIDUR),
+    'tingkat_stres': ("Tingkat Stres", MAPPING_STRES),
+    'pengaruh_teman': ("Pengaruh Teman", MAPPING_TEMAN)
+}
+USIA_RANGE = (10, 25)
+KELAS_OPTIONS = ("X", "XI", "XII")
+
+
+def random_session_input(rng):
+    """
+    Satu isian sidebar acak. Mengembalikan (widget, input_data):
+    widget = label widget -> opsi yang dipilih; input_data = fitur -> nilai (seperti app.py).
+    """
+    usia = int(rng.integers(USIA_RANGE[0], USIA_RANGE[1] + 1))
+    widget = {"Usia (tahun)": usia, "Kelas": str(rng.choice(KELAS_OPTIONS))}
+    input_data = {'usia_tahun': usia}
+    for feature, (label, options) in SIDEBAR_FIELDS.items():
+        choice = list(options)[int(rng.integers(len(options)))]
+        widget[label] = choice
+        input_data[feature] = options[choice]
+    return widget, input_data
+
+
+# ==========================================
+# DRIVER
+# ==========================================
+class CoreDriver:
+    """Jalur komputasi tombol prediksi app.py tanpa render (model & explainer bersama per replica)"""
+
+    def __init__(self):
+        import app
+        from attribution import AttributionCache
+        from registry import load_artifact
+        from serving import PredictionBatcher
+        self.app = app
+        path = app.MODEL_DIR / "model_data.pkl"
+        self.model_data = load_artifact(path)
+        self.explainer = AttributionCache(self.model_data)
+        # Sama dengan load_prediction_core() di app.py (tanpa cache Streamlit)
+        self.core = PredictionBatcher(
+            max_batch_size=app.PREDICTION_MAX_BATCH, max_wait_ms=app.PREDICTION_MAX_WAIT_MS
+        )
+
+    def session(self):
+        return None
+
+    def submit(self, session, widget, input_data):
+        app, model_data = self.app, self.model_data
+        self.core.predict(input_data, model_data)
+        app.rank_counterfactuals(input_data, model_data, app.MODIFIABLE_FEATURES)
+        self.explainer.explain([input_data])
+
+    def stats(self):
+        return self.core.stats()
+
+
+class AppDriver:
+    """
+    src/app.py lengkap; satu AppTest per sesi (cache_resource bersama dalam replica).
+    AppTest dibuat untuk pengujian satu thread, sehingga angka driver ini
+    adalah perkiraan; driver core adalah ukuran kapasitas utama.
+    """
+
+    def __init__(self):
+        from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+        from streamlit.testing.v1 import app_test, local_script_runner
+        # Server Streamlit memakai satu ScriptCache per proses (script dikompilasi
+        # sekali); AppTest membuat yang baru setiap run. Kompilasi paralel dari
+        # banyak thread juga memicu SystemError di ast.parse Python 3.11.
+        shared_cache = ScriptCache()
+        app_test.ScriptCache = local_script_runner.ScriptCache = lambda: shared_cache
+        self.AppTest = app_test.AppTest
+
+    def session(self):
+        # Muat halaman pertama kali (dilakukan berurutan sebelum pengukuran)
+        at = self.AppTest.from_file(str(APP_PATH), default_timeout=120)
+        at.run()
+        return at
+
+    def submit(self, at, widget, input_data):
+        for box in at.sidebar.selectbox:
+            if box.label in widget:
+                box.set_value(widget[box.label])
+        at.sidebar.number_input[0].set_value(widget["Usia (tahun)"])
+        at.sidebar.button[0].click().run()
+        if at.exception:
+            raise RuntimeError(at.exception[0].value)
+
+    def stats(self):
+        # Inti prediksi ada di cache_resource script AppTest; tidak diakses dari sini
+        return None
+
+
+DRIVERS = {'core': CoreDriver, 'app': AppDriver}
+
+
+# ==========================================
+# REPLICA (SATU PROSES)
+# ==========================================
+def _current_rss_mb():
+    """RSS saat ini dari /proc (Linux); None jika tidak tersedia"""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE") / 1024 ** 2
+
+
+def _cpu_seconds():
+    times = os.times()
+    return times.user + times.system
+
+
+def run_replica(driver_name, replica, n_sessions, duration, think_ms, seed):
+    """Jalankan n_sessions sesi selama duration detik; kembalikan latency dan pemakaian sumber daya"""
+    driver = DRIVERS[driver_name]()
+    sessions = [driver.session() for _ in range(n_sessions)]
+    rngs = [np.random.default_rng([seed, replica, i]) for i in range(n_sessions)]
+    # Pemanasan: satu prediksi per sesi (cache, import lazy) di luar pengukuran
+    for session, rng in zip(sessions, rngs):
+        driver.submit(session, *random_session_input(rng))
+    batch_start = driver.stats()
+
+    latencies = [[] for _ in range(n_sessions)]
+    errors = [0] * n_sessions
+    error_messages = {}
+    rss_samples = []
+    start_barrier = threading.Barrier(n_sessions + 1)
+    stop = threading.Event()
+
+    def user(i):
+        start_barrier.wait()
+        rng = rngs[i]
+        # Mulai tersebar agar sesi tidak menekan tombol serentak
+        time.sleep(rng.uniform(0, think_ms / 1000))
+        while not stop.is_set():
+            widget, input_data = random_session_input(rng)
+            t0 = time.perf_counter()
+            try:
+                driver.submit(sessions[i], widget, input_data)
+                latencies[i].append(time.perf_counter() - t0)
+            except Exception as e:
+                errors[i] += 1
+                error_messages.setdefault(type(e).__name__, str(e)[:200])
+            if think_ms > 0:
+                stop.wait(rng.exponential(think_ms / 1000))
+
+    threads = [threading.Thread(target=user, args=(i,), daemon=True) for i in range(n_sessions)]
+    for t in threads:
+        t.start()
+    start_barrier.wait()
+    wall_start, cpu_start = time.perf_counter(), _cpu_seconds()
+    while time.perf_counter() - wall_start < duration:
+        rss = _current_rss_mb()
+        if rss is not None:
+            rss_samples.append(rss)
+        time.sleep(0.2)
+    stop.set()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - wall_start
+    cpu = _cpu_seconds() - cpu_start
+    batch_end = driver.stats()
+    mean_batch = None
+    if batch_start is not None and batch_end['batch'] > batch_start['batch']:
+        mean_batch = ((batch_end['permintaan'] - batch_start['permintaan'])
+                      / (batch_end['batch'] - batch_start['batch']))
+
+    return {
+        'replica': replica,
+        'sesi': n_sessions,
+        'latency_s': [x for per_session in latencies for x in per_session],
+        'error': int(sum(errors)),
+        'contoh_error': error_messages,
+        'durasi_s': wall,
+        'cpu_s': cpu,
+        'rss_rata2_mb': float(np.mean(rss_samples)) if rss_samples else None,
+        'puncak_rss_mb': peak_rss_mb(),
+        'ukuran_batch_rata2': mean_batch
+    }
+
+
+# ==========================================
+# AGREGASI & LAPORAN
+# ==========================================
+def latency_summary(latencies):
+    """Persentil latency dalam ms"""
+    ms = np.asarray(latencies, dtype=np.float64) * 1000
+    if len(ms) == 0:
+        return {k: None for k in ('p50_ms', 'p90_ms', 'p95_ms', 'p99_ms', 'maks_ms')}
+    p50, p90, p95, p99 = np.percentile(ms, [50, 90, 95, 99])
+    return {'p50_ms': p50, 'p90_ms': p90, 'p95_ms': p95, 'p99_ms': p99, 'maks_ms': float(ms.max())}
+
+
+def run_level(args, users):
+    """Satu tingkat beban: users sesi dibagi ke args.replicas proses"""
+    per_replica = np.array_split(np.arange(users), args.replicas)
+    context = get_context("spawn")
+    with ProcessPoolExecutor(max_workers=args.replicas, mp_context=context) as pool:
+        futures = [
+            pool.submit(run_replica, args.driver, r, len(idx), args.duration, args.think_ms, args.seed)
+            for r, idx in enumerate(per_replica) if len(idx)
+        ]
+        replicas = [f.result() for f in futures]
+
+    rows = []
+    for rep in replicas:
+        n = len(rep['latency_s'])
+        rows.append({
+            'replica': rep['replica'],
+            'sesi': rep['sesi'],
+            'permintaan': n,
+            'throughput_rps': n / rep['durasi_s'],
+            'error': rep['error'],
+            **latency_summary(rep['latency_s']),
+            'cpu_s': rep['cpu_s'],
+            'cpu_util': rep['cpu_s'] / rep['durasi_s'],
+            'rss_rata2_mb': rep['rss_rata2_mb'],
+            'puncak_rss_mb': rep['puncak_rss_mb'],
+            'ukuran_batch_rata2': rep['ukuran_batch_rata2'],
+            'contoh_error': rep['contoh_error']
+        })
+    all_latencies = [x for rep in replicas for x in rep['latency_s']]
+    n_requests = len(all_latencies)
+    n_errors = sum(rep['error'] for rep in replicas)
+    return {
+        'pengguna': users,
+        'permintaan': n_requests,
+        'throughput_rps': sum(r['throughput_rps'] for r in rows),
+        'error_rate': n_errors / max(n_requests + n_errors, 1),
+        **latency_summary(all_latencies),
+        'replicas': rows
+    }
+
+
+def capacity(levels, slo_p95_ms, n_replicas):
+    """Jumlah pengguna terbesar yang masih memenuhi SLO p95 tanpa error"""
+    ok = [lv['pengguna'] for lv in levels
+          if lv['p95_ms'] is not None and lv['p95_ms'] <= slo_p95_ms and lv['error_rate'] == 0]
+    users = max(ok) if ok else 0
+    return {'slo_p95_ms': slo_p95_ms, 'pengguna': users, 'pengguna_per_replica': users / n_replicas}
+
+
+def metadata(driver):
+    """Identitas rilis: commit git, versi model, library dan mesin"""
+    import sklearn
+    import streamlit
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    model_dir = Path(os.environ.get("MODEL_DIR", ROOT_DIR / "models"))
+    artifact = model_dir / "model_data.pkl"
+    return {
+        'dibuat': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'driver': driver,
+        'commit': commit,
+        # Format sama dengan ModelVersion.version di registry.py
+        'versi_model': f"{artifact.stem}-{int(artifact.stat().st_mtime)}" if artifact.exists() else None,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'sklearn': sklearn.__version__,
+        'streamlit': streamlit.__version__,
+        'cpu_count': os.cpu_count(),
+        'prediction_max_batch': os.environ.get("PREDICTION_MAX_BATCH"),
+        'prediction_max_wait_ms': os.environ.get("PREDICTION_MAX_WAIT_MS")
+    }
+
+
+def level_table(levels):
+    cols = ['pengguna', 'permintaan', 'throughput_rps', 'error_rate', 'p50_ms', 'p95_ms', 'p99_ms', 'maks_ms']
+    return pd.DataFrame([{c: lv[c] for c in cols} for lv in levels])
+
+
+def compare_reports(base, current):
+    """Tabel p95 dan throughput per tingkat pengguna: laporan lama vs baru"""
+    old = level_table(base['tingkat'])[['pengguna', 'p95_ms', 'throughput_rps']]
+    new = level_table(current['tingkat'])[['pengguna', 'p95_ms', 'throughput_rps']]
+    table = old.merge(new, on='pengguna', how='outer', suffixes=('_lama', '_baru'))
+    table['rasio_p95'] = table['p95_ms_baru'] / table['p95_ms_lama']
+    return table
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--driver", choices=list(DRIVERS), default="core")
+    parser.add_argument("--users", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32],
+                        help="Tingkat jumlah pengguna bersamaan (total semua replica)")
+    parser.add_argument("--replicas", type=int, default=1, help="Jumlah proses replica")
+    parser.add_argument("--duration", type=float, default=15.0, help="Durasi pengukuran per tingkat (detik)")
+    parser.add_argument("--think-ms", type=float, default=1000.0,
+                        help="Rata-rata waktu berpikir antar klik per sesi (eksponensial; 0 = tanpa jeda)")
+    parser.add_argument("--slo-p95-ms", type=float, default=500.0, help="Batas p95 latency untuk kapasitas")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=Path, default=None, help="File laporan JSON (default: benchmarks/results/)")
+    parser.add_argument("--compare", type=Path, default=None, help="Laporan JSON rilis sebelumnya")
+    args = parser.parse_args()
+
+    # Peringatan "bare mode" Streamlit saat src/app.py diimpor driver core
+    os.environ.setdefault("STREAMLIT_LOGGER_LEVEL", "error")
+    with tempfile.TemporaryDirectory() as tmp:
+        # Log prediksi dan results store app tidak ditulis ke folder proyek (diwarisi proses replica)
+        os.environ["PREDICTION_LOG_PATH"] = str(Path(tmp) / "predictions.sqlite")
+        os.environ["RESULTS_DB_PATH"] = str(Path(tmp) / "results.sqlite")
+        levels = []
+        for users in sorted(args.users):
+            print(f"[{args.driver}] {users} pengguna, {args.replicas} replica, {args.duration:.0f} detik ...", flush=True)
+            levels.append(run_level(args, users))
+
+    report = {
+        'meta': metadata(args.driver),
+        'konfigurasi': {k: (str(v) if isinstance(v, Path) else v) for k, v in vars(args).items()},
+        'tingkat': levels,
+        'kapasitas': capacity(levels, args.slo_p95_ms, args.replicas)
+    }
+
+    print("\n" + level_table(levels).round(3).to_string(index=False))
+    print("\nPer replica (tingkat beban tertinggi):")
+    replicas = pd.DataFrame(levels[-1]['replicas'])
+    print(replicas.drop(columns='contoh_error').round(2).to_string(index=False))
+    for rep in levels[-1]['replicas']:
+        for name, message in rep['contoh_error'].items():
+            print(f"  replica {rep['replica']}: {name}: {message}")
+    cap = report['kapasitas']
+    print(f"\nKapasitas (p95 <= {cap['slo_p95_ms']:.0f} ms, tanpa error): {cap['pengguna']} pengguna "
+          f"({cap['pengguna_per_replica']:.1f} per replica)")
+
+    if args.compare is not None:
+        base = json.loads(args.compare.read_text(encoding="utf-8"))
+        print(f"\nDibanding {args.compare.name} (commit {base['meta'].get('commit')}):")
+        print(compare_reports(base, report).round(3).to_string(index=False))
+        print(f"Kapasitas: {base['kapasitas']['pengguna']} -> {cap['pengguna']} pengguna")
+
+    output = args.output or RESULTS_DIR / f"load_test_{args.driver}_{time.strftime('%Y%m%d-%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp = output.with_suffix(".tmp")
+    tmp.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    tmp.replace(output)
+    print(f"\nLaporan ditulis ke {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,12 +10,29 @@ menggunakan Logistic Regression sebagai model utama
 import streamlit as st
 import pandas as pd
 import numpy as np
-import pickle
 import os
+import time
+import uuid
 import plotly.graph_objects as go
 import plotly.express as px
 from pathlib import Path
 
+from counterfactual import rank_counterfactuals
+from attribution import AttributionCache
+from schema import SchemaError
+from registry import ModelRegistry
+from monitoring import DriftMonitor, reference_from_dataset
+from prediction_log import PredictionLog
+from results_store import ResultsStore, ensure_store
+from serving import PredictionBatcher
+from calibration import calibrate
+from conformal import SET_LABELS, SET_BOTH
+from encoding import (
+    ENCODINGS, MAPPING_TIDUR, MAPPING_MAKAN, MAPPING_JAJAN, MAPPING_FASTFOOD,
+    MAPPING_MINUMAN, MAPPING_MAKAN_MALAM, MAPPING_AKTIVITAS, MAPPING_STRES,
+    MAPPING_TEMAN, MAPPING_MAKAN_STRES, MAPPING_VIDEO_MAKANAN
+)
+
 # ==========================================
 # KONFIGURASI HALAMAN
 # ==========================================
@@ -142,178 +159,169 @@ st.markdown("""
 # ==========================================
 # LOAD MODEL & ARTIFACTS
 # ==========================================
+# Folder artifact model; dapat diganti lewat environment variable
+MODEL_DIR = Path(os.environ.get("MODEL_DIR", Path(__file__).resolve().parent.parent / "models"))
+MODEL_RELOAD_INTERVAL = float(os.environ.get("MODEL_RELOAD_INTERVAL", "30"))
+MODEL_CANDIDATE_SHARE = float(os.environ.get("MODEL_CANDIDATE_SHARE", "0"))
+DRIFT_INTERVAL = float(os.environ.get("DRIFT_INTERVAL", "60"))
+# Micro-batching prediksi lintas sesi; PREDICTION_MAX_BATCH=1 mematikan batching
+PREDICTION_MAX_BATCH = int(os.environ.get("PREDICTION_MAX_BATCH", "32"))
+PREDICTION_MAX_WAIT_MS = float(os.environ.get("PREDICTION_MAX_WAIT_MS", "5"))
+DATA_PATH = Path(__file__).resolve().parent.parent / "data" / "dataset_bersih.csv"
+PREDICTION_LOG_PATH = Path(os.environ.get(
+    "PREDICTION_LOG_PATH", Path(__file__).resolve().parent.parent / "logs" / "predictions.sqlite"
+))
+RESULTS_DB_PATH = Path(os.environ.get(
+    "RESULTS_DB_PATH", Path(__file__).resolve().parent.parent / "data" / "results.sqlite"
+))
+
 @st.cache_resource
-def load_model():
-    """Load model dan artifacts dari file pickle"""
+def load_registry():
+    """Registry model bersama untuk semua sesi; versi baru dimuat di latar belakang"""
     try:
-        # Coba beberapa lokasi file yang mungkin
-        possible_paths = [
-            "model_data.pkl",
-            r"C:\Users\ANISETUS B. MANALU\kelompok_06\models\model_data.pkl",
-            "./model_data.pkl",
-            "models/model_data.pkl"
-        ]
-        
-        model_path = None
-        for path in possible_paths:
-            if os.path.exists(path):
-                model_path = path
-                break
-        
-        if model_path is None:
-            return None, "File model_data.pkl tidak ditemukan. Pastikan file ada di folder yang sama dengan aplikasi."
-            
-        with open(model_path, "rb") as f:
-            model_data = pickle.load(f)
-            
-        return model_data, None
-        
+        registry = ModelRegistry(
+            MODEL_DIR,
+            poll_interval=MODEL_RELOAD_INTERVAL,
+            candidate_share=MODEL_CANDIDATE_SHARE
+        )
+        return registry.start(), None
+    except FileNotFoundError as e:
+        return None, f"Artifact model tidak ditemukan: {str(e)}"
+    except SchemaError as e:
+        return None, f"Artifact model tidak sesuai skema fitur: {str(e)}"
     except Exception as e:
         return None, f"Terjadi kesalahan saat memuat model: {str(e)}"
 
-# ==========================================
-# MAPPING UNTUK INPUT
-# ==========================================
-MAPPING_TIDUR = {
-    "< 5 jam": 4.0,
-    "5-6 jam": 5.5,
-    "7-8 jam": 7.5,
-    "> 8 jam": 9.0
-}
-
-MAPPING_MAKAN = {
-    "1 kali": 1.0,
-    "2 kali": 2.0,
-    "3 kali": 3.0,
-    "> 3 kali": 4.0
-}
+def load_model():
+    """Pilih versi model untuk sesi ini (sticky per sesi, mengikuti A/B routing)"""
+    registry, error = load_registry()
+    if error:
+        return None, error
+    
+    if 'session_id' not in st.session_state:
+        st.session_state['session_id'] = uuid.uuid4().hex
+    return registry.route(st.session_state['session_id']), None
 
-MAPPING_JAJAN = {
-    "0-2 kali": 1.0,
-    "3-5 kali": 4.0,
-    "6-10 kali": 8.0,
-    "> 10 kali": 12.0
-}
+def load_explainer(model_version):
+    """
+    Explainer atribusi per versi model (pohon RF di-flatten sekali per versi).
+    Dimiliki registry dan dilepas bersama versinya saat hot reload.
+    """
+    explainer = model_version.resource('explainer', AttributionCache)
+    # Versi yang baru saja diganti registry: explainer sekali pakai tanpa cache
+    return explainer if explainer is not None else AttributionCache(model_version.model_data)
 
-MAPPING_FASTFOOD = {
-    "0-2 kali": 1,
-    "3-5 kali": 4,
-    "> 5 kali": 7
-}
+def _build_monitor(model_data):
+    reference = model_data.get('reference_distribution')
+    if reference is None:
+        if not DATA_PATH.exists():
+            return None
+        reference = reference_from_dataset(model_data, DATA_PATH)
+    return DriftMonitor(reference, interval=DRIFT_INTERVAL).start()
 
-MAPPING_MINUMAN = {
-    "0-2 gelas": 1,
-    "3-5 gelas": 4,
-    "6-10 gelas": 8,
-    "> 10 gelas": 12
-}
+def load_monitor(model_version):
+    """
+    Monitor drift per versi model; PSI/KL dihitung di thread latar belakang.
+    Dimiliki registry: thread timer dihentikan saat versinya diganti.
+    """
+    return model_version.resource('monitor', _build_monitor, release=DriftMonitor.stop)
 
-MAPPING_MAKAN_MALAM = {
-    "0 kali": 0.0,
-    "1 kali": 1.0,
-    "2-3 kali": 2.5,
-    "4 kali": 4.0,
-    "> 4 kali": 6.0
-}
+@st.cache_resource
+def load_prediction_log():
+    """Log prediksi bersama; penulisan ke SQLite dilakukan thread latar belakang"""
+    return PredictionLog(PREDICTION_LOG_PATH)
 
-MAPPING_AKTIVITAS = {
-    "Sangat Rendah": 1,
-    "Rendah": 2,
-    "Sedang": 3,
-    "Tinggi": 4,
-    "Sangat Tinggi": 5
-}
+@st.cache_resource
+def load_prediction_core():
+    """Inti prediksi bersama: permintaan dari semua sesi dinilai dalam micro-batch"""
+    return PredictionBatcher(max_batch_size=PREDICTION_MAX_BATCH, max_wait_ms=PREDICTION_MAX_WAIT_MS)
 
-MAPPING_STRES = {
-    "Sangat Rendah": 1,
-    "Rendah": 2,
-    "Sedang": 3,
-    "Tinggi": 4,
-    "Sangat Tinggi": 5
-}
+@st.cache_resource
+def load_results_store(version, _model_data):
+    """
+    Results store SQLite untuk laporan per sekolah; dibangun ulang bila versi model berubah.
+    Hanya dipanggil untuk versi aktif registry: satu file DB bersama, sehingga
+    versi kandidat A/B tidak boleh menimpanya.
+    """
+    if not DATA_PATH.exists():
+        return ResultsStore(RESULTS_DB_PATH) if RESULTS_DB_PATH.exists() else None
+    return ensure_store(RESULTS_DB_PATH, DATA_PATH, _model_data, version)
 
-MAPPING_TEMAN = {
-    "Sangat Rendah": 1,
-    "Rendah": 2,
-    "Sedang": 3,
-    "Tinggi": 4,
-    "Sangat Tinggi": 5
+# ==========================================
+# FITUR YANG DAPAT DIUBAH (UNTUK WHAT-IF)
+# ==========================================
+# direction: +1 = nilai lebih besar lebih sehat, -1 = nilai lebih kecil lebih sehat
+MODIFIABLE_FEATURES = {
+    'durasi_tidur_jam': {
+        'mapping': MAPPING_TIDUR, 'direction': 1,
+        'input_key': 'durasi_tidur', 'judul': 'Durasi Tidur', 'icon': '😴'
+    },
+    'minuman_manis_per_minggu': {
+        'mapping': MAPPING_MINUMAN, 'direction': -1,
+        'input_key': 'minuman_manis', 'judul': 'Minuman Manis', 'icon': '🥤'
+    },
+    'fastfood_per_minggu': {
+        'mapping': MAPPING_FASTFOOD, 'direction': -1,
+        'input_key': 'fastfood', 'judul': 'Fast Food', 'icon': '🍔'
+    },
+    'jajan_per_minggu': {
+        'mapping': MAPPING_JAJAN, 'direction': -1,
+        'input_key': 'jajan', 'judul': 'Jajan', 'icon': '🍿'
+    },
+    'makan_setelah_21': {
+        'mapping': MAPPING_MAKAN_MALAM, 'direction': -1,
+        'input_key': 'makan_malam', 'judul': 'Makan Setelah Jam 21:00', 'icon': '🌙'
+    },
+    'aktivitas_fisik': {
+        'mapping': MAPPING_AKTIVITAS, 'direction': 1,
+        'input_key': 'aktivitas_fisik', 'judul': 'Aktivitas Fisik', 'icon': '🏃'
+    }
 }
 
-MAPPING_MAKAN_STRES = {
-    "Sangat Jarang": 1,
-    "Jarang": 2,
-    "Kadang-kadang": 3,
-    "Sering": 4,
-    "Sangat Sering": 5
+# Label tampilan untuk setiap fitur model
+FEATURE_LABELS = {
+    'usia_tahun': 'Usia',
+    'jenis_kelamin': 'Jenis Kelamin',
+    'makan_per_hari': 'Makan/Hari',
+    'minuman_manis_per_minggu': 'Minuman Manis',
+    'fastfood_per_minggu': 'Fast Food',
+    'jajan_per_minggu': 'Jajan',
+    'aktivitas_fisik': 'Aktivitas Fisik',
+    'durasi_tidur_jam': 'Durasi Tidur',
+    'tingkat_stres': 'Tingkat Stres',
+    'pengaruh_teman': 'Pengaruh Teman',
+    'keluarga_obesitas': 'Riwayat Keluarga',
+    'makan_setelah_21': 'Makan Setelah 21:00',
+    'makan_karena_stres': 'Makan Karena Stres',
+    'video_makanan': 'Video Makanan'
 }
 
-MAPPING_VIDEO_MAKANAN = {
-    "0-2 jam": 1.0,
-    "3-5 jam": 4.0,
-    "6-10 jam": 8.0,
-    "> 10 jam": 12.0
-}
+# Penurunan probabilitas minimal agar sebuah perubahan ditampilkan
+MIN_PENURUNAN_RISIKO = 0.005
 
 # ==========================================
-# FUNGSI PREDIKSI - LOGISTIC REGRESSION SAJA
+# FUNGSI PREDIKSI
 # ==========================================
-def predict_obesity_logreg(input_data, model_data):
+def predict_all(input_data, model_data):
     """
-    Prediksi menggunakan Logistic Regression sebagai model utama
-    (Random Forest hanya untuk perbandingan, bukan bagian dari prediksi final)
+    Hasil semua model untuk satu siswa lewat inti prediksi bersama (serving.py).
+    Logistic Regression adalah model utama ('logreg'); Random Forest, ensemble
+    dan model BMI hanya untuk perbandingan/informasi (None bila tidak ada di artifact).
     """
-    logreg = model_data['logreg']
-    scaler = model_data['scaler']
-    imputer = model_data['imputer']
-    features = model_data['features']
-    threshold_lr = model_data['threshold_lr']  # Gunakan threshold optimal dari training
-    
-    # Buat DataFrame
-    data = pd.DataFrame([input_data], columns=features)
-    
-    # Imputasi dan scaling
-    data_imputed = imputer.transform(data)
-    data_scaled = scaler.transform(data_imputed)
-    
-    # Prediksi dengan Logistic Regression
-    prob_lr = logreg.predict_proba(data_scaled)[0, 1]
-    pred_lr = 1 if prob_lr >= threshold_lr else 0
-    
-    return {
-        'probability': prob_lr,
-        'prediction': pred_lr,
-        'threshold': threshold_lr
-    }
+    return load_prediction_core().predict(input_data, model_data)
 
-def get_random_forest_info(input_data, model_data):
-    """Hanya untuk informasi perbandingan, bukan untuk prediksi final"""
-    rf = model_data['rf']
-    scaler = model_data['scaler']
-    imputer = model_data['imputer']
-    features = model_data['features']
-    threshold_rf = model_data['threshold_rf']
-    
-    data = pd.DataFrame([input_data], columns=features)
-    data_imputed = imputer.transform(data)
-    data_scaled = scaler.transform(data_imputed)
-    
-    prob_rf = rf.predict_proba(data_scaled)[0, 1]
-    pred_rf = 1 if prob_rf >= threshold_rf else 0
-    
-    return {
-        'probability': prob_rf,
-        'prediction': pred_rf,
-        'threshold': threshold_rf
-    }
-
-def get_risk_level(probability, threshold=0.5396):
-    """Menentukan level risiko berdasarkan probabilitas"""
-    if probability < threshold - 0.2:
+def get_risk_level(probability, threshold=0.5396, calibration=None):
+    """
+    Menentukan level risiko berdasarkan probabilitas.
+    Dengan tabel kalibrasi, probability adalah probabilitas terkalibrasi dan
+    batas pita (threshold +/- 0.2 pada skor mentah) dipetakan ke skala yang sama.
+    """
+    low, mid, high = calibrate(np.array([threshold - 0.2, threshold, threshold + 0.2]), calibration)
+    if probability < low:
         return "RENDAH", "#28a745"
-    elif probability < threshold:
+    elif probability < mid:
         return "SEDANG", "#ffc107"
-    elif probability < threshold + 0.2:
+    elif probability < high:
         return "TINGGI", "#fd7e14"
     else:
         return "SANGAT TINGGI", "#dc3545"
@@ -377,6 +385,27 @@ def create_radar_chart(input_values, labels):
     )
     return fig
 
+def create_contribution_chart(contributions, title, unit):
+    """Membuat bar chart kontribusi fitur (merah menaikkan risiko, hijau menurunkan)"""
+    contributions = contributions.sort_values()
+    labels = [FEATURE_LABELS.get(f, f) for f in contributions.index]
+    colors = ['#dc3545' if v > 0 else '#28a745' for v in contributions.values]
+    
+    fig = go.Figure(go.Bar(
+        x=contributions.values,
+        y=labels,
+        orientation='h',
+        marker_color=colors
+    ))
+    
+    fig.update_layout(
+        title={'text': title, 'font': {'size': 16}},
+        xaxis_title=unit,
+        height=420,
+        margin=dict(l=20, r=20, t=50, b=40)
+    )
+    return fig
+
 # ==========================================
 # MAIN APPLICATION
 # ==========================================
@@ -389,19 +418,21 @@ def main():
     </div>
     """, unsafe_allow_html=True)
     
-    # Load model
-    model_data, error = load_model()
+    # Load model (versi dipilih oleh registry)
+    model_version, error = load_model()
     
     if error:
         st.error(f"⚠️ {error}")
         st.info("""
         **Penyelesaian masalah:**
-        1. Pastikan file `model_data.pkl` ada di folder yang sama
+        1. Pastikan file `model_data.pkl` ada di folder `models/`
         2. Atau jalankan script training terlebih dahulu
-        3. Atau letakkan file di: `C:\\Users\\ANISETUS B. MANALU\\kelompok_06\\models\\model_data.pkl`
+        3. Atau atur environment variable `MODEL_DIR` ke folder berisi `model_data.pkl`
         """)
         return
     
+    model_data = model_version.model_data
+    
     # ==========================================
     # SIDEBAR - INPUT FORM
     # ==========================================
@@ -412,8 +443,10 @@ def main():
         # Data Dasar
         st.markdown("### 👤 Data Dasar")
         usia = st.number_input("Usia (tahun)", min_value=10, max_value=25, value=16, step=1)
-        jenis_kelamin = st.selectbox("Jenis Kelamin", ["Laki-laki", "Perempuan"])
-        keluarga_obesitas = st.selectbox("Riwayat Keluarga Obesitas", ["Tidak", "Iya"])
+        jenis_kelamin = st.selectbox("Jenis Kelamin", ENCODINGS["jenis_kelamin"].labels)
+        keluarga_obesitas = st.selectbox("Riwayat Keluarga Obesitas", ENCODINGS["keluarga_obesitas"].labels)
+        asal_sekolah = st.text_input("Asal Sekolah", "")
+        kelas = st.selectbox("Kelas", ["X", "XI", "XII"])
         
         st.markdown("---")
         
@@ -425,7 +458,7 @@ def main():
         jajan = st.selectbox("Jajan", list(MAPPING_JAJAN.keys()), index=1)
         makan_malam = st.selectbox("Makan Setelah Jam 21:00", list(MAPPING_MAKAN_MALAM.keys()), index=1)
         makan_stres = st.selectbox("Makan Karena Stres", list(MAPPING_MAKAN_STRES.keys()), index=1)
-        video_makanan = st.selectbox("Menonton Video Makanan (jam)", list(MAPPING_VIDEO_MAKANAN.keys()), index=1)
+        video_makanan = st.selectbox("Menonton Video Makanan", list(MAPPING_VIDEO_MAKANAN.keys()), index=3)
 
         st.markdown("---")
         
@@ -447,13 +480,36 @@ def main():
         with st.expander("ℹ️ **Informasi Model**"):
             st.info(f"""
             **Model Utama:** Logistic Regression
-            **Threshold Optimal:** {model_data.get('threshold_lr', 0.5396):.4f}
+            **Versi Model:** {model_version.version}
+            **Threshold Optimal (skor mentah):** {model_data.get('threshold_lr', 0.5396):.4f}
             **Fitur:** {len(model_data['features'])} variabel
             **Alasan Pemilihan:**
             - Performa lebih konsisten pada data tidak seimbang
             - Interpretasi koefisien yang jelas
             - Probabilitas yang stabil
             """)
+            if model_data.get('stale_thresholds'):
+                st.warning(
+                    f"Model sudah diperbarui inkremental {model_data.get('n_updates', 0)} kali; "
+                    "threshold optimal masih dari training penuh terakhir dan perlu dipilih ulang."
+                )
+        
+        with st.expander("📈 **Metrik Versi Model**"):
+            metrics = load_registry()[0].metrics()
+            if metrics:
+                st.dataframe(pd.DataFrame(metrics), hide_index=True)
+            else:
+                st.caption("Belum ada prediksi yang tercatat")
+        
+        with st.expander("🛰️ **Drift Data Input**"):
+            monitor = load_monitor(model_version)
+            report = monitor.report if monitor is not None else None
+            if report is not None:
+                dropped = f" ({report['n_dropped']} dibuang, antrian penuh)" if report.get('n_dropped') else ""
+                st.caption(f"{report['n_seen']} input tercatat{dropped}, diperbarui {time.strftime('%H:%M:%S', time.localtime(report['waktu']))}")
+                st.dataframe(report['tabel'][['fitur', 'psi', 'status']].round(3), hide_index=True)
+            else:
+                st.caption("Laporan drift belum tersedia")
         
         # Tombol Prediksi
         predict_button = st.button("🔍 Prediksi Risiko Obesitas", type="primary", use_container_width=True)
@@ -463,39 +519,76 @@ def main():
     # ==========================================
     if predict_button:
         # Encode input values
-        jk_encode = 1 if jenis_kelamin == "Laki-laki" else 0
-        keluarga_encode = 1 if keluarga_obesitas == "Iya" else 0
+        jk_encode = ENCODINGS["jenis_kelamin"].options[jenis_kelamin]
+        keluarga_encode = ENCODINGS["keluarga_obesitas"].options[keluarga_obesitas]
         
-        # Build input data
-        input_data = [
-            usia,
-            jk_encode,
-            MAPPING_MAKAN[makan_per_hari],
-            MAPPING_MINUMAN[minuman_manis],
-            MAPPING_FASTFOOD[fastfood],
-            MAPPING_JAJAN[jajan],
-            MAPPING_AKTIVITAS[aktivitas_fisik],
-            MAPPING_TIDUR[durasi_tidur],
-            MAPPING_STRES[tingkat_stres],
-            MAPPING_TEMAN[pengaruh_teman],
-            keluarga_encode,
-            MAPPING_MAKAN_MALAM[makan_malam],
-            MAPPING_AKTIVITAS[aktivitas_fisik],  # aktivitas_harian sama dengan aktivitas_fisik
-            MAPPING_MAKAN_STRES[makan_stres],
-            MAPPING_VIDEO_MAKANAN[video_makanan]
-        ]
+        # Build input data (berdasarkan nama fitur, lihat schema.py)
+        input_data = {
+            'usia_tahun': usia,
+            'jenis_kelamin': jk_encode,
+            'makan_per_hari': MAPPING_MAKAN[makan_per_hari],
+            'minuman_manis_per_minggu': MAPPING_MINUMAN[minuman_manis],
+            'fastfood_per_minggu': MAPPING_FASTFOOD[fastfood],
+            'jajan_per_minggu': MAPPING_JAJAN[jajan],
+            'aktivitas_fisik': MAPPING_AKTIVITAS[aktivitas_fisik],
+            'durasi_tidur_jam': MAPPING_TIDUR[durasi_tidur],
+            'tingkat_stres': MAPPING_STRES[tingkat_stres],
+            'pengaruh_teman': MAPPING_TEMAN[pengaruh_teman],
+            'keluarga_obesitas': keluarga_encode,
+            'makan_setelah_21': MAPPING_MAKAN_MALAM[makan_malam],
+            'makan_karena_stres': MAPPING_MAKAN_STRES[makan_stres],
+            'video_makanan': MAPPING_VIDEO_MAKANAN[video_makanan]
+        }
         
-        # Predict dengan Logistic Regression (model utama)
-        result_logreg = predict_obesity_logreg(input_data, model_data)
+        # Predict semua model dalam satu micro-batch (Logistic Regression = model utama)
+        start = time.perf_counter()
+        results = predict_all(input_data, model_data)
+        latency = time.perf_counter() - start
+        result_logreg = results['logreg']
+        load_registry()[0].record(
+            model_version.version,
+            latency,
+            result_logreg['probability'],
+            result_logreg['prediction']
+        )
+        monitor = load_monitor(model_version)
+        if monitor is not None:
+            monitor.record(input_data, result_logreg['probability'])
         
         # Untuk perbandingan saja (tidak digunakan dalam prediksi final)
-        result_rf = get_random_forest_info(input_data, model_data)
+        result_rf = results['rf']
+        result_ensemble = results['ensemble']
+        result_bmi = results['bmi_category']
+        result_bmi_reg = results['bmi_regression']
+        
+        # Audit trail: ditulis ke SQLite oleh thread latar belakang
+        load_prediction_log().log(
+            input_data,
+            result_logreg,
+            result_rf,
+            model_version=model_version.version,
+            latency_ms=latency * 1000,
+            sekolah=asal_sekolah,
+            kelas=kelas
+        )
+        
+        # What-if: semua perubahan 1-2 fitur dinilai dalam satu batch
+        start = time.perf_counter()
+        prob_awal, whatif = rank_counterfactuals(input_data, model_data, MODIFIABLE_FEATURES)
+        whatif_ms = (time.perf_counter() - start) * 1000
         
         # Store in session state
         st.session_state['result_logreg'] = result_logreg
         st.session_state['result_rf'] = result_rf
+        st.session_state['result_ensemble'] = result_ensemble
+        st.session_state['result_bmi'] = result_bmi
+        st.session_state['result_bmi_reg'] = result_bmi_reg
+        st.session_state['whatif'] = (prob_awal, whatif, whatif_ms)
+        st.session_state['attribution'] = load_explainer(model_version).explain([input_data])[0]
         st.session_state['input_labels'] = {
             'usia': usia,
+            'asal_sekolah': asal_sekolah,
+            'kelas': kelas,
             'jenis_kelamin': jenis_kelamin,
             'keluarga_obesitas': keluarga_obesitas,
             'makan_per_hari': makan_per_hari,
@@ -525,11 +618,13 @@ def main():
         with tab1:
             # Ambil hasil Logistic Regression (model utama)
             pred = result_logreg['prediction']
-            prob = result_logreg['probability']
-            threshold = result_logreg['threshold']
+            prob = result_logreg['calibrated_probability']
+            # Threshold ditampilkan pada skala yang sama dengan probabilitas (terkalibrasi);
+            # kalibrasi monoton sehingga prediksi skor mentah >= threshold mentah tetap konsisten
+            threshold = float(calibrate(result_logreg['threshold'], result_logreg['calibration']))
             
-            # Tentukan tingkat risiko
-            risk_level, risk_color = get_risk_level(prob, threshold)
+            # Tentukan tingkat risiko (pada skala probabilitas terkalibrasi)
+            risk_level, risk_color = get_risk_level(prob, result_logreg['threshold'], result_logreg['calibration'])
             
             # Display result
             if pred == 1:
@@ -551,10 +646,36 @@ def main():
                 </div>
                 """, unsafe_allow_html=True)
             
+            if result_logreg['calibration'] is not None:
+                st.caption(
+                    f"Probabilitas dan threshold terkalibrasi ({result_logreg['calibration']['method']}); "
+                    f"skor mentah model: {result_logreg['probability']*100:.1f}%, "
+                    f"threshold mentah: {result_logreg['threshold']:.4f}"
+                )
+            
+            if result_logreg.get('prediction_set') is not None:
+                conformal = result_logreg['conformal']
+                coverage = 1 - conformal['alpha']
+                if 'jaminan_cakupan' in conformal:
+                    # CV+: target 1 - alpha, dengan batas bawah cakupan yang terjamin
+                    coverage_text = f"target cakupan {coverage:.0%}, dijamin minimal {conformal['jaminan_cakupan']:.0%}"
+                else:
+                    # Artifact lama (kuantil out-of-fold untuk model final): tanpa jaminan
+                    coverage_text = f"perkiraan cakupan {coverage:.0%}"
+                set_text = (
+                    f"Himpunan prediksi ({coverage_text}): "
+                    f"{SET_LABELS[result_logreg['prediction_set']]}"
+                )
+                if result_logreg['prediction_set'] == SET_BOTH:
+                    st.warning(f"{set_text} — model belum cukup yakin, sebaiknya dikonfirmasi dengan pengukuran langsung")
+                else:
+                    st.caption(set_text)
+            
             st.markdown("<br>", unsafe_allow_html=True)
             
             # Gauge Chart
-            col1, col2 = st.columns(2)
+            result_ensemble = st.session_state.get('result_ensemble')
+            col1, col2, *col3 = st.columns(3 if result_ensemble else 2)
             
             with col1:
                 st.plotly_chart(
@@ -571,17 +692,64 @@ def main():
             with col2:
                 # Untuk perbandingan saja
                 result_rf = st.session_state['result_rf']
+                threshold_rf = float(calibrate(result_rf['threshold'], result_rf['calibration']))
                 st.plotly_chart(
-                    create_gauge_chart(result_rf['probability'], "Random Forest (Pembanding)"),
+                    create_gauge_chart(result_rf['calibrated_probability'], "Random Forest (Pembanding)"),
                     use_container_width=True
                 )
                 st.markdown(f"""
                 <div style="text-align: center">
                     <p><b>Prediksi:</b> {"Obesitas" if result_rf['prediction'] == 1 else "Tidak Obesitas"}</p>
-                    <p><b>Threshold:</b> {result_rf['threshold']:.4f}</p>
+                    <p><b>Threshold:</b> {threshold_rf:.4f}</p>
                 </div>
                 """, unsafe_allow_html=True)
             
+            if result_ensemble:
+                with col3[0]:
+                    st.plotly_chart(
+                        create_gauge_chart(result_ensemble['probability'], f"Ensemble LR + RF ({result_ensemble['method']})"),
+                        use_container_width=True
+                    )
+                    st.markdown(f"""
+                    <div style="text-align: center">
+                        <p><b>Prediksi:</b> {"Obesitas" if result_ensemble['prediction'] == 1 else "Tidak Obesitas"}</p>
+                        <p><b>Threshold:</b> {result_ensemble['threshold']:.4f}</p>
+                    </div>
+                    """, unsafe_allow_html=True)
+            
+            # Perkiraan BMI: regresi dengan interval + distribusi kategori (multikelas)
+            result_bmi = st.session_state.get('result_bmi')
+            result_bmi_reg = st.session_state.get('result_bmi_reg')
+            if result_bmi or result_bmi_reg:
+                st.markdown("---")
+                st.markdown("### ⚖️ Perkiraan BMI (Standar Asia)")
+            if result_bmi_reg:
+                st.metric(
+                    "Perkiraan BMI",
+                    f"{result_bmi_reg['bmi']:.1f}",
+                    help="Regresi BMI dari pola gaya hidup (bukan dari berat/tinggi)"
+                )
+                st.caption(
+                    f"Interval prediksi {result_bmi_reg['level']:.0%}: "
+                    f"{result_bmi_reg['low']:.1f} - {result_bmi_reg['high']:.1f}"
+                )
+            if result_bmi:
+                fig_bmi = go.Figure(go.Bar(
+                    x=result_bmi['classes'],
+                    y=result_bmi['probabilities'] * 100,
+                    marker_color=['#dc3545' if c == result_bmi['category'] else '#1e88e5' for c in result_bmi['classes']],
+                    text=[f"{p*100:.1f}%" for p in result_bmi['probabilities']],
+                    textposition='outside'
+                ))
+                fig_bmi.update_layout(
+                    yaxis_title="Probabilitas (%)",
+                    yaxis_range=[0, 105],
+                    height=320,
+                    margin=dict(l=20, r=20, t=20, b=20)
+                )
+                st.plotly_chart(fig_bmi, use_container_width=True)
+                st.caption(f"Kategori paling mungkin: {result_bmi['category']} (LR multinomial)")
+            
             # Informasi Model
             st.markdown("---")
             st.markdown("### ℹ️ Alasan Pemilihan Model")
@@ -636,6 +804,27 @@ def main():
             fig_radar = create_radar_chart(radar_values, radar_labels)
             st.plotly_chart(fig_radar, use_container_width=True)
             
+            # Atribusi fitur per prediksi
+            st.markdown("---")
+            st.markdown("### 🔍 Faktor yang Mempengaruhi Prediksi")
+            st.caption("Merah menaikkan risiko, hijau menurunkan risiko dibanding siswa rata-rata")
+            
+            attribution = st.session_state['attribution']
+            col1, col2 = st.columns(2)
+            with col1:
+                st.plotly_chart(
+                    create_contribution_chart(attribution['lr'], "Logistic Regression (Model Utama)", "Kontribusi (log-odds)"),
+                    use_container_width=True
+                )
+            with col2:
+                if attribution['rf'] is not None:
+                    st.plotly_chart(
+                        create_contribution_chart(attribution['rf'], "Random Forest (Pembanding)", "Kontribusi (probabilitas)"),
+                        use_container_width=True
+                    )
+                else:
+                    st.caption("Atribusi Random Forest tidak tersedia pada artifact ringkas")
+            
             # Ringkasan Data
             st.markdown("---")
             st.markdown("### 📋 Ringkasan Data Input")
@@ -669,52 +858,26 @@ def main():
         with tab3:
             st.markdown("### 💡 Rekomendasi Personal")
             
-            recommendations = []
-            
-            # Pola Makan
-            if MAPPING_MINUMAN[input_labels['minuman_manis']] > 4:
-                recommendations.append((
-                    "🥤", 
-                    "Kurangi Minuman Manis", 
-                    f"Anda mengonsumsi {input_labels['minuman_manis']} per minggu. Batasi maksimal 3-5 gelas per minggu."
-                ))
-            
-            if MAPPING_FASTFOOD[input_labels['fastfood']] > 3:
-                recommendations.append((
-                    "🍔", 
-                    "Kurangi Fast Food", 
-                    f"Anda mengonsumsi {input_labels['fastfood']} per minggu. Batasi maksimal 1-2 kali per minggu."
-                ))
-            
-            if MAPPING_JAJAN[input_labels['jajan']] > 4:
-                recommendations.append((
-                    "🍿", 
-                    "Kontrol Jajan", 
-                    f"Anda jajan {input_labels['jajan']} per minggu. Kurangi dan pilih camilan sehat."
-                ))
-            
-            # Aktivitas
-            if MAPPING_AKTIVITAS[input_labels['aktivitas_fisik']] < 3:
-                recommendations.append((
-                    "🏃", 
-                    "Tingkatkan Aktivitas Fisik", 
-                    "Aktivitas fisik Anda rendah. Targetkan olahraga minimal 3 kali per minggu."
-                ))
-            
-            # Tidur
-            if MAPPING_TIDUR[input_labels['durasi_tidur']] < 7:
-                recommendations.append((
-                    "😴", 
-                    "Perbaiki Pola Tidur", 
-                    f"Anda tidur {input_labels['durasi_tidur']}. Targetkan 7-8 jam per malam."
-                ))
+            prob_awal, whatif, whatif_ms = st.session_state['whatif']
+            st.caption(
+                f"Diurutkan berdasarkan penurunan risiko yang diprediksi model "
+                f"({len(whatif)} skenario perubahan dinilai dalam {whatif_ms:.0f} ms)"
+            )
             
-            # Stres
-            if MAPPING_STRES[input_labels['tingkat_stres']] > 3:
+            recommendations = []
+            for _, row in whatif[whatif['penurunan'] >= MIN_PENURUNAN_RISIKO].head(5).iterrows():
+                info = [MODIFIABLE_FEATURES[name] for name, _, _ in row['perubahan']]
+                icon = "".join(f['icon'] for f in info)
+                title = " + ".join(f"Ubah {f['judul']}" for f in info)
+                detail = "; ".join(
+                    f"{f['judul']}: {input_labels[f['input_key']]} → {label}"
+                    for f, (_, label, _) in zip(info, row['perubahan'])
+                )
                 recommendations.append((
-                    "🧘", 
-                    "Kelola Stres", 
-                    f"Tingkat stres Anda {input_labels['tingkat_stres']}. Coba meditasi atau teknik relaksasi."
+                    icon,
+                    title,
+                    f"{detail}. Risiko turun {row['penurunan']*100:.1f} poin persen "
+                    f"({prob_awal*100:.1f}% → {row['probabilitas']*100:.1f}%)."
                 ))
             
             # Tampilkan rekomendasi
@@ -791,10 +954,46 @@ def main():
                 st.metric("Model Utama", "Logistic Regression")
             
             with col2:
-                st.metric("Threshold Optimal", f"{model_data.get('threshold_lr', 0.5396):.4f}")
+                st.metric("Threshold Optimal (skor mentah)", f"{model_data.get('threshold_lr', 0.5396):.4f}")
             
             with col3:
                 st.metric("Jumlah Fitur", len(model_data['features']))
+            
+            # Laporan per sekolah dari results store (tabel ringkasan)
+            # Laporan selalu dari versi aktif (bukan kandidat A/B yang mungkin dipakai sesi ini)
+            active = load_registry()[0].active
+            store = load_results_store(active.version, active.model_data)
+            if store is not None:
+                st.markdown("### 🏫 Ringkasan Risiko per Sekolah")
+                
+                col1, col2 = st.columns(2)
+                with col1:
+                    grouping = st.selectbox(
+                        "Kelompokkan berdasarkan",
+                        ["Sekolah", "Sekolah & Kelas", "Kelas", "Jenis Kelamin", "Level Risiko"]
+                    )
+                with col2:
+                    sekolah_filter = st.selectbox("Filter Sekolah", ["Semua"] + store.options('sekolah'))
+                
+                by = {
+                    "Sekolah": ("sekolah",),
+                    "Sekolah & Kelas": ("sekolah", "kelas"),
+                    "Kelas": ("kelas",),
+                    "Jenis Kelamin": ("jenis_kelamin",),
+                    "Level Risiko": ("risiko",)
+                }[grouping]
+                summary = store.summary(
+                    by=by,
+                    sekolah=None if sekolah_filter == "Semua" else sekolah_filter
+                )
+                summary['persen_berisiko'] = (summary['persen_berisiko'] * 100).round(1)
+                summary['rata_probabilitas'] = summary['rata_probabilitas'].round(3)
+                st.dataframe(summary, hide_index=True, use_container_width=True)
+                meta = store.meta()
+                st.caption(
+                    f"Sumber: {DATA_PATH.name}, diskor dengan model aktif {meta.get('model_version')}; "
+                    f"rata_probabilitas pada skala {meta.get('skala_probabilitas', 'mentah')}"
+                )
 
 # ==========================================
 # RUN APPLICATION
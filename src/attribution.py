@@ -0,0 +1,123 @@
+"""
+==========================================================================
+ATRIBUSI FITUR PER PREDIKSI
+==========================================================================
+Menjelaskan MENGAPA model memberi skor tertentu untuk seorang siswa:
+- Logistic Regression: kontribusi linear eksak coef_j * z_j (dalam log-odds)
+  relatif terhadap siswa rata-rata (input ter-scaling = 0)
+- Random Forest: kontribusi jalur keputusan (path-dependent, gaya TreeSHAP
+  cepat / Saabas) dari seluruh pohon yang di-flatten menjadi satu matriks
+  sparse node x fitur, sehingga satu batch cukup satu perkalian matriks.
+Untuk kedua model: bias + jumlah kontribusi = skor model.
+==========================================================================
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from schema import FEATURE_SCHEMA
+
+
+# ==========================================
+# LOGISTIC REGRESSION
+# ==========================================
+def explain_logreg(X_scaled, logreg, features):
+    """
+    Kontribusi eksak LR dalam log-odds.
+    Mengembalikan (bias, DataFrame kontribusi n_sampel x n_fitur).
+    """
+    X_scaled = np.atleast_2d(X_scaled)
+    contrib = X_scaled * logreg.coef_[0]
+    return float(logreg.intercept_[0]), pd.DataFrame(contrib, columns=features)
+
+
+# ==========================================
+# RANDOM FOREST
+# ==========================================
+class ForestExplainer:
+    """
+    Atribusi RF dari pohon yang di-flatten. Matriks delta node x fitur
+    dibangun sekali per model; penjelasan batch = decision_path @ delta.
+    """
+
+    def __init__(self, rf, features, positive_class=1):
+        self.rf = rf
+        self.features = list(features)
+        n_features = len(self.features)
+        class_idx = list(rf.classes_).index(positive_class)
+
+        rows, cols, vals = [], [], []
+        bias = 0.0
+        offset = 0
+        for estimator in rf.estimators_:
+            tree = estimator.tree_
+            value = tree.value[:, 0, :]
+            prob = value[:, class_idx] / value.sum(axis=1)
+            bias += prob[0]
+
+            internal = np.where(tree.children_left >= 0)[0]
+            for children in (tree.children_left, tree.children_right):
+                child = children[internal]
+                rows.append(offset + child)
+                cols.append(tree.feature[internal])
+                vals.append(prob[child] - prob[internal])
+            offset += tree.node_count
+
+        n_trees = len(rf.estimators_)
+        self.bias = bias / n_trees
+        self.delta = sparse.csr_matrix(
+            (np.concatenate(vals) / n_trees, (np.concatenate(rows), np.concatenate(cols))),
+            shape=(offset, n_features)
+        )
+
+    def explain(self, X_scaled):
+        """Mengembalikan (bias, DataFrame kontribusi probabilitas n_sampel x n_fitur)"""
+        X_scaled = np.atleast_2d(X_scaled)
+        indicator, _ = self.rf.decision_path(X_scaled)
+        contrib = np.asarray((indicator @ self.delta).todense())
+        return self.bias, pd.DataFrame(contrib, columns=self.features)
+
+
+# ==========================================
+# CACHE PENJELASAN
+# ==========================================
+class AttributionCache:
+    """
+    Cache atribusi per input. Baris yang belum pernah dijelaskan dihitung
+    sekaligus dalam satu batch, lalu disimpan per tuple nilai input.
+    """
+
+    def __init__(self, model_data, max_size=10_000):
+        self.model_data = model_data
+        self.features = model_data['features']
+        # Artifact ringkas (compact.py) tidak menyimpan node internal RF
+        rf = model_data['rf']
+        self.forest = ForestExplainer(rf, self.features) if hasattr(rf, 'estimators_') else None
+        self.max_size = max_size
+        self._cache = {}
+
+    def _transform(self, X):
+        data = pd.DataFrame(X, columns=self.features)
+        imputer = self.model_data['imputer']
+        return self.model_data['scaler'].transform(imputer.transform(data))
+
+    def explain(self, records):
+        """
+        records: dict, list of dict, atau DataFrame input mentah (disusun per nama fitur)
+        Mengembalikan list dict {'lr': Series log-odds, 'rf': Series probabilitas atau None}
+        """
+        X = FEATURE_SCHEMA.assemble(records).to_numpy()
+        keys = [tuple(row) for row in X.tolist()]
+        missing_keys = [k for k in dict.fromkeys(keys) if k not in self._cache]
+
+        if missing_keys:
+            X_scaled = self._transform(np.array(missing_keys))
+            _, lr = explain_logreg(X_scaled, self.model_data['logreg'], self.features)
+            rf = self.forest.explain(X_scaled)[1] if self.forest is not None else None
+            if len(self._cache) + len(missing_keys) > self.max_size:
+                self._cache.clear()
+            for i, key in enumerate(missing_keys):
+                self._cache[key] = {'lr': lr.iloc[i], 'rf': rf.iloc[i] if rf is not None else None}
+
+        return [self._cache[k] for k in keys]
@@ -0,0 +1,118 @@
+"""
+==========================================================================
+KALIBRASI PROBABILITAS
+==========================================================================
+Model dilatih pada data hasil oversampling (SMOTE) sehingga probabilitasnya
+bergeser dari prevalensi sebenarnya. Kalibrator (isotonic atau Platt)
+dilatih pada skor out-of-fold dari data training ASLI, lalu diekspor
+sebagai tabel piecewise-linear {'x': [...], 'y': [...]} di artifact.
+Saat serving cukup np.interp(prob, x, y) tanpa model sklearn tambahan.
+==========================================================================
+"""
+
+import numpy as np
+from sklearn.base import clone
+from sklearn.isotonic import IsotonicRegression
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import StratifiedKFold
+
+CALIBRATION_METHODS = ("isotonic", "platt")
+
+# Jumlah titik grid untuk mengekspor kurva Platt (sigmoid) sebagai tabel
+PLATT_GRID_POINTS = 101
+
+
+# ==========================================
+# SKOR OUT-OF-FOLD
+# ==========================================
+def oof_scores(estimator, X, y, n_splits=5, resample=None, random_state=42, return_models=False):
+    """
+    Skor out-of-fold: setiap baris dinilai model yang tidak melihatnya.
+    resample: callable (X, y) -> (X_res, y_res) yang diterapkan pada fold
+              training saja (mis. oversampling), agar skor meniru model final.
+    return_models: juga kembalikan indeks fold per baris dan model per fold
+                   (dipakai conformal CV+), sebagai (scores, folds, models).
+    """
+    X = np.asarray(X)
+    y = np.asarray(y)
+    scores = np.zeros(len(y), dtype=np.float64)
+    fold_ids = np.zeros(len(y), dtype=np.int64)
+    models = []
+    folds = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=random_state)
+    for k, (train_idx, test_idx) in enumerate(folds.split(X, y)):
+        X_fit, y_fit = X[train_idx], y[train_idx]
+        if resample is not None:
+            X_fit, y_fit = resample(X_fit, y_fit)
+        model = clone(estimator).fit(X_fit, y_fit)
+        scores[test_idx] = model.predict_proba(X[test_idx])[:, 1]
+        fold_ids[test_idx] = k
+        models.append(model)
+    if return_models:
+        return scores, fold_ids, models
+    return scores
+
+
+# ==========================================
+# FIT & EKSPOR TABEL
+# ==========================================
+def _isotonic_table(scores, y):
+    iso = IsotonicRegression(y_min=0.0, y_max=1.0, out_of_bounds='clip').fit(scores, y)
+    x, fx = iso.X_thresholds_, iso.y_thresholds_
+    # Hanya titik ujung setiap plateau yang diperlukan untuk interpolasi
+    keep = np.ones(len(x), dtype=bool)
+    keep[1:-1] = (fx[1:-1] != fx[:-2]) | (fx[1:-1] != fx[2:])
+    return x[keep], fx[keep]
+
+
+def _platt_table(scores, y):
+    eps = 1e-6
+    p = np.clip(scores, eps, 1 - eps)
+    logit = np.log(p / (1 - p)).reshape(-1, 1)
+    platt = LogisticRegression(C=1e6).fit(logit, y)
+    grid = np.linspace(0, 1, PLATT_GRID_POINTS)
+    g = np.clip(grid, eps, 1 - eps)
+    fx = platt.predict_proba(np.log(g / (1 - g)).reshape(-1, 1))[:, 1]
+    return grid, fx
+
+
+def fit_calibration(scores, y, method="isotonic"):
+    """
+    Latih kalibrator pada skor out-of-fold dan ekspor sebagai tabel.
+    Mengembalikan dict {'method', 'x', 'y', 'n_samples', 'brier_before', 'brier_after'}.
+    """
+    if method not in CALIBRATION_METHODS:
+        raise ValueError(f"Metode kalibrasi tidak dikenal: {method}. Pilihan: {CALIBRATION_METHODS}")
+    scores = np.asarray(scores, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    x, fx = _isotonic_table(scores, y) if method == "isotonic" else _platt_table(scores, y)
+
+    table = {
+        'method': method,
+        'x': x.tolist(),
+        'y': fx.tolist(),
+        'n_samples': int(len(y))
+    }
+    table['brier_before'] = float(np.mean((scores - y) ** 2))
+    table['brier_after'] = float(np.mean((calibrate(scores, table) - y) ** 2))
+    return table
+
+
+# ==========================================
+# SERVING
+# ==========================================
+def calibrate(probability, table):
+    """Terapkan tabel kalibrasi (vektor); tanpa tabel probabilitas dikembalikan apa adanya"""
+    if table is None:
+        return probability
+    return np.interp(probability, table['x'], table['y'])
+
+
+def reliability_table(prob, y, n_bins=10):
+    """Rata-rata prediksi vs frekuensi aktual per bin (untuk reliability diagram)"""
+    prob = np.asarray(prob, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    idx = np.minimum((prob * n_bins).astype(int), n_bins - 1)
+    count = np.bincount(idx, minlength=n_bins)
+    mean_pred = np.bincount(idx, weights=prob, minlength=n_bins) / np.maximum(count, 1)
+    frac_pos = np.bincount(idx, weights=y, minlength=n_bins) / np.maximum(count, 1)
+    return {'count': count.tolist(), 'mean_pred': mean_pred.tolist(), 'frac_pos': frac_pos.tolist()}
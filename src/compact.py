@@ -0,0 +1,238 @@
+"""
+==========================================================================
+ARTIFACT MODEL RINGKAS (KUANTISASI RANDOM FOREST)
+==========================================================================
+Untuk sekolah dengan komputer ber-RAM kecil. Random Forest diekspor ke
+format flat (flat_trees.py) dengan:
+- threshold split dikuantisasi ke grid nilai diskret input (kode int8):
+  input dipetakan ke indeks nilai grid terdekat, split membandingkan kode
+- probabilitas leaf disimpan sebagai float16
+- node yang tidak mungkin dicapai (kontradiksi dengan split di atasnya
+  atau di luar grid) dipangkas, leaf kembar digabung
+Logistic Regression, imputer dan scaler tetap seperti aslinya (kecil).
+
+Ekspor + laporan ukuran, waktu load dan deviasi probabilitas maksimum:
+    python src/compact.py --model models/model_data.pkl \
+        --data data/dataset_bersih.csv --output models/compact/model_data.pkl
+Arahkan aplikasi ke artifact ringkas dengan MODEL_DIR=models/compact.
+==========================================================================
+"""
+
+import argparse
+import pickle
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from flat_trees import predict_flat
+from schema import FEATURE_SCHEMA
+
+# Kunci artifact lama (HGB, ekspor flat) yang tidak ikut ke artifact ringkas
+_DROP_KEYS = ('hgb', 'flat_trees')
+
+
+# ==========================================
+# GRID NILAI INPUT
+# ==========================================
+def build_grid(X, model_data, schema=FEATURE_SCHEMA):
+    """
+    Grid nilai diskret per fitur (dalam ruang ter-scaling): nilai unik di
+    data, median imputer, dan bilangan bulat dalam rentang skema.
+    X: DataFrame fitur mentah (mis. dataset bersih).
+    """
+    imputer, scaler = model_data['imputer'], model_data['scaler']
+    grids = []
+    for j, name in enumerate(model_data['features']):
+        spec = schema[name]
+        values = np.unique(np.concatenate([
+            X[name].dropna().to_numpy(dtype=np.float64),
+            [imputer.statistics_[j]],
+            np.arange(np.ceil(spec.min_value), np.floor(spec.max_value) + 1)
+        ]))
+        grids.append((values - scaler.mean_[j]) / scaler.scale_[j])
+    return grids
+
+
+# ==========================================
+# KUANTISASI & PEMANGKASAN
+# ==========================================
+def _prune_tree(tree, class_idx, grids):
+    """
+    Bangun ulang satu pohon sklearn di ruang kode grid.
+    Mengembalikan node bersarang: ('leaf', p) atau ('split', f, k, kiri, kanan),
+    dengan aturan: ke kiri jika kode(x) <= k.
+    """
+    value = tree.value[:, 0, :]
+    prob = (value[:, class_idx] / value.sum(axis=1)).astype(np.float16)
+
+    def build(node, lo, hi):
+        left, right = tree.children_left[node], tree.children_right[node]
+        if left < 0:
+            return ('leaf', prob[node])
+        f = tree.feature[node]
+        # Jumlah titik grid <= threshold, dikurangi 1; input dibanding sebagai float32
+        k = int(np.searchsorted(grids[f].astype(np.float32), tree.threshold[node], side='right')) - 1
+        if hi[f] <= k:
+            return build(left, lo, hi)
+        if lo[f] > k:
+            return build(right, lo, hi)
+        hi_left, lo_right = hi.copy(), lo.copy()
+        hi_left[f], lo_right[f] = k, k + 1
+        left_node, right_node = build(left, lo, hi_left), build(right, lo_right, hi)
+        if left_node[0] == 'leaf' and right_node[0] == 'leaf' and left_node[1] == right_node[1]:
+            return left_node
+        return ('split', f, k, left_node, right_node)
+
+    lo = np.zeros(len(grids), dtype=np.int64)
+    hi = np.array([len(g) - 1 for g in grids], dtype=np.int64)
+    return build(0, lo, hi)
+
+
+def compact_forest(rf, grids, positive_class=1):
+    """Ekspor RandomForestClassifier ke format flat terkuantisasi"""
+    class_idx = list(rf.classes_).index(positive_class)
+    max_grid = max(len(g) for g in grids)
+    code_dtype = np.int8 if max_grid <= 128 else np.int16
+
+    feature, threshold, left, right, value, roots = [], [], [], [], [], []
+    max_depth = 0
+
+    def emit(node, depth):
+        nonlocal max_depth
+        max_depth = max(max_depth, depth)
+        idx = len(value)
+        feature.append(0)
+        threshold.append(0)
+        left.append(idx)
+        right.append(idx)
+        if node[0] == 'leaf':
+            value.append(node[1])
+            return idx
+        value.append(0.0)
+        _, f, k, left_node, right_node = node
+        feature[idx], threshold[idx] = f, k
+        left[idx] = emit(left_node, depth + 1)
+        right[idx] = emit(right_node, depth + 1)
+        return idx
+
+    for estimator in rf.estimators_:
+        roots.append(emit(_prune_tree(estimator.tree_, class_idx, grids), 0))
+
+    # Batas bin = titik tengah antar nilai grid (kode = indeks nilai grid terdekat)
+    edges = [((g[1:] + g[:-1]) / 2) for g in grids]
+    return {
+        'feature': np.asarray(feature, dtype=np.int8 if len(grids) <= 127 else np.int16),
+        'threshold': np.asarray(threshold, dtype=code_dtype),
+        'left': np.asarray(left, dtype=np.int32),
+        'right': np.asarray(right, dtype=np.int32),
+        'value': np.asarray(value, dtype=np.float16),
+        'roots': np.asarray(roots, dtype=np.int32),
+        'max_depth': int(max_depth),
+        'aggregate': "mean",
+        'baseline': 0.0,
+        'link': "identity",
+        'input_dtype': "float32",
+        'bin_thresholds': edges,
+        'missing_bin': 255,
+        'n_nodes_original': int(sum(e.tree_.node_count for e in rf.estimators_))
+    }
+
+
+class CompactForest:
+    """Pengganti RandomForestClassifier dengan predict_proba yang kompatibel"""
+
+    def __init__(self, flat, n_features):
+        self.flat = flat
+        self.classes_ = np.array([0, 1])
+        self.n_features_in_ = n_features
+
+    def predict_proba(self, X):
+        prob = predict_flat(self.flat, np.asarray(X, dtype=np.float64))
+        return np.column_stack([1.0 - prob, prob])
+
+    def predict(self, X):
+        return (self.predict_proba(X)[:, 1] >= 0.5).astype(int)
+
+
+# ==========================================
+# EKSPOR ARTIFACT & LAPORAN
+# ==========================================
+def export_compact(model_data, X):
+    """Salinan model_data dengan RF diganti CompactForest (X: DataFrame fitur mentah)"""
+    grids = build_grid(X, model_data)
+    flat = compact_forest(model_data['rf'], grids)
+    compact = {k: v for k, v in model_data.items() if k not in _DROP_KEYS}
+    compact['rf'] = CompactForest(flat, len(model_data['features']))
+    compact['compact'] = {
+        'n_nodes_original': flat['n_nodes_original'],
+        'n_nodes': int(len(flat['value'])),
+        'threshold_dtype': str(flat['threshold'].dtype),
+        'value_dtype': str(flat['value'].dtype)
+    }
+    return compact
+
+
+def _load_seconds(payload, repeat=5):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        pickle.loads(payload)
+        times.append(time.perf_counter() - start)
+    return float(np.median(times))
+
+
+def compact_report(model_data, compact, X):
+    """Ukuran artifact, waktu load dan deviasi probabilitas RF/LR maksimum pada X"""
+    X_scaled = model_data['scaler'].transform(model_data['imputer'].transform(FEATURE_SCHEMA.assemble(X)))
+    full_bytes = pickle.dumps(model_data, protocol=pickle.HIGHEST_PROTOCOL)
+    compact_bytes = pickle.dumps(compact, protocol=pickle.HIGHEST_PROTOCOL)
+    rf_full = model_data['rf'].predict_proba(X_scaled)[:, 1]
+    rf_compact = compact['rf'].predict_proba(X_scaled)[:, 1]
+    lr_full = model_data['logreg'].predict_proba(X_scaled)[:, 1]
+    lr_compact = compact['logreg'].predict_proba(X_scaled)[:, 1]
+    threshold_rf = model_data['threshold_rf']
+    return {
+        'ukuran_penuh_kb': len(full_bytes) / 1024,
+        'ukuran_ringkas_kb': len(compact_bytes) / 1024,
+        'load_penuh_ms': _load_seconds(full_bytes) * 1000,
+        'load_ringkas_ms': _load_seconds(compact_bytes) * 1000,
+        'node_rf_asli': compact['compact']['n_nodes_original'],
+        'node_rf_ringkas': compact['compact']['n_nodes'],
+        'deviasi_maks_rf': float(np.abs(rf_full - rf_compact).max()),
+        'deviasi_maks_lr': float(np.abs(lr_full - lr_compact).max()),
+        'prediksi_rf_berubah': int(np.sum((rf_full >= threshold_rf) != (rf_compact >= threshold_rf))),
+        'n_sampel': int(len(X_scaled))
+    }
+
+
+def main():
+    # Impor ulang lewat nama modul agar pickle merujuk ke compact.CompactForest, bukan __main__
+    from compact import export_compact, compact_report
+    from registry import load_artifact
+
+    root = Path(__file__).resolve().parent.parent
+    parser = argparse.ArgumentParser(description="Ekspor artifact model ringkas (RF terkuantisasi)")
+    parser.add_argument("--model", default=root / "models" / "model_data.pkl", type=Path)
+    parser.add_argument("--data", default=root / "data" / "dataset_bersih.csv", type=Path)
+    parser.add_argument("--output", default=root / "models" / "compact" / "model_data.pkl", type=Path)
+    args = parser.parse_args()
+
+    model_data = load_artifact(args.model)
+    X = FEATURE_SCHEMA.assemble(pd.read_csv(args.data))
+    compact = export_compact(model_data, X)
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    tmp = args.output.with_suffix(".tmp")
+    with open(tmp, "wb") as f:
+        pickle.dump(compact, f, protocol=pickle.HIGHEST_PROTOCOL)
+    tmp.replace(args.output)
+
+    report = compact_report(model_data, compact, X)
+    print(f"Artifact ringkas ditulis ke {args.output}")
+    print(pd.Series(report).round(6).to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+==========================================================================
+HIMPUNAN PREDIKSI CONFORMAL UNTUK KLASIFIKASI OBESITAS
+==========================================================================
+Level risiko (threshold +/- 0.2) hanya heuristik. Himpunan prediksi
+{0}, {1} atau {0, 1} menargetkan cakupan 1 - alpha: label sebenarnya
+berada di dalam himpunan untuk sekitar 1 - alpha siswa. {0, 1} berarti
+model tidak cukup yakin.
+
+Skor nonkonformitas = 1 - p(label sebenarnya). Artifact memakai CV+
+(fit_conformal_cv_plus, Romano dkk. 2020): skor out-of-fold data training
+(tahap 8.1 notebook) dibandingkan dengan skor siswa baru menurut model
+fold yang sama, sehingga semua data training tetap dipakai model yang
+disajikan dan cakupan tetap terjamin, yaitu minimal 1 - 2*alpha dikurangi
+suku kecil sampel terhingga (disimpan sebagai 'jaminan_cakupan'); dalam
+praktik cakupannya mendekati 1 - alpha. Himpunan ditentukan model fold
+(LR, disimpan sebagai array koefisien), bukan skor model final.
+Perbandingan dilakukan per kelas (Mondrian) agar kelas obesitas yang
+jarang juga tercakup.
+
+fit_conformal (split conformal, dua batas probabilitas) hanya menjamin
+cakupan 1 - alpha bila prob berasal dari model yang tidak melihat data
+kalibrasi; dengan skor out-of-fold untuk model final cakupannya perkiraan.
+==========================================================================
+"""
+
+import numpy as np
+import pandas as pd
+
+# Kode himpunan prediksi
+SET_NEGATIVE, SET_POSITIVE, SET_BOTH = 0, 1, 2
+SET_LABELS = {
+    SET_NEGATIVE: "{Tidak Obesitas}",
+    SET_POSITIVE: "{Obesitas}",
+    SET_BOTH: "{Tidak Obesitas, Obesitas}"
+}
+
+
+def conformal_quantile(scores, alpha):
+    """Kuantil ke-ceil((n + 1)(1 - alpha)) dari skor nonkonformitas (1.0 jika n terlalu kecil)"""
+    scores = np.sort(np.asarray(scores, dtype=np.float64))
+    n = len(scores)
+    k = int(np.ceil((n + 1) * (1 - alpha)))
+    return float(scores[k - 1]) if 0 < k <= n else 1.0
+
+
+def fit_conformal(prob, y, alpha=0.1, class_conditional=True):
+    """
+    Split conformal dari probabilitas kelas 1 dan label. Jaminan cakupan
+    1 - alpha hanya berlaku bila prob berasal dari model yang disajikan pada
+    data kalibrasi yang tidak dilihatnya; dengan skor out-of-fold cakupannya
+    perkiraan (pakai fit_conformal_cv_plus).
+    Label 0 masuk himpunan jika p <= lower, label 1 jika p >= upper.
+    """
+    prob = np.asarray(prob, dtype=np.float64)
+    y = np.asarray(y).astype(int)
+    nonconformity = np.where(y == 1, 1.0 - prob, prob)
+    if class_conditional:
+        q0 = conformal_quantile(nonconformity[y == 0], alpha)
+        q1 = conformal_quantile(nonconformity[y == 1], alpha)
+    else:
+        q0 = q1 = conformal_quantile(nonconformity, alpha)
+    return {
+        'method': "split",
+        'alpha': alpha,
+        'class_conditional': class_conditional,
+        'lower': q0,
+        'upper': 1.0 - q1,
+        'n_samples': int(len(y))
+    }
+
+
+def cv_plus_bound(alpha, n, n_folds):
+    """Batas bawah cakupan K-fold CV+: 1 - 2*alpha - min(2(1-1/K)/(n/K+1), (1-K/n)/(K+1))"""
+    slack = min(2 * (1 - 1 / n_folds) / (n / n_folds + 1), (1 - n_folds / n) / (n_folds + 1))
+    return 1 - 2 * alpha - slack
+
+
+def fit_conformal_cv_plus(prob, y, folds, fold_models, alpha=0.1):
+    """
+    Conformal CV+ per kelas dari skor out-of-fold LR (oof_scores(...,
+    return_models=True)). Label c masuk himpunan x jika
+        sum_i [R_i < E_k(i)(x, c)] < (1 - alpha)(n_c + 1),  i berlabel c,
+    dengan R_i skor nonkonformitas out-of-fold baris i dan E_k(i) skor x
+    menurut model fold yang tidak melihat baris i.
+    Skor per (fold, kelas) disimpan terurut agar serving cukup searchsorted.
+    """
+    prob = np.asarray(prob, dtype=np.float64)
+    y = np.asarray(y).astype(int)
+    folds = np.asarray(folds)
+    nonconformity = np.where(y == 1, 1.0 - prob, prob)
+    n_folds = len(fold_models)
+    n_class = [int(np.sum(y == c)) for c in (0, 1)]
+    return {
+        'method': "cv+",
+        'alpha': alpha,
+        'class_conditional': True,
+        'coef': np.vstack([m.coef_[0] for m in fold_models]),
+        'intercept': np.array([m.intercept_[0] for m in fold_models]),
+        'scores': [[np.sort(nonconformity[(folds == k) & (y == c)]) for c in (0, 1)]
+                   for k in range(n_folds)],
+        'n_class': n_class,
+        'n_samples': int(len(y)),
+        # Jaminan per kelas, sehingga juga berlaku untuk cakupan keseluruhan
+        'jaminan_cakupan': float(min(cv_plus_bound(alpha, n, n_folds) for n in n_class))
+    }
+
+
+def _cv_plus_counts(X, conformal):
+    """(n, 2) jumlah skor kalibrasi per kelas yang lebih kecil dari skor x menurut model fold"""
+    prob = 1.0 / (1.0 + np.exp(-(np.asarray(X, dtype=np.float64) @ conformal['coef'].T + conformal['intercept'])))
+    counts = np.zeros((len(prob), 2), dtype=np.int64)
+    for k, per_class in enumerate(conformal['scores']):
+        counts[:, 0] += np.searchsorted(per_class[0], prob[:, k], side="left")
+        counts[:, 1] += np.searchsorted(per_class[1], 1.0 - prob[:, k], side="left")
+    return counts
+
+
+def prediction_sets(prob, conformal, X=None):
+    """
+    Kode himpunan prediksi per baris (int8): 0 = {0}, 1 = {1}, 2 = {0, 1}.
+    Artifact CV+ memerlukan X (fitur ter-scale, urut skema); split conformal
+    cukup prob. Jika tidak ada label yang lolos, dipilih label yang paling
+    konform agar himpunan tidak pernah kosong.
+    """
+    if conformal.get('method') == "cv+":
+        if X is None:
+            raise ValueError("Conformal CV+ memerlukan fitur ter-scale (X)")
+        counts = _cv_plus_counts(X, conformal)
+        limit = (1 - conformal['alpha']) * (np.asarray(conformal['n_class']) + 1)
+        has_neg, has_pos = (counts < limit).T
+        nearer_pos = counts[:, 1] / limit[1] < counts[:, 0] / limit[0]
+    else:
+        prob = np.asarray(prob, dtype=np.float64)
+        has_neg = prob <= conformal['lower']
+        has_pos = prob >= conformal['upper']
+        nearer_pos = (conformal['upper'] - prob) < (prob - conformal['lower'])
+    codes = np.where(has_neg & has_pos, SET_BOTH, np.where(has_pos, SET_POSITIVE, SET_NEGATIVE))
+    empty = ~(has_neg | has_pos)
+    codes = np.where(empty & nearer_pos, SET_POSITIVE, codes)
+    return codes.astype(np.int8)
+
+
+def coverage_report(y, codes):
+    """Cakupan keseluruhan dan per kelas, serta proporsi setiap jenis himpunan"""
+    y = np.asarray(y).astype(int)
+    codes = np.asarray(codes)
+    covered = (codes == SET_BOTH) | (codes == y)
+    return {
+        'cakupan': float(covered.mean()),
+        'cakupan_kelas_0': float(covered[y == 0].mean()) if np.any(y == 0) else np.nan,
+        'cakupan_kelas_1': float(covered[y == 1].mean()) if np.any(y == 1) else np.nan,
+        'proporsi_himpunan': {
+            SET_LABELS[k]: float(np.mean(codes == k)) for k in (SET_NEGATIVE, SET_POSITIVE, SET_BOTH)
+        }
+    }
+
+
+def set_table(codes):
+    """Jumlah baris per jenis himpunan (untuk ditampilkan)"""
+    counts = np.bincount(np.asarray(codes, dtype=np.int64), minlength=3)
+    return pd.DataFrame({'himpunan': [SET_LABELS[k] for k in range(3)], 'jumlah': counts})
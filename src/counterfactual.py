@@ -0,0 +1,95 @@
+"""
+==========================================================================
+WHAT-IF / COUNTERFACTUAL ENGINE UNTUK REKOMENDASI
+==========================================================================
+Mengenumerasi semua perubahan satu dan dua fitur gaya hidup yang dapat
+diubah, lalu menilai semuanya dalam SATU batch melalui imputer, scaler dan
+model. Rekomendasi diurutkan berdasarkan penurunan risiko yang diprediksi.
+==========================================================================
+"""
+
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+
+def enumerate_changes(base_values, options, max_changes=2, only_healthier=True):
+    """
+    Buat daftar perubahan untuk fitur yang dapat diubah.
+
+    base_values: dict nama_fitur -> nilai saat ini
+    options: dict nama_fitur -> {'mapping': {label: nilai}, 'direction': +1/-1}
+             direction +1 berarti nilai lebih besar lebih sehat (mis. tidur),
+             -1 berarti nilai lebih kecil lebih sehat (mis. fast food).
+    Mengembalikan list tuple perubahan, setiap perubahan = ((fitur, label, nilai), ...)
+    """
+    alternatives = {}
+    for name, opt in options.items():
+        current = base_values[name]
+        direction = opt.get('direction', 0)
+        alts = []
+        for label, value in opt['mapping'].items():
+            if value == current:
+                continue
+            if only_healthier and direction and np.sign(value - current) != direction:
+                continue
+            alts.append((name, label, value))
+        if alts:
+            alternatives[name] = alts
+
+    changes = [(alt,) for alts in alternatives.values() for alt in alts]
+    if max_changes >= 2:
+        for f1, f2 in combinations(alternatives, 2):
+            changes.extend((a, b) for a in alternatives[f1] for b in alternatives[f2])
+    return changes
+
+
+def build_counterfactual_matrix(base_input, features, changes):
+    """
+    Matriks (1 + n_perubahan) x n_fitur: baris 0 = input asli.
+    base_input: dict nama_fitur -> nilai; kolom disusun berdasarkan nama.
+    """
+    base = np.array([base_input[f] for f in features], dtype=np.float64)
+    matrix = np.tile(base, (len(changes) + 1, 1))
+    col_index = {f: i for i, f in enumerate(features)}
+    for row, change in enumerate(changes, start=1):
+        for name, _, value in change:
+            matrix[row, col_index[name]] = value
+    return matrix
+
+
+def score_matrix(matrix, model_data, model='logreg'):
+    """Probabilitas obesitas untuk seluruh matriks dalam satu pemanggilan"""
+    data = pd.DataFrame(matrix, columns=model_data['features'])
+    data_scaled = model_data['scaler'].transform(model_data['imputer'].transform(data))
+    return model_data[model].predict_proba(data_scaled)[:, 1]
+
+
+def rank_counterfactuals(base_input, model_data, options, max_changes=2,
+                         only_healthier=True, model='logreg'):
+    """
+    Nilai semua perubahan satu/dua fitur dan urutkan berdasarkan penurunan risiko.
+    base_input: dict nama_fitur -> nilai (seperti input_data di app.py)
+
+    Mengembalikan (prob_awal, DataFrame) dengan kolom:
+    perubahan, jumlah_perubahan, probabilitas, penurunan
+    """
+    features = model_data['features']
+    base_values = {name: base_input[name] for name in options}
+    changes = enumerate_changes(base_values, options, max_changes, only_healthier)
+
+    matrix = build_counterfactual_matrix(base_input, features, changes)
+    probs = score_matrix(matrix, model_data, model)
+    prob_base = probs[0]
+
+    result = pd.DataFrame({
+        'perubahan': changes,
+        'jumlah_perubahan': [len(c) for c in changes],
+        'probabilitas': probs[1:],
+        'penurunan': prob_base - probs[1:]
+    })
+    result = result.sort_values(
+        ['penurunan', 'jumlah_perubahan'], ascending=[False, True]
+    ).reset_index(drop=True)
+    return prob_base, result
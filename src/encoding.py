@@ -0,0 +1,248 @@
+"""
+==========================================================================
+ENCODING KATEGORI JAWABAN (DIPAKAI TRAINING DAN APLIKASI)
+==========================================================================
+Satu sumber mapping kategori -> nilai numerik untuk notebook (jawaban
+survey mentah) dan aplikasi (pilihan di sidebar). Setiap fitur memiliki:
+- options: pilihan yang ditampilkan di aplikasi (label -> nilai), urut
+- aliases: ejaan/kategori lain yang hanya muncul di data mentah
+Variasi spasi, tanda hubung dan huruf besar/kecil ditangani normalizer.py.
+
+Encode dan decode bekerja per kolom (factorize + take / searchsorted).
+Konsistensi dengan skema dan dataset bersih dicek dengan:
+    python src/encoding.py --data data/dataset_bersih.csv
+==========================================================================
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from normalizer import AnswerNormalizer, normalize_columns
+from schema import FEATURE_SCHEMA
+
+_SCALE_ALIASES = {str(i): i for i in range(1, 6)}
+
+
+class CategoricalEncoding:
+    """Encoding satu fitur: pilihan tampilan + alias data mentah"""
+
+    def __init__(self, feature, options, aliases=None):
+        self.feature = feature
+        self.options = dict(options)
+        self.aliases = dict(aliases or {})
+        # Kode pilihan dihitung sekali (urutan sama dengan urutan di sidebar)
+        self.labels = tuple(self.options)
+        self.codes = np.array(list(self.options.values()), dtype=np.float64)
+        self._order = np.argsort(self.codes, kind='stable')
+        self._normalizer = AnswerNormalizer(self.mapping, name=feature)
+
+    @property
+    def mapping(self):
+        """Semua jawaban yang dikenali (alias + pilihan)"""
+        return {**self.aliases, **self.options}
+
+    def encode(self, values):
+        """Jawaban (teks mentah atau label) -> (Series nilai float, laporan variasi tidak dikenal)"""
+        return self._normalizer.transform(values)
+
+    def decode(self, values):
+        """Nilai numerik -> label pilihan dengan kode terdekat (None untuk NaN)"""
+        values = np.asarray(values, dtype=np.float64)
+        sorted_codes = self.codes[self._order]
+        idx = np.clip(np.searchsorted(sorted_codes, values), 1, len(sorted_codes) - 1)
+        lower, upper = sorted_codes[idx - 1], sorted_codes[idx]
+        idx = np.where(np.abs(values - lower) <= np.abs(upper - values), idx - 1, idx)
+        labels = np.array(self.labels, dtype=object)[self._order[idx]]
+        return np.where(np.isnan(values), None, labels)
+
+    def index(self, value):
+        """Posisi pilihan dengan kode terdekat (untuk index default selectbox)"""
+        return self.labels.index(self.decode([value])[0])
+
+
+# ==========================================
+# DAFTAR ENCODING
+# ==========================================
+ENCODINGS = {enc.feature: enc for enc in (
+    CategoricalEncoding("jenis_kelamin", {
+        "Laki-laki": 1,
+        "Perempuan": 0
+    }),
+    CategoricalEncoding("keluarga_obesitas", {
+        "Tidak": 0,
+        "Iya": 1
+    }, aliases={"Tidak ada": 0, "Ada": 1}),
+    CategoricalEncoding("durasi_tidur_jam", {
+        "< 5 jam": 4.0,
+        "5-6 jam": 5.5,
+        "7-8 jam": 7.5,
+        "> 8 jam": 9.0
+    }),
+    CategoricalEncoding("makan_per_hari", {
+        "1 kali": 1.0,
+        "2 kali": 2.0,
+        "3 kali": 3.0,
+        "> 3 kali": 4.0
+    }),
+    CategoricalEncoding("jajan_per_minggu", {
+        "0-2 kali": 1.0,
+        "3-5 kali": 4.0,
+        "6-10 kali": 8.0,
+        "> 10 kali": 12.0
+    }, aliases={"4-5 kali": 4.5}),
+    CategoricalEncoding("fastfood_per_minggu", {
+        "0-2 kali": 1,
+        "3-5 kali": 4,
+        "> 5 kali": 7
+    }),
+    CategoricalEncoding("minuman_manis_per_minggu", {
+        "0-2 gelas": 1,
+        "3-5 gelas": 4,
+        "6-10 gelas": 8,
+        "> 10 gelas": 12
+    }, aliases={"10-6 gelas": 8, "10 gelas": 10}),
+    CategoricalEncoding("makan_setelah_21", {
+        "0 kali": 0.0,
+        "1 kali": 1.0,
+        "2-3 kali": 2.5,
+        "4 kali": 4.0,
+        "> 4 kali": 6.0
+    }, aliases={"5 kali": 5.0, "4 kali atau lebih": 6.0}),
+    CategoricalEncoding("durasi_olahraga", {
+        "< 15 menit": 10,
+        "15-30 menit": 22.5,
+        "31-60 menit": 45,
+        "> 60 menit": 75
+    }, aliases={"30-60 menit": 45}),
+    CategoricalEncoding("video_makanan", {
+        "Tidak pernah": 0,
+        "< 1 jam per minggu": 0.5,
+        "1-3 jam per minggu": 2,
+        "4-6 jam per minggu": 5,
+        "7-10 jam per minggu": 8.5,
+        "10 jam per minggu": 10
+    }),
+    CategoricalEncoding("aktivitas_fisik", {
+        "Sangat Rendah": 1,
+        "Rendah": 2,
+        "Sedang": 3,
+        "Tinggi": 4,
+        "Sangat Tinggi": 5
+    }, aliases=_SCALE_ALIASES),
+    CategoricalEncoding("tingkat_stres", {
+        "Sangat Rendah": 1,
+        "Rendah": 2,
+        "Sedang": 3,
+        "Tinggi": 4,
+        "Sangat Tinggi": 5
+    }, aliases=_SCALE_ALIASES),
+    CategoricalEncoding("pengaruh_teman", {
+        "Sangat Rendah": 1,
+        "Rendah": 2,
+        "Sedang": 3,
+        "Tinggi": 4,
+        "Sangat Tinggi": 5
+    }, aliases=_SCALE_ALIASES),
+    CategoricalEncoding("makan_karena_stres", {
+        "Sangat Jarang": 1,
+        "Jarang": 2,
+        "Kadang-kadang": 3,
+        "Sering": 4,
+        "Sangat Sering": 5
+    }, aliases=_SCALE_ALIASES),
+)}
+
+# Nama lama yang dipakai aplikasi (label -> nilai)
+MAPPING_TIDUR = ENCODINGS["durasi_tidur_jam"].options
+MAPPING_MAKAN = ENCODINGS["makan_per_hari"].options
+MAPPING_JAJAN = ENCODINGS["jajan_per_minggu"].options
+MAPPING_FASTFOOD = ENCODINGS["fastfood_per_minggu"].options
+MAPPING_MINUMAN = ENCODINGS["minuman_manis_per_minggu"].options
+MAPPING_MAKAN_MALAM = ENCODINGS["makan_setelah_21"].options
+MAPPING_AKTIVITAS = ENCODINGS["aktivitas_fisik"].options
+MAPPING_STRES = ENCODINGS["tingkat_stres"].options
+MAPPING_TEMAN = ENCODINGS["pengaruh_teman"].options
+MAPPING_MAKAN_STRES = ENCODINGS["makan_karena_stres"].options
+MAPPING_VIDEO_MAKANAN = ENCODINGS["video_makanan"].options
+
+
+def encode_frame(df, columns):
+    """
+    Encode beberapa kolom jawaban sekaligus.
+    columns: dict nama_fitur -> nama kolom sumber di df
+    Mengembalikan (DataFrame fitur, DataFrame laporan variasi tidak dikenal).
+    """
+    # Lookup yang sudah dikompilasi di setiap CategoricalEncoding dipakai ulang
+    return normalize_columns(df, {
+        feature: (source, ENCODINGS[feature]._normalizer) for feature, source in columns.items()
+    })
+
+
+def decode_frame(df):
+    """Kolom fitur ber-encoding -> label pilihan (kolom lain tidak diubah)"""
+    decoded = df.copy()
+    for feature in ENCODINGS:
+        if feature in decoded.columns:
+            decoded[feature] = ENCODINGS[feature].decode(decoded[feature])
+    return decoded
+
+
+# ==========================================
+# CEK KONSISTENSI
+# ==========================================
+def check_consistency(data=None, schema=FEATURE_SCHEMA):
+    """
+    Cek encoding terhadap skema fitur dan (opsional) dataset bersih.
+    Mengembalikan DataFrame masalah (kolom: fitur, masalah); kosong jika konsisten.
+    - semua nilai encoding fitur model berada dalam rentang skema
+    - kode pilihan unik (decode tidak ambigu)
+    - semua nilai di dataset dikenal encoding, dan setiap pilihan aplikasi
+      pernah muncul di dataset (model tidak menerima nilai yang tidak dikenalnya)
+    """
+    problems = []
+    for feature, enc in ENCODINGS.items():
+        if feature not in schema.names:
+            # Kolom bantu di dataset bersih (mis. durasi_olahraga), bukan input model
+            continue
+        spec = schema[feature]
+        values = np.array(list(enc.mapping.values()), dtype=np.float64)
+        outside = values[(values < spec.min_value) | (values > spec.max_value)]
+        if len(outside):
+            problems.append((feature, f"nilai di luar rentang skema [{spec.min_value}, {spec.max_value}]: {sorted(outside.tolist())}"))
+        if len(np.unique(enc.codes)) < len(enc.codes):
+            problems.append((feature, "kode pilihan tidak unik"))
+
+        if data is not None and feature in data.columns:
+            observed = np.unique(data[feature].dropna().to_numpy(dtype=np.float64))
+            unknown = np.setdiff1d(observed, values)
+            if len(unknown):
+                problems.append((feature, f"nilai dataset tidak dikenal encoding: {unknown.tolist()}"))
+            unseen = np.setdiff1d(enc.codes, observed)
+            if len(unseen):
+                problems.append((feature, f"pilihan aplikasi tidak ada di dataset: {unseen.tolist()}"))
+
+    missing = [n for n in schema.names if n not in ENCODINGS and n != "usia_tahun"]
+    problems.extend((n, "tidak memiliki encoding") for n in missing)
+    return pd.DataFrame(problems, columns=['fitur', 'masalah'])
+
+
+def main():
+    root = Path(__file__).resolve().parent.parent
+    parser = argparse.ArgumentParser(description="Cek konsistensi encoding dengan skema dan dataset")
+    parser.add_argument("--data", default=root / "data" / "dataset_bersih.csv", type=Path)
+    args = parser.parse_args()
+
+    data = pd.read_csv(args.data) if args.data.exists() else None
+    problems = check_consistency(data)
+    if len(problems):
+        print(problems.to_string(index=False))
+        sys.exit(1)
+    print(f"Encoding konsisten ({len(ENCODINGS)} fitur)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+==========================================================================
+ENSEMBLE LOGISTIC REGRESSION + RANDOM FOREST
+==========================================================================
+Dua cara menggabungkan skor model anggota, keduanya dilatih pada skor
+out-of-fold (lihat calibration.oof_scores):
+- "stacking": Logistic Regression pada logit skor anggota
+- "blend"   : rata-rata berbobot, bobot dicari dengan grid (AUC)
+Ensemble disimpan di artifact sebagai dict kecil (anggota, bobot,
+intercept, threshold). Saat serving, matriks yang sudah diimputasi dan
+di-scale dinilai sekali per anggota lalu digabung dalam satu operasi vektor.
+==========================================================================
+"""
+
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import roc_auc_score
+
+ENSEMBLE_METHODS = ("stacking", "blend")
+DEFAULT_MEMBERS = ("logreg", "rf")
+
+EPS = 1e-6
+
+
+def _logit(p):
+    p = np.clip(p, EPS, 1 - EPS)
+    return np.log(p / (1 - p))
+
+
+# ==========================================
+# TRAINING
+# ==========================================
+def fit_ensemble(member_scores, y, method="stacking", members=DEFAULT_MEMBERS, grid_step=0.05):
+    """
+    Latih penggabung dari skor out-of-fold.
+    member_scores: array (n_sampel, n_anggota), kolom sesuai urutan members.
+    Mengembalikan dict ensemble (threshold diisi terpisah setelah tuning).
+    """
+    if method not in ENSEMBLE_METHODS:
+        raise ValueError(f"Metode ensemble tidak dikenal: {method}. Pilihan: {ENSEMBLE_METHODS}")
+    scores = np.asarray(member_scores, dtype=np.float64)
+    y = np.asarray(y)
+    if scores.shape[1] != len(members):
+        raise ValueError(f"Jumlah kolom skor ({scores.shape[1]}) tidak sama dengan jumlah anggota ({len(members)})")
+
+    if method == "stacking":
+        stacker = LogisticRegression(C=1.0).fit(_logit(scores), y)
+        weights, intercept = stacker.coef_[0], float(stacker.intercept_[0])
+    else:
+        if len(members) != 2:
+            raise ValueError("Metode 'blend' dengan grid bobot hanya untuk dua anggota")
+        grid = np.arange(0, 1 + grid_step / 2, grid_step)
+        # Semua kandidat bobot dinilai sekaligus: (n_sampel, n_grid)
+        # Skor anggota belum terkalibrasi (oversampling), jadi bobot dipilih
+        # berdasarkan ranking (AUC); threshold di-tuning terpisah
+        blended = np.outer(scores[:, 0], grid) + np.outer(scores[:, 1], 1 - grid)
+        aucs = [roc_auc_score(y, blended[:, j]) for j in range(len(grid))]
+        w = grid[int(np.argmax(aucs))]
+        weights, intercept = np.array([w, 1 - w]), 0.0
+
+    return {
+        'method': method,
+        'members': list(members),
+        'weights': [float(w) for w in weights],
+        'intercept': intercept,
+        'threshold': 0.5
+    }
+
+
+# ==========================================
+# SERVING
+# ==========================================
+def combine(member_scores, ensemble):
+    """Gabungkan matriks skor anggota (n_sampel, n_anggota) menjadi probabilitas ensemble"""
+    scores = np.asarray(member_scores, dtype=np.float64)
+    weights = np.asarray(ensemble['weights'])
+    if ensemble['method'] == "stacking":
+        z = _logit(scores) @ weights + ensemble['intercept']
+        return 1.0 / (1.0 + np.exp(-z))
+    return scores @ weights
+
+
+def member_scores(X_scaled, model_data, ensemble):
+    """Skor semua anggota untuk satu batch yang sudah diimputasi dan di-scale"""
+    return np.column_stack([
+        model_data[name].predict_proba(X_scaled)[:, 1] for name in ensemble['members']
+    ])
+
+
+def score_ensemble(X_scaled, model_data):
+    """
+    Probabilitas dan prediksi ensemble untuk satu batch.
+    Mengembalikan (probabilitas, prediksi, skor_anggota).
+    """
+    ensemble = model_data['ensemble']
+    scores = member_scores(X_scaled, model_data, ensemble)
+    prob = combine(scores, ensemble)
+    return prob, (prob >= ensemble['threshold']).astype(int), scores
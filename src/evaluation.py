@@ -0,0 +1,180 @@
+"""
+==========================================================================
+EVALUASI DENGAN BOOTSTRAP CONFIDENCE INTERVAL
+==========================================================================
+Data uji hanya ~480 baris sehingga estimasi titik (tahap 9 notebook) cukup
+berisik. Modul ini menghitung interval kepercayaan bootstrap untuk
+accuracy, precision, recall, F1, AUC dan threshold Youden hasil tuning.
+
+Semua resample dihitung secara vektor: satu batch resample dinyatakan
+sebagai matriks bobot (berapa kali setiap baris terambil, via np.bincount),
+confusion matrix dan AUC dihitung dari bobot per nilai skor unik.
+Batch dibagi ke beberapa proses (ProcessPoolExecutor).
+==========================================================================
+"""
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score, roc_auc_score
+
+METRICS = ("accuracy", "precision", "recall", "f1", "auc", "threshold_youden")
+
+
+# ==========================================
+# STATISTIK PER BATCH RESAMPLE
+# ==========================================
+def _resample_weights(n, n_boot, rng):
+    """Matriks bobot (n_boot, n): berapa kali setiap baris muncul di resample"""
+    idx = rng.integers(0, n, size=(n_boot, n))
+    flat = idx + (np.arange(n_boot) * n)[:, None]
+    return np.bincount(flat.ravel(), minlength=n_boot * n).reshape(n_boot, n)
+
+
+def _group_weights(weights, groups, n_groups):
+    """Jumlahkan bobot per grup skor unik: (n_boot, n) -> (n_boot, n_groups)"""
+    n_boot = weights.shape[0]
+    flat = groups[None, :] + (np.arange(n_boot) * n_groups)[:, None]
+    return np.bincount(flat.ravel(), weights=weights.ravel(), minlength=n_boot * n_groups).reshape(n_boot, n_groups)
+
+
+def _safe_div(a, b):
+    return np.divide(a, b, out=np.zeros_like(a, dtype=np.float64), where=b > 0)
+
+
+def batch_metrics(y_true, y_prob, threshold, weights):
+    """
+    Metrik untuk setiap baris matriks bobot.
+    Mengembalikan dict nama_metrik -> array (n_boot,).
+    """
+    y_true = np.asarray(y_true).astype(bool)
+    y_prob = np.asarray(y_prob, dtype=np.float64)
+    pred = y_prob >= threshold
+
+    w_pos = weights * y_true
+    w_neg = weights * ~y_true
+    tp = (w_pos * pred).sum(axis=1)
+    fp = (w_neg * pred).sum(axis=1)
+    pos = w_pos.sum(axis=1)
+    neg = w_neg.sum(axis=1)
+    fn = pos - tp
+    tn = neg - fp
+
+    precision = _safe_div(tp, tp + fp)
+    recall = _safe_div(tp, pos)
+    result = {
+        'accuracy': (tp + tn) / (pos + neg),
+        'precision': precision,
+        'recall': recall,
+        'f1': _safe_div(2 * tp, 2 * tp + fp + fn)
+    }
+
+    # AUC (Mann-Whitney) dan threshold Youden dari bobot per skor unik
+    scores, groups = np.unique(y_prob, return_inverse=True)
+    g_pos = _group_weights(weights, np.where(y_true, groups, len(scores)), len(scores) + 1)[:, :-1]
+    g_neg = _group_weights(weights, np.where(~y_true, groups, len(scores)), len(scores) + 1)[:, :-1]
+    neg_below = np.cumsum(g_neg, axis=1) - g_neg
+    result['auc'] = _safe_div((g_pos * (neg_below + 0.5 * g_neg)).sum(axis=1), pos * neg)
+
+    # Prediksi positif jika skor >= s_g: TP/FP = jumlah bobot dari grup g ke atas
+    tp_at = np.cumsum(g_pos[:, ::-1], axis=1)[:, ::-1]
+    fp_at = np.cumsum(g_neg[:, ::-1], axis=1)[:, ::-1]
+    youden = _safe_div(tp_at, pos[:, None]) - _safe_div(fp_at, neg[:, None])
+    result['threshold_youden'] = scores[np.argmax(youden, axis=1)]
+    return result
+
+
+def _bootstrap_chunk(args):
+    """Dijalankan di proses worker: satu potongan resample dengan seed sendiri"""
+    y_true, probs, thresholds, n_boot, seed = args
+    rng = np.random.default_rng(seed)
+    weights = _resample_weights(len(y_true), n_boot, rng)
+    return {name: batch_metrics(y_true, probs[name], thresholds[name], weights) for name in probs}
+
+
+# ==========================================
+# LAPORAN
+# ==========================================
+def point_metrics(y_true, y_prob, threshold):
+    """Estimasi titik pada data uji asli (sama dengan evaluate_model di notebook)"""
+    y_pred = (np.asarray(y_prob) >= threshold).astype(int)
+    weights = np.ones((1, len(y_true)))
+    youden = batch_metrics(y_true, y_prob, threshold, weights)['threshold_youden'][0]
+    return {
+        'accuracy': accuracy_score(y_true, y_pred),
+        'precision': precision_score(y_true, y_pred, zero_division=0),
+        'recall': recall_score(y_true, y_pred, zero_division=0),
+        'f1': f1_score(y_true, y_pred, zero_division=0),
+        'auc': roc_auc_score(y_true, y_prob),
+        'threshold_youden': float(youden)
+    }
+
+
+def bootstrap_report(y_true, probs, thresholds, n_boot=10_000, alpha=0.05,
+                     chunk_size=500, n_jobs=None, random_state=42):
+    """
+    Confidence interval bootstrap (persentil) untuk beberapa model sekaligus.
+
+    probs: dict nama_model -> probabilitas pada data uji
+    thresholds: dict nama_model -> threshold yang dipakai untuk prediksi
+    n_jobs: jumlah proses; None = os.cpu_count(), 1 = tanpa process pool
+    """
+    y_true = np.asarray(y_true).astype(int)
+    probs = {name: np.asarray(p, dtype=np.float64) for name, p in probs.items()}
+    thresholds = {name: float(thresholds[name]) for name in probs}
+
+    sizes = [chunk_size] * (n_boot // chunk_size)
+    if n_boot % chunk_size:
+        sizes.append(n_boot % chunk_size)
+    seeds = np.random.SeedSequence(random_state).spawn(len(sizes))
+    tasks = [(y_true, probs, thresholds, size, seed) for size, seed in zip(sizes, seeds)]
+
+    n_jobs = n_jobs or os.cpu_count() or 1
+    if n_jobs == 1 or len(tasks) == 1:
+        chunks = [_bootstrap_chunk(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(n_jobs, len(tasks))) as pool:
+            chunks = list(pool.map(_bootstrap_chunk, tasks))
+
+    report = {
+        'dibuat': datetime.now().isoformat(timespec='seconds'),
+        'n_boot': int(n_boot),
+        'alpha': alpha,
+        'n_test': int(len(y_true)),
+        'prevalensi_test': float(y_true.mean()),
+        'models': {}
+    }
+    for name in probs:
+        estimates = point_metrics(y_true, probs[name], thresholds[name])
+        entry = {'threshold': thresholds[name], 'metrics': {}}
+        for metric in METRICS:
+            samples = np.concatenate([chunk[name][metric] for chunk in chunks])
+            low, high = np.quantile(samples, [alpha / 2, 1 - alpha / 2])
+            entry['metrics'][metric] = {
+                'estimate': float(estimates[metric]),
+                'low': float(low),
+                'high': float(high),
+                'std': float(samples.std(ddof=1))
+            }
+        report['models'][name] = entry
+    return report
+
+
+def format_report(report):
+    """Ringkasan teks: metrik [batas bawah, batas atas] per model"""
+    level = int(round((1 - report['alpha']) * 100))
+    lines = [f"Bootstrap {report['n_boot']} resample, CI {level}% (n_test={report['n_test']})"]
+    for name, entry in report['models'].items():
+        lines.append(f"\n{name} (threshold={entry['threshold']:.4f})")
+        for metric, m in entry['metrics'].items():
+            lines.append(f"  {metric:<17} {m['estimate']:.4f}  [{m['low']:.4f}, {m['high']:.4f}]")
+    return "\n".join(lines)
+
+
+def save_report(report, path):
+    """Simpan laporan sebagai JSON (disimpan berdampingan dengan artifact model)"""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
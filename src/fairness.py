@@ -0,0 +1,151 @@
+"""
+==========================================================================
+EVALUASI PER SUBGRUP (FAIRNESS)
+==========================================================================
+Confusion matrix, recall, precision dan AUC untuk setiap subgrup jenis
+kelamin, usia dan sekolah, beserta semua irisannya (mis. sekolah x jenis
+kelamin). Setiap kombinasi dimensi dihitung dalam satu pass vektor:
+kode grup digabung (mixed radix) lalu dihitung dengan np.bincount;
+AUC per grup memakai rank dalam grup (Mann-Whitney).
+Slice dengan recall di bawah recall keseluruhan ditandai.
+==========================================================================
+"""
+
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+from normalizer import normalize_school
+
+# Dimensi default: nama kolom -> label tampilan
+DEFAULT_DIMENSIONS = {
+    'jenis_kelamin': 'Jenis Kelamin',
+    'usia_tahun': 'Usia',
+    'sekolah': 'Sekolah'
+}
+
+_COLUMNS = [
+    'dimensi', 'slice', 'n', 'n_positif', 'tp', 'fp', 'fn', 'tn',
+    'recall', 'precision', 'fpr', 'auc', 'selisih_recall', 'ditandai'
+]
+
+
+def slice_frame(df, y_true, y_prob, threshold):
+    """
+    Susun DataFrame evaluasi dari dataset bersih (baris sejajar dengan y).
+    Jenis kelamin diberi label, nama sekolah dinormalisasi (strip, huruf besar).
+    """
+    frame = pd.DataFrame({
+        'jenis_kelamin': np.where(np.asarray(df['jenis_kelamin']) == 1, 'Laki-laki', 'Perempuan'),
+        'usia_tahun': np.asarray(df['usia_tahun']),
+        'sekolah': normalize_school(df['Asal Sekolah']).to_numpy(),
+        'y_true': np.asarray(y_true).astype(int),
+        'y_prob': np.asarray(y_prob, dtype=np.float64)
+    })
+    frame['y_pred'] = (frame['y_prob'] >= threshold).astype(int)
+    return frame
+
+
+def _grouped_auc(codes, n_groups, y_true, y_prob):
+    """AUC setiap grup sekaligus: rank rata-rata di dalam grup, dijumlah per grup"""
+    ranks = pd.Series(y_prob).groupby(codes).rank(method='average').to_numpy()
+    pos = np.bincount(codes, weights=y_true, minlength=n_groups)
+    n = np.bincount(codes, minlength=n_groups)
+    neg = n - pos
+    rank_pos = np.bincount(codes, weights=ranks * y_true, minlength=n_groups)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        auc = (rank_pos - pos * (pos + 1) / 2) / (pos * neg)
+    return np.where((pos > 0) & (neg > 0), auc, np.nan)
+
+
+def _evaluate_combination(frame, dims, factorized):
+    """Satu pass bincount untuk semua grup pada kombinasi dimensi dims"""
+    codes = np.zeros(len(frame), dtype=np.int64)
+    radix = 1
+    for dim in reversed(dims):
+        dim_codes, _ = factorized[dim]
+        codes += dim_codes * radix
+        radix *= len(factorized[dim][1])
+
+    # Hanya grup yang benar-benar muncul (irisan bisa jarang)
+    present, codes = np.unique(codes, return_inverse=True)
+    n_groups = len(present)
+    y_true = frame['y_true'].to_numpy()
+    y_pred = frame['y_pred'].to_numpy()
+
+    cells = np.bincount(codes * 4 + y_true * 2 + y_pred, minlength=n_groups * 4).reshape(n_groups, 4)
+    tn, fp, fn, tp = cells.T
+    auc = _grouped_auc(codes, n_groups, y_true, frame['y_prob'].to_numpy())
+
+    # Uraikan kode gabungan kembali menjadi label per dimensi
+    labels = []
+    remainder = present
+    parts = {}
+    for dim in reversed(dims):
+        size = len(factorized[dim][1])
+        parts[dim] = factorized[dim][1][remainder % size]
+        remainder = remainder // size
+    for i in range(n_groups):
+        labels.append(" | ".join(f"{dim}={parts[dim][i]}" for dim in dims))
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        result = pd.DataFrame({
+            'dimensi': " x ".join(dims),
+            'slice': labels,
+            'n': cells.sum(axis=1),
+            'n_positif': tp + fn,
+            'tp': tp, 'fp': fp, 'fn': fn, 'tn': tn,
+            'recall': tp / (tp + fn),
+            'precision': tp / (tp + fp),
+            'fpr': fp / (fp + tn),
+            'auc': auc
+        })
+    return result
+
+
+def sliced_evaluation(frame, dimensions=tuple(DEFAULT_DIMENSIONS), max_order=None,
+                      min_positives=5, tolerance=0.0):
+    """
+    Evaluasi semua subgrup dan irisannya.
+
+    frame: DataFrame dengan kolom dimensi + y_true, y_prob, y_pred (lihat slice_frame)
+    max_order: jumlah dimensi maksimum per irisan (default: semua dimensi)
+    min_positives: slice dengan kasus positif lebih sedikit tidak ditandai
+    tolerance: slice ditandai jika recall < recall_keseluruhan - tolerance
+    Mengembalikan (ringkasan_keseluruhan dict, DataFrame per slice).
+    """
+    dimensions = list(dimensions)
+    factorized = {dim: pd.factorize(frame[dim], sort=True) for dim in dimensions}
+    for dim, (codes, _) in factorized.items():
+        if (codes < 0).any():
+            raise ValueError(f"Kolom dimensi '{dim}' berisi nilai kosong")
+
+    y_true, y_pred = frame['y_true'].to_numpy(), frame['y_pred'].to_numpy()
+    tp = int(np.sum((y_true == 1) & (y_pred == 1)))
+    overall = {
+        'n': int(len(frame)),
+        'n_positif': int(y_true.sum()),
+        'recall': tp / max(int(y_true.sum()), 1),
+        'precision': tp / max(int(y_pred.sum()), 1),
+        'auc': float(_grouped_auc(np.zeros(len(frame), dtype=np.int64), 1, y_true, frame['y_prob'].to_numpy())[0])
+    }
+
+    max_order = max_order or len(dimensions)
+    tables = [
+        _evaluate_combination(frame, list(dims), factorized)
+        for order in range(1, max_order + 1)
+        for dims in combinations(dimensions, order)
+    ]
+    slices = pd.concat(tables, ignore_index=True)
+    slices['selisih_recall'] = slices['recall'] - overall['recall']
+    slices['ditandai'] = (
+        (slices['n_positif'] >= min_positives)
+        & (slices['recall'] < overall['recall'] - tolerance)
+    )
+    return overall, slices[_COLUMNS]
+
+
+def flagged_slices(slices):
+    """Slice yang ditandai, recall terendah dahulu"""
+    return slices[slices['ditandai']].sort_values(['recall', 'n_positif'], ascending=[True, False])
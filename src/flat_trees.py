@@ -0,0 +1,181 @@
+"""
+==========================================================================
+FORMAT INFERENSI POHON YANG DI-FLATTEN
+==========================================================================
+Seluruh pohon sebuah ensemble (Random Forest atau HistGradientBoosting)
+disimpan sebagai beberapa array datar (feature, threshold, left, right,
+value) yang digabung untuk semua pohon. Prediksi satu batch menelusuri
+semua pohon sekaligus: matriks indeks node (n_sampel x n_pohon) maju satu
+level per iterasi, sebanyak kedalaman maksimum. Leaf menunjuk ke dirinya
+sendiri sehingga penelusuran berhenti dengan sendirinya.
+
+HistGradientBoosting diekspor dalam bentuk ter-bin: input dipetakan ke
+kode bin uint8 memakai batas bin dari training, dan setiap split
+membandingkan kode uint8 (identik dengan predict() sklearn).
+Dict hasil ekspor hanya berisi array numpy sehingga dapat disimpan tanpa
+ketergantungan ke versi sklearn. Ekspor ini tidak ikut artifact default
+(app menyajikan LR/RF sklearn); dipakai benchmarks/bench_models.py dan
+notebook untuk menilai HGB.
+==========================================================================
+"""
+
+import numpy as np
+
+
+def _pack(trees, aggregate, baseline=0.0, link="identity", **extra):
+    """
+    Gabungkan list pohon (dict array per pohon, indeks node lokal) menjadi
+    satu struktur datar dengan indeks node global.
+    """
+    feature, threshold, left, right, value, missing_left, roots = [], [], [], [], [], [], []
+    offset = 0
+    for tree in trees:
+        n = len(tree['value'])
+        leaf = tree['is_leaf']
+        own = np.arange(n)
+        roots.append(offset)
+        feature.append(np.where(leaf, 0, tree['feature']))
+        threshold.append(tree['threshold'])
+        left.append(offset + np.where(leaf, own, tree['left']))
+        right.append(offset + np.where(leaf, own, tree['right']))
+        value.append(tree['value'])
+        missing_left.append(tree['missing_left'])
+        offset += n
+
+    flat = {
+        'feature': np.concatenate(feature).astype(np.int32),
+        'threshold': np.concatenate(threshold),
+        'left': np.concatenate(left).astype(np.int32),
+        'right': np.concatenate(right).astype(np.int32),
+        'value': np.concatenate(value).astype(np.float64),
+        'missing_left': np.concatenate(missing_left).astype(bool),
+        'roots': np.asarray(roots, dtype=np.int32),
+        'max_depth': int(max(t['max_depth'] for t in trees)),
+        'aggregate': aggregate,
+        'baseline': float(baseline),
+        'link': link
+    }
+    flat.update(extra)
+    return flat
+
+
+# ==========================================
+# EKSPOR
+# ==========================================
+def flatten_forest(rf, positive_class=1):
+    """Ekspor RandomForestClassifier; value leaf = probabilitas kelas positif"""
+    class_idx = list(rf.classes_).index(positive_class)
+    trees = []
+    for estimator in rf.estimators_:
+        tree = estimator.tree_
+        value = tree.value[:, 0, :]
+        missing = getattr(tree, 'missing_go_to_left', None)
+        trees.append({
+            'feature': tree.feature,
+            # sklearn membandingkan input float32 dengan threshold float64
+            'threshold': tree.threshold,
+            'left': tree.children_left,
+            'right': tree.children_right,
+            'is_leaf': tree.children_left < 0,
+            'value': value[:, class_idx] / value.sum(axis=1),
+            'missing_left': np.zeros(tree.node_count, dtype=bool) if missing is None else missing.astype(bool),
+            'max_depth': tree.max_depth
+        })
+    return _pack(trees, aggregate="mean", input_dtype="float32")
+
+
+def flatten_hist_gb(hgb):
+    """
+    Ekspor HistGradientBoostingClassifier biner dalam bentuk ter-bin uint8.
+    Skor = sigmoid(baseline + jumlah value leaf).
+    """
+    if len(hgb.classes_) != 2:
+        raise ValueError("Ekspor hanya untuk klasifikasi biner")
+    trees = []
+    for (predictor,) in hgb._predictors:
+        nodes = predictor.nodes
+        if nodes['is_categorical'].any():
+            raise ValueError("Split kategorikal belum didukung format flat")
+        trees.append({
+            'feature': nodes['feature_idx'],
+            'threshold': nodes['bin_threshold'],
+            'left': nodes['left'].astype(np.int64),
+            'right': nodes['right'].astype(np.int64),
+            'is_leaf': nodes['is_leaf'].astype(bool),
+            'value': nodes['value'],
+            'missing_left': nodes['missing_go_to_left'].astype(bool),
+            'max_depth': int(nodes['depth'].max())
+        })
+    mapper = hgb._bin_mapper
+    flat = _pack(
+        trees, aggregate="sum", baseline=np.ravel(hgb._baseline_prediction)[0], link="logistic",
+        bin_thresholds=[np.asarray(t, dtype=np.float64) for t in mapper.bin_thresholds_],
+        missing_bin=int(mapper.missing_values_bin_idx_)
+    )
+    flat['threshold'] = flat['threshold'].astype(np.uint8)
+    return flat
+
+
+# ==========================================
+# INFERENSI
+# ==========================================
+def bin_features(X, bin_thresholds, missing_bin=255):
+    """Petakan input ke kode bin uint8 (aturan sama dengan _BinMapper sklearn)"""
+    X = np.asarray(X, dtype=np.float64)
+    binned = np.empty(X.shape, dtype=np.uint8)
+    for j, edges in enumerate(bin_thresholds):
+        col = X[:, j]
+        binned[:, j] = np.searchsorted(edges, col, side='left')
+        binned[np.isnan(col), j] = missing_bin
+    return binned
+
+
+def predict_flat(flat, X):
+    """Probabilitas kelas positif untuk satu batch (n_sampel,)"""
+    X = np.atleast_2d(np.asarray(X)).astype(flat.get('input_dtype', 'float64')).astype(np.float64)
+    if 'bin_thresholds' in flat:
+        X = bin_features(X, flat['bin_thresholds'], flat['missing_bin'])
+        is_missing = X == flat['missing_bin']
+    else:
+        is_missing = np.isnan(X)
+    # Tanpa array missing_left, nilai kosong selalu ke kanan (perilaku RF sklearn)
+    missing_left = flat.get('missing_left')
+
+    n_samples = X.shape[0]
+    rows = np.arange(n_samples)[:, None]
+    node = np.broadcast_to(flat['roots'], (n_samples, len(flat['roots']))).copy()
+    feature, threshold = flat['feature'], flat['threshold']
+    for _ in range(flat['max_depth']):
+        f = feature[node]
+        x = X[rows, f]
+        go_left = x <= threshold[node]
+        if missing_left is not None:
+            go_left = np.where(is_missing[rows, f], missing_left[node], go_left)
+        else:
+            go_left &= ~is_missing[rows, f]
+        next_node = np.where(go_left, flat['left'][node], flat['right'][node])
+        if np.array_equal(next_node, node):
+            # Semua sampel sudah di leaf pada semua pohon
+            break
+        node = next_node
+
+    leaf_values = flat['value'][node].astype(np.float64)
+    if flat['aggregate'] == "mean":
+        score = leaf_values.mean(axis=1)
+    else:
+        score = leaf_values.sum(axis=1)
+    score = score + flat['baseline']
+    if flat['link'] == "logistic":
+        return 1.0 / (1.0 + np.exp(-score))
+    return score
+
+
+def flat_size_bytes(flat):
+    """Ukuran total array di struktur flat (byte)"""
+    total = 0
+    for value in flat.values():
+        if isinstance(value, np.ndarray):
+            total += value.nbytes
+        elif isinstance(value, list):
+            total += sum(v.nbytes for v in value if isinstance(v, np.ndarray))
+    return total
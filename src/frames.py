@@ -0,0 +1,130 @@
+"""
+==========================================================================
+REPRESENTASI DATAFRAME HEMAT MEMORI
+==========================================================================
+dataset_bersih.csv membawa 43 kolom: setiap jawaban survey mentah (teks)
+di samping fitur numerik hasil encoding, semuanya object atau float64.
+Setelah encoding, training hanya butuh fitur skema, target BMI dan kolom
+evaluasi per sekolah. compact_frame menyisakan kolom-kolom itu dengan:
+- fitur ordinal / biner (dtype int8 di skema)  -> int8
+- fitur kontinu, BMI                           -> float32
+- label_obesitas -> int8, kategori_BMI & Asal Sekolah -> category
+Semua nilai fitur di dataset dapat direpresentasikan persis di float32,
+sehingga hasil encoding tidak berubah.
+
+preprocess_inplace menjalankan imputasi median + StandardScaler pada satu
+array float32 (tanpa salinan X_train_imputed terpisah).
+==========================================================================
+"""
+
+import sys
+
+import numpy as np
+import pandas as pd
+from sklearn.impute import SimpleImputer
+from sklearn.preprocessing import StandardScaler
+
+from multiclass import BMI_CATEGORIES
+from schema import FEATURE_SCHEMA
+
+# Kolom non-fitur yang tetap disimpan beserta dtype ringkasnya
+KEEP_COLUMNS = {
+    'BMI': np.float32,
+    'label_obesitas': np.int8,
+    'kategori_BMI': pd.CategoricalDtype(BMI_CATEGORIES, ordered=True),
+    'Asal Sekolah': 'category'
+}
+
+
+def compact_dtypes(schema=FEATURE_SCHEMA):
+    """dtype ringkas per fitur skema: int8 tetap int8, selain itu float32"""
+    return {s.name: np.int8 if s.dtype == "int8" else np.float32 for s in schema.specs}
+
+
+def _downcast(values, dtype):
+    if dtype is np.int8:
+        numeric = pd.to_numeric(values, errors='coerce')
+        # int8 tidak bisa menyimpan NaN / pecahan: kolom seperti itu tetap float32
+        if numeric.isna().any() or (numeric % 1 != 0).any():
+            return numeric.astype(np.float32)
+        return numeric.astype(np.int8)
+    if dtype is np.float32:
+        return pd.to_numeric(values, errors='coerce').astype(np.float32)
+    return values.astype(dtype)
+
+
+def compact_frame(df, schema=FEATURE_SCHEMA, keep=KEEP_COLUMNS):
+    """
+    DataFrame ringkas (index sama dengan df): fitur skema + kolom keep yang ada.
+    Kolom teks mentah dan kolom lain dibuang.
+    """
+    missing = [n for n in schema.names if n not in df.columns]
+    if missing:
+        raise ValueError(f"DataFrame tidak memiliki fitur: {missing}")
+    dtypes = {**compact_dtypes(schema), **{c: t for c, t in keep.items() if c in df.columns}}
+    return pd.DataFrame({col: _downcast(df[col], dtype) for col, dtype in dtypes.items()}, index=df.index)
+
+
+def read_compact(path, schema=FEATURE_SCHEMA, keep=KEEP_COLUMNS, **read_kwargs):
+    """Baca dataset bersih langsung ke bentuk ringkas (kolom teks mentah tidak pernah dimuat)"""
+    header = pd.read_csv(path, nrows=0, **read_kwargs).columns
+    usecols = [c for c in (*schema.names, *keep) if c in header]
+    return compact_frame(pd.read_csv(path, usecols=usecols, **read_kwargs), schema, keep)
+
+
+# ==========================================
+# PREPROCESSING IN-PLACE
+# ==========================================
+def preprocess_inplace(X_train, X_test, dtype=np.float32):
+    """
+    Imputasi median lalu StandardScaler (fit pada training) seperti notebook
+    tahap 5.3 - 5.4. X_train/X_test (DataFrame skema) disalin SEKALI ke array
+    dtype, lalu imputasi dan scaling menimpa array yang sama.
+    Mengembalikan (imputer, scaler, X_train_scaled, X_test_scaled).
+    """
+    names = np.array(X_train.columns, dtype=object)
+    train = np.array(X_train, dtype=dtype)
+    test = np.array(X_test, dtype=dtype)
+
+    imputer = SimpleImputer(strategy='median', copy=False).fit(train)
+    train = imputer.transform(train)
+    test = imputer.transform(test)
+    scaler = StandardScaler(copy=False).fit(train)
+    train = scaler.transform(train)
+    test = scaler.transform(test)
+
+    # Artifact sama dengan versi DataFrame: nama fitur di imputer, statistik float64
+    imputer.feature_names_in_ = names
+    imputer.statistics_ = imputer.statistics_.astype(np.float64)
+    imputer.copy = True
+    scaler.copy = True
+    return imputer, scaler, train, test
+
+
+# ==========================================
+# PENGUKURAN MEMORI
+# ==========================================
+def object_mb(obj):
+    """Ukuran DataFrame/Series (deep) atau array dalam MB"""
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        return float(np.sum(obj.memory_usage(deep=True))) / 1024 ** 2
+    return np.asarray(obj).nbytes / 1024 ** 2
+
+
+def memory_table(objects):
+    """Tabel ukuran objek: dict nama -> DataFrame/array"""
+    return pd.DataFrame([
+        {'objek': name, 'bentuk': str(getattr(obj, 'shape', '')), 'mb': object_mb(obj)}
+        for name, obj in objects.items()
+    ])
+
+
+def peak_rss_mb():
+    """Puncak resident set size proses ini (MB); None jika tidak didukung (Windows)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux melaporkan KB, macOS byte
+    return peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024
@@ -0,0 +1,345 @@
+"""
+==========================================================================
+UPDATE MODEL INKREMENTAL
+==========================================================================
+Memperbarui model_data.pkl dengan respon survei baru tanpa retrain penuh:
+- Median imputer & statistik scaler diperbarui dari akumulator berjalan
+- Koefisien Logistic Regression di-warm-start lalu di-update dengan SGD
+- Random Forest ditambah pohon baru yang dilatih pada data baru saja
+- Model kategori BMI (LR multinomial) dipindah ke ruang scaler baru;
+  ekspor pohon datar dihitung ulang dari Random Forest yang diperbarui
+- Artifact turunan skor LR/RF lama (kalibrasi, conformal, ensemble,
+  referensi drift) dan HGB dibuang dengan peringatan, karena tidak lagi
+  cocok dengan model yang diperbarui (latih ulang penuh untuk membuatnya)
+- threshold_lr/threshold_rf tetap dipakai (tidak ada penggantinya tanpa
+  data test) tetapi dicatat di 'stale_thresholds' dan ditampilkan app
+Biaya update sebanding dengan jumlah respon baru, bukan seluruh dataset.
+
+Contoh:
+    python src/incremental.py --model models/model_data.pkl \
+        --new data/respon_baru.csv --base data/dataset_bersih.csv
+==========================================================================
+"""
+
+import argparse
+import logging
+import pickle
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import SGDClassifier
+
+from flat_trees import flatten_forest
+from schema import FEATURE_SCHEMA, check_artifact
+
+logger = logging.getLogger(__name__)
+
+# Bagian artifact yang basi setelah update beserta alasannya
+STALE_AFTER_UPDATE = {
+    'calibration_lr': "tabel kalibrasi dilatih pada skor LR lama",
+    'calibration_rf': "tabel kalibrasi dilatih pada skor RF lama",
+    'conformal_lr': "model fold dan skor conformal dari LR lama (jaminan cakupan tidak lagi berlaku)",
+    'ensemble': "bobot dan threshold ensemble dari skor LR/RF lama",
+    'reference_distribution': "distribusi skor referensi dari model lama (dibangun ulang app dari dataset)",
+    'hgb': "HGB dilatih pada ruang scaler lama dan tidak diperbarui",
+    'threshold_hgb': "threshold milik HGB yang dibuang"
+}
+
+# Threshold yang tetap dipakai serving (tidak ada pengganti) tetapi ditandai basi:
+# dipilih pada skor lama, sedangkan SGD dan pohon baru menggeser skor LR/RF
+STALE_THRESHOLDS = {
+    'threshold_lr': "dipilih pada skor LR sebelum update SGD",
+    'threshold_rf': "dipilih pada skor RF sebelum pohon baru ditambahkan"
+}
+
+
+# ==========================================
+# AKUMULATOR BERJALAN
+# ==========================================
+class FeatureAccumulator:
+    """
+    Statistik berjalan per fitur: histogram nilai (untuk median imputer),
+    jumlah, mean dan M2 (untuk scaler) serta jumlah sampel per kelas.
+    Fitur survei berupa kode ordinal kecil, sehingga histogram tetap ringkas.
+    """
+
+    def __init__(self, n_features):
+        self.n_features = n_features
+        self.value_counts = [{} for _ in range(n_features)]
+        self.n = np.zeros(n_features, dtype=np.int64)
+        self.mean = np.zeros(n_features)
+        self.m2 = np.zeros(n_features)
+        self.class_counts = {}
+
+    def update(self, X, y=None):
+        """Tambahkan batch baru (nilai mentah sebelum imputasi, NaN diabaikan)"""
+        X = np.asarray(X, dtype=np.float64)
+        for j in range(self.n_features):
+            col = X[:, j]
+            col = col[~np.isnan(col)]
+            if col.size == 0:
+                continue
+            values, counts = np.unique(col, return_counts=True)
+            hist = self.value_counts[j]
+            for v, c in zip(values.tolist(), counts.tolist()):
+                hist[v] = hist.get(v, 0) + c
+
+            # Penggabungan mean/varians paralel (Chan et al.)
+            n_b = col.size
+            mean_b = col.mean()
+            m2_b = ((col - mean_b) ** 2).sum()
+            n_a = self.n[j]
+            delta = mean_b - self.mean[j]
+            total = n_a + n_b
+            self.mean[j] += delta * n_b / total
+            self.m2[j] += m2_b + delta ** 2 * n_a * n_b / total
+            self.n[j] = total
+
+        if y is not None:
+            values, counts = np.unique(np.asarray(y), return_counts=True)
+            for v, c in zip(values.tolist(), counts.tolist()):
+                self.class_counts[v] = self.class_counts.get(v, 0) + c
+
+    def medians(self):
+        """Median per fitur dari histogram nilai"""
+        result = np.full(self.n_features, np.nan)
+        for j, hist in enumerate(self.value_counts):
+            if not hist:
+                continue
+            values = np.array(sorted(hist))
+            cum = np.cumsum([hist[v] for v in values])
+            total = cum[-1]
+            lo = values[np.searchsorted(cum, (total + 1) // 2)]
+            hi = values[np.searchsorted(cum, total // 2 + 1)]
+            result[j] = (lo + hi) / 2
+        return result
+
+    def variances(self):
+        return np.where(self.n > 0, self.m2 / np.maximum(self.n, 1), 0.0)
+
+    def class_weight(self):
+        """Bobot kelas 'balanced' dari jumlah kumulatif per kelas"""
+        total = sum(self.class_counts.values())
+        n_classes = len(self.class_counts)
+        return {c: total / (n_classes * n) for c, n in self.class_counts.items()}
+
+
+def init_accumulator(X, y):
+    """Buat akumulator awal dari data training (dipanggil saat menyimpan model)"""
+    acc = FeatureAccumulator(np.asarray(X).shape[1])
+    acc.update(X, y)
+    return acc
+
+
+# ==========================================
+# REPARAMETRISASI KE SCALER BARU
+# ==========================================
+def _rescale_logreg(logreg, mean_old, scale_old, mean_new, scale_new):
+    """
+    Ubah koefisien LR agar prediksi identik setelah scaler berganti:
+    w' = w * s_new / s_old,  b' = b + sum(w * (mu_new - mu_old) / s_old)
+    """
+    w = logreg.coef_[0]
+    logreg.intercept_ = logreg.intercept_ + np.sum(w * (mean_new - mean_old) / scale_old)
+    logreg.coef_ = (w * scale_new / scale_old).reshape(1, -1)
+
+
+def _rescale_multinomial(model, mean_old, scale_old, mean_new, scale_new):
+    """Sama dengan _rescale_logreg untuk array koefisien (k, d) model kategori BMI"""
+    coef = model['coef']
+    model['intercept'] = model['intercept'] + coef @ ((mean_new - mean_old) / scale_old)
+    model['coef'] = coef * (scale_new / scale_old)
+
+
+def _scaled_float32(values, mean, scale):
+    """Nilai ter-scale persis seperti yang dibandingkan pohon sklearn (float32)"""
+    return ((values - mean) / scale).astype(np.float32).astype(np.float64)
+
+
+def _rescale_forest(rf, grids, mean_old, scale_old, mean_new, scale_new):
+    """
+    Pindahkan threshold split pohon lama ke ruang scaler baru.
+
+    Transformasi monoton saja tidak cukup: pohon hasil SMOTE punya split yang
+    nyaris tepat di nilai grid (mis. 1.99999996 pada skala mentah), dan setelah
+    scaler berganti input float32 dapat jatuh ke sisi lain split tersebut.
+    Karena itu threshold baru dipilih agar setiap nilai grid fitur (nilai
+    mentah yang pernah teramati) tetap berada di sisi split yang sama;
+    threshold hasil transformasi dipakai bila sudah memenuhi, selain itu
+    titik tengah antara dua nilai grid yang mengapitnya.
+    Prediksi untuk nilai di grid tidak berubah; nilai di luar grid dapat
+    berpindah cabang bila berada sangat dekat dengan split.
+    """
+    for tree in rf.estimators_:
+        t = tree.tree_
+        feature, threshold = t.feature, t.threshold
+        for j, grid in enumerate(grids):
+            nodes = np.flatnonzero(feature == j)
+            if nodes.size == 0:
+                continue
+            t_old = threshold[nodes]
+            naive = (t_old * scale_old[j] + mean_old[j] - mean_new[j]) / scale_new[j]
+            if grid.size == 0:
+                threshold[nodes] = naive
+                continue
+
+            # Grid terurut dan transformasi monoton: sisi kiri split lama = prefix grid
+            x_old = _scaled_float32(grid, mean_old[j], scale_old[j])
+            x_new = _scaled_float32(grid, mean_new[j], scale_new[j])
+            k = np.searchsorted(x_old, t_old, side="right")
+            lo = np.where(k > 0, x_new[np.maximum(k - 1, 0)], -np.inf)
+            hi = np.where(k < grid.size, x_new[np.minimum(k, grid.size - 1)], np.inf)
+            with np.errstate(invalid="ignore"):
+                fallback = np.where(k == 0, np.nextafter(hi, -np.inf),
+                                    np.where(k == grid.size, lo, (lo + hi) / 2))
+            threshold[nodes] = np.where((naive >= lo) & (naive < hi), naive, fallback)
+
+
+def _feature_grids(acc, *statistics):
+    """Nilai mentah per fitur: histogram akumulator ditambah median imputer"""
+    grids = []
+    for j, hist in enumerate(acc.value_counts):
+        values = set(hist)
+        for stats in statistics:
+            if not np.isnan(stats[j]):
+                values.add(float(stats[j]))
+        grids.append(np.array(sorted(values), dtype=np.float64))
+    return grids
+
+
+# ==========================================
+# UPDATE MODEL
+# ==========================================
+def update_model(model_data, X_new, y_new, n_new_trees=10, sgd_epochs=5,
+                 learning_rate=0.01, random_state=42):
+    """
+    Update inkremental model_data dengan batch data baru (in place).
+
+    X_new: nilai fitur mentah (kolom sesuai FEATURE_SCHEMA.names)
+    y_new: label_obesitas untuk batch baru
+    Mengembalikan model_data yang sama untuk kemudahan chaining.
+    """
+    acc = model_data.get('accumulator')
+    if acc is None:
+        raise ValueError(
+            "model_data tidak memiliki 'accumulator'. Jalankan dengan --base "
+            "(dataset training lama) untuk membuat akumulator awal."
+        )
+
+    X_new = np.asarray(X_new, dtype=np.float64)
+    y_new = np.asarray(y_new)
+    imputer = model_data['imputer']
+    scaler = model_data['scaler']
+    logreg = model_data['logreg']
+    rf = model_data['rf']
+
+    mean_old = scaler.mean_.copy()
+    scale_old = scaler.scale_.copy()
+    statistics_old = imputer.statistics_.copy()
+
+    # 1. Perbarui akumulator, median imputer dan statistik scaler
+    acc.update(X_new, y_new)
+    medians = acc.medians()
+    imputer.statistics_ = np.where(np.isnan(medians), imputer.statistics_, medians)
+
+    var = acc.variances()
+    scaler.mean_ = acc.mean.copy()
+    scaler.var_ = var
+    scaler.scale_ = np.where(var > 0, np.sqrt(var), 1.0)
+    scaler.n_samples_seen_ = acc.n.copy()
+
+    # 2. Model lama dipindah ke ruang scaler baru (prediksi untuk nilai grid tidak berubah)
+    _rescale_logreg(logreg, mean_old, scale_old, scaler.mean_, scaler.scale_)
+    grids = _feature_grids(acc, statistics_old, imputer.statistics_)
+    _rescale_forest(rf, grids, mean_old, scale_old, scaler.mean_, scaler.scale_)
+    if model_data.get('bmi_category') is not None:
+        _rescale_multinomial(model_data['bmi_category'], mean_old, scale_old, scaler.mean_, scaler.scale_)
+
+    X_scaled = scaler.transform(imputer.transform(X_new))
+    class_weight = acc.class_weight()
+    sample_weight = np.array([class_weight[c] for c in y_new.tolist()])
+
+    # 3. Logistic Regression: SGD (log loss) mulai dari koefisien sebelumnya
+    n_seen = sum(acc.class_counts.values())
+    sgd = SGDClassifier(
+        loss="log_loss",
+        alpha=1.0 / (logreg.C * n_seen),
+        learning_rate="constant",
+        eta0=learning_rate,
+        max_iter=sgd_epochs,
+        tol=None,
+        random_state=random_state
+    )
+    sgd.fit(X_scaled, y_new, coef_init=logreg.coef_, intercept_init=logreg.intercept_,
+            sample_weight=sample_weight)
+    logreg.coef_ = sgd.coef_.copy()
+    logreg.intercept_ = sgd.intercept_.copy()
+
+    # 4. Random Forest: tambah pohon baru yang dilatih pada data baru saja
+    if n_new_trees > 0 and len(np.unique(y_new)) > 1:
+        rf.set_params(
+            warm_start=True,
+            n_estimators=len(rf.estimators_) + n_new_trees,
+            class_weight=class_weight
+        )
+        rf.fit(X_scaled, y_new)
+
+    # 5. Turunan model lama: hitung ulang bila bisa, selain itu buang
+    # (flat_trees / hgb hanya ada di artifact lama)
+    if model_data.get('flat_trees') is not None:
+        model_data['flat_trees'] = {'rf': flatten_forest(rf)}
+    for key, reason in STALE_AFTER_UPDATE.items():
+        if model_data.pop(key, None) is not None:
+            logger.warning("'%s' dihapus dari artifact: %s", key, reason)
+    stale = model_data.setdefault('stale_thresholds', {})
+    for key, reason in STALE_THRESHOLDS.items():
+        if key in model_data:
+            logger.warning("'%s' tetap dipakai tetapi basi: %s", key, reason)
+            stale[key] = reason
+
+    model_data['n_updates'] = model_data.get('n_updates', 0) + 1
+    return model_data
+
+
+# ==========================================
+# COMMAND LINE
+# ==========================================
+def main():
+    parser = argparse.ArgumentParser(description="Update inkremental model_data.pkl")
+    parser.add_argument("--model", default="models/model_data.pkl", help="Path model_data.pkl")
+    parser.add_argument("--new", required=True, help="CSV respon baru (format dataset_bersih)")
+    parser.add_argument("--base", help="CSV data training lama, untuk membuat akumulator awal")
+    parser.add_argument("--output", help="Path output (default: menimpa --model)")
+    parser.add_argument("--trees", type=int, default=10, help="Jumlah pohon RF baru")
+    args = parser.parse_args()
+
+    with open(args.model, "rb") as f:
+        model_data = pickle.load(f)
+    for note in check_artifact(model_data):
+        print(note)
+
+    if 'accumulator' not in model_data:
+        if not args.base:
+            parser.error("model belum memiliki akumulator; sertakan --base")
+        base = pd.read_csv(args.base)
+        X_base = FEATURE_SCHEMA.assemble(base, validate=True)
+        model_data['accumulator'] = init_accumulator(X_base, base["label_obesitas"])
+
+    new = pd.read_csv(args.new)
+    X_new = FEATURE_SCHEMA.assemble(new, validate=True)
+    update_model(model_data, X_new, new["label_obesitas"], n_new_trees=args.trees)
+
+    # Tulis ke file sementara lalu ganti: registry app tidak pernah membaca artifact setengah jadi
+    output = Path(args.output or args.model)
+    tmp = output.with_suffix(".tmp")
+    with open(tmp, "wb") as f:
+        pickle.dump(model_data, f)
+    tmp.replace(output)
+    print(f"Model diperbarui dengan {len(new)} respon baru -> {output}")
+    print(f"  Jumlah pohon RF: {len(model_data['rf'].estimators_)}")
+    print(f"  Jumlah update  : {model_data['n_updates']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+"""
+==========================================================================
+MONITORING DRIFT INPUT PREDIKSI
+==========================================================================
+Setiap input yang dinilai model dicatat ke streaming sketch berukuran tetap:
+- histogram per fitur atas kode diskret MAPPING_* (plus bin "lainnya")
+- histogram skor probabilitas (bin tetap 0-1)
+Pencatatan di jalur request hanya memasukkan item ke antrian berkapasitas
+tetap (item dibuang dan dihitung bila penuh, sehingga memori tetap
+terbatas walau timer tertunda); pembaruan histogram dan perhitungan PSI/KL
+terhadap distribusi training (disimpan di artifact sebagai
+'reference_distribution') berjalan di thread latar belakang.
+==========================================================================
+"""
+
+import logging
+import queue
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+SCORE_BINS = 10
+EPS = 1e-4
+
+# Ambang PSI yang umum dipakai
+PSI_WARNING = 0.1
+PSI_ALERT = 0.25
+
+# Kapasitas antrian record() sebelum item dibuang
+MAX_PENDING = 10000
+
+
+# ==========================================
+# DISTRIBUSI REFERENSI (TRAINING)
+# ==========================================
+def build_reference(X, scores, max_values=50):
+    """
+    Distribusi referensi dari data training untuk disimpan di artifact.
+    X: DataFrame fitur mentah; scores: probabilitas model pada data yang sama.
+    Fitur dengan lebih dari max_values nilai unik memakai bin kuantil.
+    """
+    features = {}
+    for name in X.columns:
+        col = X[name].dropna().to_numpy(dtype=np.float64)
+        values, counts = np.unique(col, return_counts=True)
+        if len(values) <= max_values:
+            features[name] = {'values': values.tolist(), 'proportions': (counts / counts.sum()).tolist()}
+        else:
+            edges = np.unique(np.quantile(col, np.linspace(0, 1, 11)))
+            hist, _ = np.histogram(col, bins=edges)
+            features[name] = {'edges': edges.tolist(), 'proportions': (hist / hist.sum()).tolist()}
+
+    edges = np.linspace(0, 1, SCORE_BINS + 1)
+    hist, _ = np.histogram(np.asarray(scores), bins=edges)
+    return {
+        'features': features,
+        'score': {'edges': edges.tolist(), 'proportions': (hist / max(hist.sum(), 1)).tolist()},
+        'n_samples': int(len(X))
+    }
+
+
+def reference_from_dataset(model_data, csv_path):
+    """
+    Referensi untuk artifact lama yang belum menyimpan 'reference_distribution':
+    dihitung ulang dari dataset bersih dan skor LR artifact tersebut.
+    """
+    from schema import FEATURE_SCHEMA
+
+    X = FEATURE_SCHEMA.assemble(pd.read_csv(csv_path))
+    X_scaled = model_data['scaler'].transform(model_data['imputer'].transform(X))
+    return build_reference(X, model_data['logreg'].predict_proba(X_scaled)[:, 1])
+
+
+def psi(expected, actual):
+    """Population Stability Index antara dua distribusi proporsi"""
+    e = np.clip(np.asarray(expected, dtype=np.float64), EPS, None)
+    a = np.clip(np.asarray(actual, dtype=np.float64), EPS, None)
+    return float(np.sum((a - e) * np.log(a / e)))
+
+
+def kl_divergence(expected, actual):
+    """KL(actual || expected)"""
+    e = np.clip(np.asarray(expected, dtype=np.float64), EPS, None)
+    a = np.clip(np.asarray(actual, dtype=np.float64), EPS, None)
+    return float(np.sum(a * np.log(a / e)))
+
+
+# ==========================================
+# STREAMING SKETCH
+# ==========================================
+class _FeatureSketch:
+    """Histogram berukuran tetap untuk satu fitur (nilai diskret atau bin rentang)"""
+
+    def __init__(self, spec):
+        if 'values' in spec:
+            self.values = np.asarray(spec['values'], dtype=np.float64)
+            self.edges = None
+            n_bins = len(self.values)
+        else:
+            self.values = None
+            self.edges = np.asarray(spec['edges'], dtype=np.float64)
+            n_bins = len(self.edges) - 1
+        # Bin tambahan terakhir = nilai di luar referensi ("lainnya")
+        self.expected = np.append(np.asarray(spec['proportions'], dtype=np.float64), 0.0)
+        self.counts = np.zeros(n_bins + 1)
+
+    def bin_index(self, x):
+        x = np.asarray(x, dtype=np.float64)
+        other = len(self.counts) - 1
+        if self.values is not None:
+            idx = np.searchsorted(self.values, x)
+            idx_clip = np.minimum(idx, len(self.values) - 1)
+            return np.where(np.isclose(self.values[idx_clip], x), idx_clip, other)
+        idx = np.searchsorted(self.edges, x, side='right') - 1
+        idx = np.where(x == self.edges[-1], len(self.edges) - 2, idx)
+        return np.where((idx >= 0) & (idx < other), idx, other)
+
+
+class DriftMonitor:
+    """
+    Monitor drift dengan antrian non-blocking dan thread latar belakang.
+    record() aman dipanggil dari banyak thread Streamlit sekaligus.
+    """
+
+    def __init__(self, reference, interval=60.0, decay=1.0, min_samples=30, max_pending=MAX_PENDING):
+        self.reference = reference
+        self.interval = interval
+        self.decay = decay
+        self.min_samples = min_samples
+
+        self.features = list(reference['features'])
+        self._sketches = {name: _FeatureSketch(spec) for name, spec in reference['features'].items()}
+        score_spec = reference['score']
+        self._score_edges = np.asarray(score_spec['edges'])
+        self._score_expected = np.asarray(score_spec['proportions'])
+        self._score_counts = np.zeros(len(self._score_expected))
+        self.n_seen = 0
+        self.n_dropped = 0
+        self._dropped_logged = 0
+
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._drop_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._report = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    # ==========================================
+    # JALUR REQUEST
+    # ==========================================
+    def record(self, input_data, score):
+        """Catat satu input (dict nama_fitur -> nilai) dan skornya; O(1), tidak pernah menunggu"""
+        try:
+            self._queue.put_nowait((input_data, score))
+        except queue.Full:
+            with self._drop_lock:
+                self.n_dropped += 1
+
+    # ==========================================
+    # THREAD LATAR BELAKANG
+    # ==========================================
+    def _drain(self):
+        """Ambil semua item di antrian dan perbarui histogram secara batch"""
+        items = []
+        while True:
+            try:
+                items.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if not items:
+            return 0
+
+        frame = pd.DataFrame([x for x, _ in items])
+        for name, sketch in self._sketches.items():
+            if name not in frame.columns:
+                continue
+            col = pd.to_numeric(frame[name], errors='coerce').to_numpy(dtype=np.float64)
+            col = col[~np.isnan(col)]
+            sketch.counts += np.bincount(sketch.bin_index(col), minlength=len(sketch.counts))
+
+        scores = np.clip(np.asarray([s for _, s in items], dtype=np.float64), 0, 1)
+        idx = np.minimum(np.searchsorted(self._score_edges, scores, side='right') - 1, len(self._score_counts) - 1)
+        self._score_counts += np.bincount(idx, minlength=len(self._score_counts))
+        self.n_seen += len(items)
+        return len(items)
+
+    def compute_report(self):
+        """Hitung PSI/KL setiap fitur dan skor terhadap distribusi referensi"""
+        with self._lock:
+            return self._compute_report()
+
+    def _compute_report(self):
+        self._drain()
+        rows = []
+        for name, sketch in self._sketches.items():
+            total = sketch.counts.sum()
+            if total == 0:
+                continue
+            actual = sketch.counts / total
+            rows.append({
+                'fitur': name,
+                'n': int(total),
+                'psi': psi(sketch.expected, actual),
+                'kl': kl_divergence(sketch.expected, actual),
+                'lainnya': float(actual[-1])
+            })
+        total = self._score_counts.sum()
+        if total:
+            actual = self._score_counts / total
+            rows.append({
+                'fitur': 'skor_prediksi',
+                'n': int(total),
+                'psi': psi(self._score_expected, actual),
+                'kl': kl_divergence(self._score_expected, actual),
+                'lainnya': 0.0
+            })
+
+        report = pd.DataFrame(rows, columns=['fitur', 'n', 'psi', 'kl', 'lainnya'])
+        report['status'] = np.select(
+            [report['n'] < self.min_samples, report['psi'] >= PSI_ALERT, report['psi'] >= PSI_WARNING],
+            ['data kurang', 'drift', 'waspada'],
+            default='stabil'
+        )
+        self._report = {'waktu': time.time(), 'n_seen': self.n_seen, 'n_dropped': self.n_dropped, 'tabel': report}
+        if self.n_dropped > self._dropped_logged:
+            logger.warning("%d input drift dibuang karena antrian penuh sejak laporan sebelumnya",
+                           self.n_dropped - self._dropped_logged)
+            self._dropped_logged = self.n_dropped
+
+        drifted = report.loc[report['status'] == 'drift', 'fitur'].tolist()
+        if drifted:
+            logger.warning("Drift terdeteksi (PSI >= %.2f) pada: %s", PSI_ALERT, drifted)
+
+        # Peluruhan agar jendela lebih menekankan data terbaru
+        if self.decay < 1.0:
+            for sketch in self._sketches.values():
+                sketch.counts *= self.decay
+            self._score_counts *= self.decay
+        return self._report
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.compute_report()
+            except Exception:
+                logger.exception("Gagal menghitung laporan drift")
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="drift-monitor", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1)
+
+    @property
+    def report(self):
+        """Laporan terakhir dari timer (None jika belum ada)"""
+        return self._report
@@ -0,0 +1,104 @@
+"""
+==========================================================================
+MODEL KATEGORI BMI (MULTIKELAS, STANDAR ASIA)
+==========================================================================
+Selain label biner obesitas (BMI >= 25), model ini memprediksi distribusi
+enam kategori BMI standar Asia (kategori_BMI di notebook tahap 3.1).
+Logistic Regression multinomial dilatih pada fitur yang sudah diimputasi
+dan di-scaling yang sama dengan model biner, lalu diekspor sebagai array
+koefisien. Inferensi = satu perkalian matriks + softmax.
+==========================================================================
+"""
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score, f1_score, log_loss, roc_auc_score
+
+BMI_CATEGORIES = ("Kurus", "Normal", "Overweight", "Obesitas I", "Obesitas II", "Obesitas Morbid")
+# Batas bawah kategori ke-2 dst. (sama dengan bmi_category_asia di notebook)
+BMI_EDGES = (18.5, 23.0, 25.0, 30.0, 40.0)
+# Kategori yang termasuk label_obesitas = 1
+OBESE_CATEGORIES = ("Obesitas I", "Obesitas II", "Obesitas Morbid")
+
+
+def bmi_category(bmi):
+    """Kategori BMI standar Asia untuk array BMI (vektor)"""
+    codes = np.searchsorted(BMI_EDGES, np.asarray(bmi, dtype=np.float64), side='right')
+    return np.array(BMI_CATEGORIES, dtype=object)[codes]
+
+
+def category_codes(categories):
+    """Label kategori -> kode urut 0..5 (urutan BMI_CATEGORIES)"""
+    codes = pd.Categorical(categories, categories=BMI_CATEGORIES).codes
+    if (codes < 0).any():
+        raise ValueError(f"Kategori BMI tidak dikenal: {sorted(set(np.asarray(categories)[codes < 0]))}")
+    return codes.astype(np.int64)
+
+
+# ==========================================
+# TRAINING & INFERENSI
+# ==========================================
+def train_bmi_category_model(X_scaled, categories, C=1.0, class_weight=None, random_state=42):
+    """
+    Latih LR multinomial dan ekspor ke array.
+    X_scaled: fitur setelah imputasi + scaling; categories: label kategori_BMI.
+    Kelas yang tidak muncul di data training tidak ikut dimodelkan.
+    Tanpa class_weight probabilitas mengikuti prevalensi kategori.
+    """
+    codes = category_codes(categories)
+    model = LogisticRegression(
+        C=C, max_iter=2000, random_state=random_state, class_weight=class_weight
+    )
+    model.fit(np.asarray(X_scaled, dtype=np.float64), codes)
+    return {
+        'classes': [BMI_CATEGORIES[c] for c in model.classes_],
+        'coef': model.coef_.astype(np.float64),
+        'intercept': model.intercept_.astype(np.float64),
+        'C': C,
+        'class_weight': class_weight,
+        'n_samples': int(len(codes))
+    }
+
+
+def predict_category_proba(X_scaled, model):
+    """Probabilitas per kategori (n, k): softmax(X W^T + b)"""
+    logits = np.asarray(X_scaled, dtype=np.float64) @ model['coef'].T + model['intercept']
+    logits -= logits.max(axis=1, keepdims=True)
+    np.exp(logits, out=logits)
+    logits /= logits.sum(axis=1, keepdims=True)
+    return logits
+
+
+def obesity_probability(proba, model):
+    """P(BMI >= 25) = jumlah probabilitas kategori obesitas"""
+    obese = [i for i, c in enumerate(model['classes']) if c in OBESE_CATEGORIES]
+    return proba[:, obese].sum(axis=1)
+
+
+def category_report(categories, proba, model):
+    """
+    Evaluasi pada data uji: akurasi, F1 makro, log loss, rata-rata selisih
+    kategori (ordinal), recall per kategori dan AUC P(obesitas) turunan.
+    """
+    classes = model['classes']
+    true = category_codes(categories)
+    class_codes = category_codes(classes)
+    pred = class_codes[np.argmax(proba, axis=1)]
+    # Kategori uji yang tidak dimodelkan tetap dihitung sebagai salah
+    present = np.isin(true, class_codes)
+    label_index = np.searchsorted(class_codes, np.where(present, true, class_codes[0]))
+
+    recall = {
+        c: float(np.mean(pred[true == code] == code)) if np.any(true == code) else np.nan
+        for c, code in zip(classes, class_codes)
+    }
+    is_obese = np.isin(np.asarray(categories), OBESE_CATEGORIES).astype(int)
+    return {
+        'accuracy': accuracy_score(true, pred),
+        'f1_macro': f1_score(true, pred, average='macro', labels=class_codes, zero_division=0),
+        'log_loss': log_loss(label_index[present], proba[present], labels=np.arange(len(classes))),
+        'selisih_kategori_rata2': float(np.mean(np.abs(pred - true))),
+        'recall_per_kategori': recall,
+        'auc_obesitas': roc_auc_score(is_obese, obesity_probability(proba, model))
+    }
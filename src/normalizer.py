@@ -0,0 +1,115 @@
+"""
+==========================================================================
+NORMALISASI JAWABAN SURVEY MENTAH
+==========================================================================
+Jawaban survey ditulis dengan banyak variasi ("0 - 2 kali", "0-2 kali",
+"> 10  kali", ">10 kali", "5–6 jam", "7 -8 jam"). Daripada mendaftar semua
+variasi di dict mapping, setiap string diubah ke bentuk kanonik (huruf
+kecil, spasi tunggal, tanda hubung dan pembanding tanpa spasi) lalu
+dicocokkan ke kunci mapping yang juga sudah dikanonikkan.
+
+Kanonikalisasi hanya dijalankan sekali per nilai UNIK: kolom di-factorize,
+nilai unik dipetakan ke array lookup, lalu semua baris diambil dengan
+take(). Variasi yang tidak dikenal dilaporkan (tidak diam-diam jadi NaN).
+==========================================================================
+"""
+
+import re
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+_DASHES = re.compile(r"[‐-―−]")
+_SPACES = re.compile(r"\s+")
+_AROUND_DASH = re.compile(r"\s*-\s*")
+_COMPARATOR = re.compile(r"(<=|>=|≤|≥|<|>)\s*")
+_DIGIT_LETTER = re.compile(r"(\d)([a-z])")
+
+
+def canonicalize(text):
+    """Bentuk kanonik satu jawaban; None untuk nilai kosong"""
+    if text is None or (isinstance(text, float) and np.isnan(text)):
+        return None
+    text = unicodedata.normalize("NFKC", str(text)).lower()
+    text = _DASHES.sub("-", text)
+    text = _SPACES.sub(" ", text).strip()
+    text = _AROUND_DASH.sub("-", text)
+    text = _COMPARATOR.sub(r"\1", text)
+    text = _DIGIT_LETTER.sub(r"\1 \2", text)
+    return text
+
+
+def normalize_school(values):
+    """
+    Nama sekolah kanonik (spasi tepi dibuang, huruf besar). Dipakai results
+    store, evaluasi per sekolah dan log prediksi agar ketiganya dapat di-join.
+    values: Series (diproses vektor) atau satu nilai; nilai kosong -> None.
+    """
+    if isinstance(values, pd.Series):
+        return values.astype(str).str.strip().str.upper()
+    if values is None:
+        return None
+    return str(values).strip().upper() or None
+
+
+class AnswerNormalizer:
+    """
+    Lookup jawaban -> nilai numerik yang dikompilasi sekali dari dict mapping.
+    Kunci yang berbeda tetapi kanoniknya sama harus bernilai sama.
+    """
+
+    def __init__(self, mapping, name=None):
+        self.name = name
+        self.lookup = {}
+        for key, value in mapping.items():
+            canon = canonicalize(key)
+            if canon in self.lookup and self.lookup[canon] != value:
+                raise ValueError(
+                    f"Mapping {name or ''}: '{key}' -> {value} bertentangan dengan "
+                    f"'{canon}' -> {self.lookup[canon]}"
+                )
+            self.lookup[canon] = value
+
+    def transform(self, values):
+        """
+        Petakan satu kolom. Mengembalikan (Series nilai float, DataFrame variasi
+        tidak dikenal dengan kolom: jawaban, kanonik, jumlah).
+        """
+        series = values if isinstance(values, pd.Series) else pd.Series(values)
+        codes, uniques = pd.factorize(series, use_na_sentinel=True)
+
+        canon = [canonicalize(u) for u in uniques]
+        table = np.array([self.lookup.get(c, np.nan) for c in canon], dtype=np.float64)
+        # Kode -1 (NaN) diarahkan ke slot terakhir yang bernilai NaN
+        result = np.append(table, np.nan).take(codes)
+
+        unmapped = np.flatnonzero(np.isnan(table))
+        counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+        report = pd.DataFrame({
+            'jawaban': [uniques[i] for i in unmapped],
+            'kanonik': [canon[i] for i in unmapped],
+            'jumlah': counts[unmapped]
+        }).sort_values('jumlah', ascending=False, ignore_index=True)
+        return pd.Series(result, index=series.index, name=series.name), report
+
+
+def normalize_columns(df, specs):
+    """
+    Normalisasi beberapa kolom sekaligus.
+    specs: dict kolom_baru -> (kolom_sumber, AnswerNormalizer atau dict mapping)
+    Normalizer yang sudah dikompilasi dipakai ulang; dict mapping dikompilasi di sini.
+    Mengembalikan (DataFrame kolom baru, DataFrame laporan variasi tidak dikenal).
+    """
+    columns, reports = {}, []
+    for target, (source, mapping) in specs.items():
+        normalizer = mapping if isinstance(mapping, AnswerNormalizer) else AnswerNormalizer(mapping, name=target)
+        values, report = normalizer.transform(df[source])
+        columns[target] = values
+        if len(report):
+            reports.append(report.assign(kolom=target))
+    report = (
+        pd.concat(reports, ignore_index=True)[['kolom', 'jawaban', 'kanonik', 'jumlah']]
+        if reports else pd.DataFrame(columns=['kolom', 'jawaban', 'kanonik', 'jumlah'])
+    )
+    return pd.DataFrame(columns, index=df.index), report
@@ -0,0 +1,131 @@
+"""
+==========================================================================
+OVERSAMPLING - PENYEIMBANGAN DATA TRAINING
+==========================================================================
+Pengganti tahap 5.5 (SMOTE) yang hemat waktu dan memori untuk data besar:
+- SMOTE dengan spatial index (KD-tree / ball tree) hanya pada kelas minoritas
+- Data sintetis dibuat per chunk langsung ke array float32
+- Alternatif tanpa resampling: class weight saja atau balanced bagging
+==========================================================================
+"""
+
+import numpy as np
+from sklearn.neighbors import KDTree, BallTree
+
+# Metode yang didukung oleh resample_training_data()
+OVERSAMPLING_METHODS = ("smote_kdtree", "smote", "class_weight", "none")
+
+_TREE_CLASSES = {
+    "kd_tree": KDTree,
+    "ball_tree": BallTree,
+}
+
+
+# ==========================================
+# SMOTE DENGAN SPATIAL INDEX
+# ==========================================
+def _minority_neighbors(X_min, k, algorithm="kd_tree", leaf_size=40, chunk_size=10_000):
+    """Cari k tetangga terdekat tiap sampel minoritas (tanpa dirinya sendiri)"""
+    tree = _TREE_CLASSES[algorithm](X_min, leaf_size=leaf_size)
+    neighbors = np.empty((X_min.shape[0], k), dtype=np.int32)
+    for start in range(0, X_min.shape[0], chunk_size):
+        stop = min(start + chunk_size, X_min.shape[0])
+        _, idx = tree.query(X_min[start:stop], k=k + 1)
+        # Kolom pertama adalah sampel itu sendiri (jarak 0)
+        neighbors[start:stop] = idx[:, 1:]
+    return neighbors
+
+
+def smote_kdtree(X, y, k_neighbors=5, sampling_strategy=1.0, random_state=42,
+                 algorithm="kd_tree", chunk_size=10_000, dtype=np.float32):
+    """
+    SMOTE biner dengan pencarian tetangga memakai KD-tree/ball tree.
+
+    Index hanya dibangun di atas sampel kelas minoritas, sehingga biaya
+    pencarian tidak bergantung pada jumlah sampel mayoritas. Sampel sintetis
+    ditulis per chunk langsung ke array hasil bertipe `dtype` (default float32).
+
+    sampling_strategy: rasio minoritas/mayoritas yang diinginkan setelah resampling.
+    """
+    X = np.asarray(X)
+    y = np.asarray(y)
+    if X.ndim != 2 or X.shape[0] != y.shape[0]:
+        raise ValueError("X harus 2 dimensi dengan jumlah baris sama dengan y")
+    if algorithm not in _TREE_CLASSES:
+        raise ValueError(f"algorithm harus salah satu dari {list(_TREE_CLASSES)}")
+
+    classes, counts = np.unique(y, return_counts=True)
+    if len(classes) != 2:
+        raise ValueError(f"smote_kdtree hanya untuk klasifikasi biner, ditemukan {len(classes)} kelas")
+
+    minority = classes[np.argmin(counts)]
+    n_min, n_maj = counts.min(), counts.max()
+    n_synthetic = int(round(sampling_strategy * n_maj)) - n_min
+    if n_synthetic <= 0:
+        return X.astype(dtype, copy=False), y
+
+    k = min(k_neighbors, n_min - 1)
+    if k < 1:
+        raise ValueError("Sampel minoritas terlalu sedikit untuk SMOTE (minimal 2)")
+
+    X_min = np.ascontiguousarray(X[y == minority], dtype=dtype)
+    neighbors = _minority_neighbors(X_min, k, algorithm=algorithm, chunk_size=chunk_size)
+
+    n_samples, n_features = X.shape
+    X_res = np.empty((n_samples + n_synthetic, n_features), dtype=dtype)
+    X_res[:n_samples] = X
+
+    rng = np.random.default_rng(random_state)
+    for start in range(0, n_synthetic, chunk_size):
+        m = min(chunk_size, n_synthetic - start)
+        base = rng.integers(0, n_min, size=m)
+        neigh = neighbors[base, rng.integers(0, k, size=m)]
+        gap = rng.random((m, 1), dtype=np.float32).astype(dtype, copy=False)
+
+        # x_baru = x_base + gap * (x_tetangga - x_base), ditulis langsung ke X_res
+        out = X_res[n_samples + start:n_samples + start + m]
+        np.subtract(X_min[neigh], X_min[base], out=out)
+        out *= gap
+        out += X_min[base]
+
+    y_res = np.concatenate([y, np.full(n_synthetic, minority, dtype=y.dtype)])
+    return X_res, y_res
+
+
+# ==========================================
+# PEMILIHAN METODE
+# ==========================================
+def resample_training_data(X, y, method="smote_kdtree", k_neighbors=5, random_state=42, **kwargs):
+    """
+    Seimbangkan data training sesuai metode yang dipilih.
+
+    - "smote_kdtree": SMOTE dengan spatial index (fungsi smote_kdtree)
+    - "smote"       : imblearn.SMOTE (perilaku lama notebook)
+    - "class_weight": tanpa resampling, model memakai class_weight='balanced'
+    - "none"        : tanpa resampling
+    """
+    if method == "smote_kdtree":
+        return smote_kdtree(X, y, k_neighbors=k_neighbors, random_state=random_state, **kwargs)
+    if method == "smote":
+        from imblearn.over_sampling import SMOTE
+        sm = SMOTE(random_state=random_state, k_neighbors=k_neighbors, **kwargs)
+        return sm.fit_resample(X, y)
+    if method in ("class_weight", "none"):
+        return np.asarray(X), np.asarray(y)
+    raise ValueError(f"Metode oversampling tidak dikenal: {method}. Pilih salah satu dari {OVERSAMPLING_METHODS}")
+
+
+def make_balanced_bagging(n_estimators=50, random_state=42, n_jobs=None):
+    """
+    Alternatif tanpa resampling global: setiap estimator dilatih pada
+    bootstrap yang diseimbangkan dengan undersampling kelas mayoritas.
+    """
+    from imblearn.ensemble import BalancedBaggingClassifier
+    from sklearn.tree import DecisionTreeClassifier
+
+    return BalancedBaggingClassifier(
+        estimator=DecisionTreeClassifier(max_depth=10, min_samples_split=5),
+        n_estimators=n_estimators,
+        random_state=random_state,
+        n_jobs=n_jobs
+    )
@@ -0,0 +1,548 @@
+"""
+==========================================================================
+PIPELINE TRAINING SEBAGAI DAG DENGAN CACHE BERBASIS HASH
+==========================================================================
+Tahap-tahap notebook (load -> clean -> features -> split -> preprocess ->
+compact -> resample -> fit/lr_path -> threshold -> calibrate/bmi -> evaluate -> save)
+dideklarasikan sebagai graf dependensi yang bisa dijalankan dari command
+line. Output setiap tahap disimpan di disk dengan kunci hash dari:
+- kode tahap (source fungsi + modul src/ yang dipakainya)
+- parameter yang dipakai tahap tersebut (file input di-hash isinya)
+- kunci tahap-tahap upstream
+- versi numpy/pandas/scikit-learn
+Sehingga hanya tahap yang berubah (dan turunannya) yang dihitung ulang.
+n_jobs tidak masuk kunci: hasil training identik untuk jumlah worker berapa
+pun (lihat training.py). Mulai tahap compact data disimpan ringkas (int8 /
+float32, tanpa teks mentah; lihat frames.py) dan output tahap perantara
+dilepas dari memori begitu semua tahap pemakainya selesai.
+
+Contoh:
+    python src/pipeline.py                    # jalankan sampai save
+    python src/pipeline.py --until fit        # berhenti setelah fit
+    python src/pipeline.py --status           # tahap mana yang sudah di-cache
+    python src/pipeline.py --force fit        # hitung ulang fit dan turunannya
+    python src/pipeline.py --n-jobs 4         # training paralel dengan 4 worker
+==========================================================================
+"""
+
+import argparse
+import hashlib
+import inspect
+import pickle
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.metrics import roc_curve
+from sklearn.model_selection import train_test_split
+
+from calibration import oof_scores, fit_calibration
+from conformal import fit_conformal_cv_plus
+from encoding import ENCODINGS, encode_frame
+from ensemble import fit_ensemble, combine
+from evaluation import bootstrap_report, save_report
+from fairness import slice_frame, sliced_evaluation, flagged_slices
+from frames import compact_frame, peak_rss_mb, preprocess_inplace
+from incremental import init_accumulator
+from monitoring import build_reference
+from multiclass import bmi_category, train_bmi_category_model
+from oversampling import resample_training_data
+from regression import train_bmi_regressor
+from schema import FEATURE_SCHEMA
+from training import make_forest, make_logreg, regularization_path
+
+SRC_DIR = Path(__file__).resolve().parent
+ROOT_DIR = SRC_DIR.parent
+DEFAULT_CACHE_DIR = ROOT_DIR / ".cache" / "pipeline"
+
+DEFAULT_PARAMS = {
+    'data': ROOT_DIR / "data" / "dataset_mentah.csv",
+    'output': ROOT_DIR / "models" / "model_data.pkl",
+    'test_size': 0.2,
+    'random_state': 42,
+    'oversampling': "smote_kdtree",
+    'calibration': "platt",
+    'ensemble': "stacking",
+    'conformal_alpha': 0.1,
+    'bmi_interval_alpha': 0.1,
+    'n_boot': 10_000,
+    'n_jobs': -1
+}
+# Parameter berupa file input: isinya yang di-hash, bukan path-nya
+INPUT_FILE_PARAMS = ('data',)
+
+# Kolom survey mentah -> fitur (notebook tahap 2.4 - 2.6)
+SURVEY_COLUMNS = {
+    'makan_per_hari': "Dalam 7 hari terakhir, rata-rata kamu makan utama (pagi/siang/malam) berapa kali per hari?",
+    'jajan_per_minggu': "Dalam 7 hari terakhir, kira-kira berapa kali kamu jajan (di luar makan utama)?",
+    'fastfood_per_minggu': "Dalam 7 hari terakhir, berapa kali kamu makan fast food / makanan cepat saji",
+    'minuman_manis_per_minggu': "Dalam 7 hari terakhir, berapa gelas/porsi minuman manis (teh manis, minuman bersoda, boba, minuman serbuk manis) yang kamu konsumsi?",
+    'durasi_tidur_jam': "Rata-rata, berapa jam kamu tidur setiap malam?",
+    'makan_setelah_21': "Dalam 7 hari terakhir, berapa kali Anda mengonsumsi makanan utama atau cemilan setelah pukul 21.00?",
+    'durasi_olahraga': "Jika kamu berolahraga, rata-rata berapa menit durasi tiap kali olahraga?",
+    'video_makanan': "Dalam semiggu seberapa sering kamu menonton video makanan di HP/Komputer"
+}
+SCALE_COLUMNS = {
+    'aktivitas_fisik': "Seberapa sering kamu dalam melakukan aktivitas fisik sehari-hari (jalan kaki, naik turun tangga, kegiatan di rumah/sekolah)?",
+    'tingkat_stres': "Seberapa sering kamu merasa stres (karena tugas, sekolah, keluarga, dsb)?",
+    'pengaruh_teman': "Seberapa besar pengaruh teman terhadap kebiasaan kamu jajan/makan (misalnya diajak nongkrong, makan bersama)?",
+    'makan_karena_stres': "Dalam 7 hari terakhir, seberapa sering Anda mengonsumsi makanan akibat perasaan stres?"
+}
+COL_BERAT = "Berapa berat badan kamu sekarang? (dalam kilogram)"
+COL_TINGGI = "Berapa tinggi badan kamu sekarang? (dalam centimeter)"
+COL_KELUARGA = "Apakah ada keluarga Anda yang pernah atau sedang mengalami obesitas?"
+
+
+# ==========================================
+# REGISTRASI TAHAP
+# ==========================================
+@dataclass(frozen=True)
+class Stage:
+    """Satu tahap pipeline"""
+    name: str
+    func: object
+    deps: tuple
+    params: tuple
+    code: tuple
+    cache: bool = True
+
+
+STAGES = {}
+
+
+def stage(*deps, params=(), code=(), cache=True):
+    """
+    Daftarkan fungsi func(inputs, params) sebagai tahap.
+    deps: nama tahap upstream; params: kunci DEFAULT_PARAMS yang dipakai;
+    code: modul src/ (nama), fungsi bantu, atau konstanta data (tuple/dict,
+    di-hash lewat repr) yang ikut menentukan hasil.
+    """
+    def register(func):
+        missing = [d for d in deps if d not in STAGES]
+        if missing:
+            raise ValueError(f"Tahap '{func.__name__}' bergantung pada tahap yang belum terdaftar: {missing}")
+        STAGES[func.__name__] = Stage(func.__name__, func, tuple(deps), tuple(params), tuple(code), cache)
+        return func
+    return register
+
+
+# ==========================================
+# FUNGSI BANTU
+# ==========================================
+def clean_numeric(values):
+    """Versi vektor clean_numeric notebook: buang satuan, koma -> titik, lalu ke float"""
+    text = values.astype(str).str.lower()
+    for unit in ["kg", "cm", "tahun", "th", "jam", "kilogram", "centimeter"]:
+        text = text.str.replace(unit, "", regex=False)
+    return pd.to_numeric(text.str.replace(",", ".", regex=False).str.strip(), errors='coerce')
+
+
+def find_optimal_threshold(y_true, y_prob):
+    """Threshold optimal dengan Youden's J statistic (notebook tahap 8)"""
+    fpr, tpr, thresholds = roc_curve(y_true, y_prob)
+    return thresholds[np.argmax(tpr - fpr)]
+
+
+def _resampler(params):
+    method = params['oversampling']
+
+    def resample(X, y):
+        k_neighbors = max(1, min(5, int(np.sum(y)) - 1))
+        return resample_training_data(X, y, method=method, k_neighbors=k_neighbors,
+                                      random_state=params['random_state'])
+    return resample
+
+
+# ==========================================
+# TAHAP-TAHAP
+# ==========================================
+@stage(params=('data',))
+def load(inputs, params):
+    """Tahap 1: baca CSV mentah, buang kolom kosong, isi NaN (median / modus)"""
+    df = pd.read_csv(params['data'], encoding='latin1')
+    df = df.dropna(axis=1, how="all")
+    for col in df.columns[df.isnull().any()]:
+        if pd.api.types.is_numeric_dtype(df[col]):
+            df[col] = df[col].fillna(df[col].median())
+        elif pd.api.types.is_object_dtype(df[col]):
+            mode = df[col].mode()
+            df[col] = df[col].fillna(mode[0] if len(mode) else "NULL_FILLED")
+    return df
+
+
+@stage('load', code=(clean_numeric, "encoding", "normalizer",
+                     (SURVEY_COLUMNS, SCALE_COLUMNS, COL_BERAT, COL_TINGGI)))
+def clean(inputs, params):
+    """Tahap 2: kolom numerik, mapping kategori, filter data valid dan BMI"""
+    df = inputs['load'].copy()
+    df["berat_kg"] = clean_numeric(df[COL_BERAT])
+    df["tinggi_cm"] = clean_numeric(df[COL_TINGGI])
+    df["usia_tahun"] = clean_numeric(df["Usia"])
+
+    mapped, unmapped = encode_frame(df, SURVEY_COLUMNS)
+    df[mapped.columns] = mapped
+    if len(unmapped):
+        print("  Variasi jawaban yang tidak dikenal:")
+        print("  " + unmapped.to_string(index=False).replace("\n", "\n  "))
+    for feature, col in SCALE_COLUMNS.items():
+        if col in df.columns:
+            df[feature] = pd.to_numeric(df[col], errors='coerce')
+
+    df = df[df["berat_kg"].between(20, 200, inclusive='neither') & df["tinggi_cm"].between(100, 220, inclusive='neither')]
+    df = df.assign(BMI=df["berat_kg"] / ((df["tinggi_cm"] / 100) ** 2))
+    return df[df["BMI"].between(10, 60)]
+
+
+@stage('clean', code=("multiclass", "encoding", "normalizer", (COL_KELUARGA,)))
+def features(inputs, params):
+    """Tahap 3: kategori BMI, label obesitas, encoding dan isi nilai kosong (= dataset bersih)"""
+    df = inputs['clean'].copy()
+    df["kategori_BMI"] = bmi_category(df["BMI"])
+    df["label_obesitas"] = (df["BMI"] >= 25).astype(int)
+    jenis_kelamin, _ = ENCODINGS["jenis_kelamin"].encode(df["Jenis Kelamin"])
+    df["jenis_kelamin"] = jenis_kelamin.fillna(0).astype(int)
+    if COL_KELUARGA in df.columns:
+        keluarga, _ = ENCODINGS["keluarga_obesitas"].encode(df[COL_KELUARGA])
+        df["keluarga_obesitas"] = keluarga.fillna(0).astype(int)
+    df["usia_tahun"] = df["usia_tahun"].fillna(df["usia_tahun"].median())
+    df["makan_per_hari"] = df["makan_per_hari"].fillna(df["makan_per_hari"].mode()[0])
+    return df.reset_index(drop=True)
+
+
+@stage('features', code=("frames", "schema"))
+def compact(inputs, params):
+    """Tahap 5.0: buang kolom teks mentah, fitur ordinal int8 dan kontinu float32"""
+    return compact_frame(inputs['features'])
+
+
+@stage('compact', params=('test_size', 'random_state'), code=("schema",))
+def split(inputs, params):
+    """Tahap 5.1 - 5.2: susun fitur skema (float32) dan train-test split berstrata"""
+    df = inputs['compact']
+    X = FEATURE_SCHEMA.assemble(df, dtype=np.float32)
+    y = df["label_obesitas"]
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=params['test_size'], random_state=params['random_state'], stratify=y
+    )
+    return {'X_train': X_train, 'X_test': X_test, 'y_train': y_train, 'y_test': y_test}
+
+
+@stage('split', code=("frames",))
+def preprocess(inputs, params):
+    """Tahap 5.3 - 5.4: imputasi median lalu StandardScaler (fit pada training), in-place float32"""
+    data = inputs['split']
+    imputer, scaler, X_train_scaled, X_test_scaled = preprocess_inplace(data['X_train'], data['X_test'])
+    return {'imputer': imputer, 'scaler': scaler, 'X_train_scaled': X_train_scaled, 'X_test_scaled': X_test_scaled}
+
+
+@stage('split', 'preprocess', params=('oversampling', 'random_state'), code=(_resampler, "oversampling"))
+def resample(inputs, params):
+    """Tahap 5.5: oversampling data training"""
+    y_train = np.asarray(inputs['split']['y_train'])
+    X_sm, y_sm = _resampler(params)(inputs['preprocess']['X_train_scaled'], y_train)
+    return {'X': X_sm, 'y': y_sm, 'smote_applied': params['oversampling'] in ("smote", "smote_kdtree")}
+
+
+@stage('resample', params=('random_state',), code=("training",))
+def fit(inputs, params):
+    """Tahap 6 - 7: Logistic Regression dan Random Forest (pohon dilatih paralel)"""
+    X, y = inputs['resample']['X'], inputs['resample']['y']
+    logreg = make_logreg(random_state=params['random_state'])
+    rf = make_forest(n_jobs=params['n_jobs'], random_state=params['random_state']).fit(X, y)
+    # Artifact tidak membawa n_jobs training (prediksi di app tetap satu thread)
+    rf.set_params(n_jobs=None)
+    return {'logreg': logreg.fit(X, y), 'rf': rf}
+
+
+@stage('split', 'preprocess', params=('oversampling', 'random_state'), code=(_resampler, "training", "oversampling"))
+def lr_path(inputs, params):
+    """Tahap 6.1: jalur regularisasi LR (warm start) dengan AUC validasi silang per C"""
+    return regularization_path(
+        inputs['preprocess']['X_train_scaled'], np.asarray(inputs['split']['y_train']),
+        resample=_resampler(params), n_jobs=params['n_jobs'], random_state=params['random_state']
+    )
+
+
+@stage('split', 'preprocess', 'fit', code=(find_optimal_threshold,))
+def threshold(inputs, params):
+    """Tahap 8: probabilitas data uji dan threshold Youden"""
+    X_test = inputs['preprocess']['X_test_scaled']
+    y_test = inputs['split']['y_test']
+    prob_lr = inputs['fit']['logreg'].predict_proba(X_test)[:, 1]
+    prob_rf = inputs['fit']['rf'].predict_proba(X_test)[:, 1]
+    return {
+        'prob_lr': prob_lr,
+        'prob_rf': prob_rf,
+        'threshold_lr': find_optimal_threshold(y_test, prob_lr),
+        'threshold_rf': find_optimal_threshold(y_test, prob_rf)
+    }
+
+
+@stage('split', 'preprocess', 'fit', params=('calibration', 'ensemble', 'conformal_alpha', 'oversampling', 'random_state'),
+       code=(_resampler, find_optimal_threshold, "calibration", "conformal", "ensemble", "oversampling"))
+def calibrate(inputs, params):
+    """Tahap 8.1 - 8.3: skor out-of-fold, kalibrasi, ensemble dan conformal"""
+    X_train = inputs['preprocess']['X_train_scaled']
+    y_train = np.asarray(inputs['split']['y_train'])
+    resample_fold = _resampler(params)
+    # Model LR per fold ikut disimpan untuk conformal CV+
+    oof_lr, folds_lr, models_lr = oof_scores(inputs['fit']['logreg'], X_train, y_train,
+                                             resample=resample_fold, return_models=True)
+    oof_rf = oof_scores(inputs['fit']['rf'], X_train, y_train, resample=resample_fold)
+
+    oof_members = np.column_stack([oof_lr, oof_rf])
+    ensemble = fit_ensemble(oof_members, y_train, method=params['ensemble'])
+    ensemble['threshold'] = float(find_optimal_threshold(y_train, combine(oof_members, ensemble)))
+    return {
+        'calibration_lr': fit_calibration(oof_lr, y_train, method=params['calibration']),
+        'calibration_rf': fit_calibration(oof_rf, y_train, method=params['calibration']),
+        'conformal_lr': fit_conformal_cv_plus(oof_lr, y_train, folds_lr, models_lr,
+                                              alpha=params['conformal_alpha']),
+        'ensemble': ensemble
+    }
+
+
+@stage('compact', 'split', 'preprocess', params=('bmi_interval_alpha',), code=("multiclass", "regression"))
+def bmi(inputs, params):
+    """Tahap 7.2 - 7.3: model kategori BMI dan regresi BMI"""
+    df, data, prep = inputs['compact'], inputs['split'], inputs['preprocess']
+    train_index = data['X_train'].index
+    return {
+        'bmi_category': train_bmi_category_model(prep['X_train_scaled'], df.loc[train_index, "kategori_BMI"]),
+        'bmi_regression': train_bmi_regressor(
+            data['X_train'], df.loc[train_index, "BMI"], prep['imputer'], prep['scaler'],
+            alpha=params['bmi_interval_alpha']
+        )
+    }
+
+
+@stage('compact', 'split', 'threshold', 'calibrate', params=('n_boot', 'random_state'), code=("evaluation", "fairness", "ensemble"))
+def evaluate(inputs, params):
+    """Tahap 9: bootstrap confidence interval dan evaluasi per subgrup"""
+    y_test = inputs['split']['y_test']
+    scores = inputs['threshold']
+    ensemble = inputs['calibrate']['ensemble']
+    prob_ensemble = combine(np.column_stack([scores['prob_lr'], scores['prob_rf']]), ensemble)
+    report = bootstrap_report(
+        y_test,
+        {'logistic_regression': scores['prob_lr'], 'random_forest': scores['prob_rf'], 'ensemble': prob_ensemble},
+        {'logistic_regression': scores['threshold_lr'], 'random_forest': scores['threshold_rf'], 'ensemble': ensemble['threshold']},
+        n_boot=params['n_boot'], random_state=params['random_state']
+    )
+    slice_data = slice_frame(inputs['compact'].loc[inputs['split']['X_test'].index], y_test,
+                             scores['prob_lr'], scores['threshold_lr'])
+    overall, slices = sliced_evaluation(slice_data, min_positives=5)
+    return {'evaluation': report, 'fairness': {'overall': overall, 'ditandai': flagged_slices(slices).to_dict('records')}}
+
+
+@stage('split', 'preprocess', 'resample', 'fit', 'lr_path', 'threshold', 'calibrate', 'bmi', 'evaluate',
+       params=('output',), code=("schema", "incremental", "monitoring", "evaluation"), cache=False)
+def save(inputs, params):
+    """Tahap 11: susun model_data dan tulis artifact + laporan evaluasi"""
+    data, prep, models = inputs['split'], inputs['preprocess'], inputs['fit']
+    features = FEATURE_SCHEMA.names
+    model_data = {
+        'logreg': models['logreg'],
+        'rf': models['rf'],
+        'scaler': prep['scaler'],
+        'imputer': prep['imputer'],
+        'features': features,
+        'schema': FEATURE_SCHEMA.to_dict(),
+        'threshold_lr': inputs['threshold']['threshold_lr'],
+        'threshold_rf': inputs['threshold']['threshold_rf'],
+        'lr_path': inputs['lr_path'],
+        **inputs['calibrate'],
+        **inputs['bmi'],
+        **inputs['evaluate'],
+        'feature_importance': dict(zip(features, models['rf'].feature_importances_)),
+        'smote_applied': inputs['resample']['smote_applied'],
+        'accumulator': init_accumulator(data['X_train'], data['y_train']),
+        'reference_distribution': build_reference(
+            data['X_train'], models['logreg'].predict_proba(prep['X_train_scaled'])[:, 1]
+        )
+    }
+
+    output = Path(params['output'])
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp = output.with_suffix(".tmp")
+    with open(tmp, "wb") as f:
+        pickle.dump(model_data, f)
+    tmp.replace(output)
+    save_report(model_data['evaluation'], output.parent / "evaluation_report.json")
+    return output
+
+
+# ==========================================
+# HASH & CACHE
+# ==========================================
+def _digest(*parts):
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(part if isinstance(part, bytes) else str(part).encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def _code_digest(stage_def):
+    """Hash source fungsi tahap, fungsi bantu, file modul src/ dan konstanta yang dideklarasikan"""
+    parts = [inspect.getsource(stage_def.func)]
+    for item in stage_def.code:
+        if callable(item):
+            parts.append(inspect.getsource(item))
+        elif isinstance(item, str):
+            parts.append((SRC_DIR / f"{item}.py").read_bytes())
+        else:
+            # Konstanta modul pipeline.py (mis. mapping kolom survei)
+            parts.append(repr(item))
+    return _digest(*parts)
+
+
+def _param_digest(name, value):
+    """Nilai parameter; file input di-hash isinya (bukan hanya path-nya)"""
+    if name in INPUT_FILE_PARAMS and Path(value).is_file():
+        return _digest(Path(value).read_bytes())
+    return repr(value)
+
+
+def stage_keys(params, names=None):
+    """Kunci cache setiap tahap (berantai: kunci upstream ikut di-hash)"""
+    versions = f"numpy={np.__version__} pandas={pd.__version__} sklearn={sklearn.__version__}"
+    keys = {}
+    for name, stage_def in STAGES.items():
+        keys[name] = _digest(
+            name, versions, _code_digest(stage_def),
+            *(f"{p}={_param_digest(p, params[p])}" for p in stage_def.params),
+            *(keys[d] for d in stage_def.deps)
+        )
+    return keys if names is None else {n: keys[n] for n in names}
+
+
+def ancestors(targets):
+    """Tahap target beserta semua upstream-nya, dalam urutan topologis"""
+    needed = set()
+    stack = list(targets)
+    while stack:
+        name = stack.pop()
+        if name not in needed:
+            needed.add(name)
+            stack.extend(STAGES[name].deps)
+    return [n for n in STAGES if n in needed]
+
+
+def descendants(names):
+    """Tahap yang disebut beserta semua turunannya"""
+    result = set(names)
+    for name, stage_def in STAGES.items():
+        if any(d in result for d in stage_def.deps):
+            result.add(name)
+    return result
+
+
+def _cache_path(cache_dir, name, key):
+    return Path(cache_dir) / f"{name}-{key[:16]}.pkl"
+
+
+def run(targets=("save",), params=None, cache_dir=DEFAULT_CACHE_DIR, force=()):
+    """
+    Jalankan tahap target. Tahap dengan output ter-cache dimuat dari disk
+    tanpa menyentuh upstream-nya; force menghitung ulang tahap beserta turunannya.
+    Output tahap perantara dilepas setelah tahap terakhir yang memakainya selesai.
+    Mengembalikan dict nama_tahap -> output untuk tahap target.
+    """
+    params = {**DEFAULT_PARAMS, **(params or {})}
+    unknown = [t for t in (*targets, *force) if t not in STAGES]
+    if unknown:
+        raise ValueError(f"Tahap tidak dikenal: {unknown}. Tersedia: {list(STAGES)}")
+    keys = stage_keys(params)
+    forced = descendants(force)
+    plan = ancestors(targets)
+    consumers = {name: sum(name in STAGES[c].deps for c in plan) for name in plan}
+    outputs = {}
+
+    def get(name):
+        if name in outputs:
+            return outputs[name]
+        stage_def = STAGES[name]
+        path = _cache_path(cache_dir, name, keys[name])
+        start = time.perf_counter()
+        if stage_def.cache and name not in forced and path.exists():
+            with open(path, "rb") as f:
+                outputs[name] = pickle.load(f)
+            print(f"[cache ] {name:<11} {time.perf_counter() - start:7.2f}s  {keys[name][:12]}")
+            return outputs[name]
+
+        inputs = {dep: get(dep) for dep in stage_def.deps}
+        start = time.perf_counter()
+        outputs[name] = stage_def.func(inputs, params)
+        print(f"[hitung] {name:<11} {time.perf_counter() - start:7.2f}s  {keys[name][:12]}")
+        del inputs
+        for dep in stage_def.deps:
+            consumers[dep] -= 1
+            if consumers[dep] == 0 and dep not in targets:
+                outputs.pop(dep, None)
+        if stage_def.cache:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            with open(tmp, "wb") as f:
+                pickle.dump(outputs[name], f, protocol=pickle.HIGHEST_PROTOCOL)
+            tmp.replace(path)
+        return outputs[name]
+
+    return {name: get(name) for name in targets}
+
+
+def status(params=None, cache_dir=DEFAULT_CACHE_DIR):
+    """Tabel tahap: dependensi, kunci dan apakah sudah ada di cache"""
+    params = {**DEFAULT_PARAMS, **(params or {})}
+    keys = stage_keys(params)
+    return pd.DataFrame([
+        {
+            'tahap': name,
+            'bergantung_pada': ", ".join(s.deps) or "-",
+            'kunci': keys[name][:12],
+            'status': ("selalu dijalankan" if not s.cache
+                       else "cache" if _cache_path(cache_dir, name, keys[name]).exists() else "perlu dihitung")
+        }
+        for name, s in STAGES.items()
+    ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--until", action="append", choices=list(STAGES), help="Tahap target (default: save)")
+    parser.add_argument("--force", action="append", default=[], choices=list(STAGES), help="Hitung ulang tahap dan turunannya")
+    parser.add_argument("--status", action="store_true", help="Tampilkan status cache tanpa menjalankan")
+    parser.add_argument("--data", type=Path, default=DEFAULT_PARAMS['data'])
+    parser.add_argument("--output", type=Path, default=DEFAULT_PARAMS['output'])
+    parser.add_argument("--clean-output", type=Path, default=None, help="Tulis dataset bersih (output tahap features) ke CSV")
+    parser.add_argument("--cache-dir", type=Path, default=DEFAULT_CACHE_DIR)
+    parser.add_argument("--n-boot", type=int, default=DEFAULT_PARAMS['n_boot'])
+    parser.add_argument("--oversampling", default=DEFAULT_PARAMS['oversampling'])
+    parser.add_argument("--n-jobs", type=int, default=DEFAULT_PARAMS['n_jobs'], help="Worker training (-1 = semua core)")
+    args = parser.parse_args()
+
+    params = {'data': args.data, 'output': args.output, 'n_boot': args.n_boot, 'oversampling': args.oversampling,
+              'n_jobs': args.n_jobs}
+    if args.status:
+        print(status(params, args.cache_dir).to_string(index=False))
+        return
+
+    targets = list(args.until or ["save"])
+    if args.clean_output is not None and "features" not in targets:
+        targets.append("features")
+    outputs = run(targets, params, args.cache_dir, args.force)
+    if args.clean_output is not None:
+        outputs['features'].to_csv(args.clean_output, index=False)
+        print(f"Dataset bersih ditulis ke {args.clean_output}")
+    if "save" in outputs:
+        print(f"Artifact model ditulis ke {outputs['save']}")
+    peak = peak_rss_mb()
+    if peak is not None:
+        print(f"Puncak RSS: {peak:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
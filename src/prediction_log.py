@@ -0,0 +1,213 @@
+"""
+==========================================================================
+LOG PREDIKSI (AUDIT TRAIL)
+==========================================================================
+Setiap hasil prediksi (input, probabilitas LR/RF, threshold, versi model,
+waktu proses) dimasukkan ke antrian lalu ditulis oleh thread latar belakang
+ke SQLite secara batch. Tabel bersifat append-only (UPDATE/DELETE ditolak
+oleh trigger) dan diindeks per sekolah dan tanggal untuk tindak lanjut
+oleh petugas UKS / perawat sekolah. Nama sekolah dinormalisasi sama seperti
+results store (normalize_school), baik saat dicatat maupun saat di-query.
+==========================================================================
+"""
+
+import atexit
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from normalizer import normalize_school
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS predictions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts REAL NOT NULL,
+    tanggal TEXT NOT NULL,
+    sekolah TEXT,
+    kelas TEXT,
+    model_version TEXT,
+    prob_lr REAL,
+    prob_rf REAL,
+    threshold_lr REAL,
+    threshold_rf REAL,
+    pred_lr INTEGER,
+    pred_rf INTEGER,
+    latency_ms REAL,
+    inputs TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_predictions_sekolah_tanggal ON predictions (sekolah, tanggal);
+CREATE INDEX IF NOT EXISTS idx_predictions_tanggal ON predictions (tanggal);
+CREATE TRIGGER IF NOT EXISTS predictions_no_update BEFORE UPDATE ON predictions
+BEGIN SELECT RAISE(ABORT, 'log prediksi bersifat append-only'); END;
+CREATE TRIGGER IF NOT EXISTS predictions_no_delete BEFORE DELETE ON predictions
+BEGIN SELECT RAISE(ABORT, 'log prediksi bersifat append-only'); END;
+"""
+
+_COLUMNS = (
+    'ts', 'tanggal', 'sekolah', 'kelas', 'model_version', 'prob_lr', 'prob_rf',
+    'threshold_lr', 'threshold_rf', 'pred_lr', 'pred_rf', 'latency_ms', 'inputs'
+)
+
+
+def _connect(path):
+    conn = sqlite3.connect(str(path), timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+class PredictionLog:
+    """
+    Penulis log prediksi non-blocking.
+
+    log() hanya memasukkan record ke antrian; thread penulis menulis batch
+    setiap flush_interval detik atau ketika batch_size record terkumpul.
+    """
+
+    def __init__(self, path, batch_size=200, flush_interval=1.0):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        with _connect(self.path) as conn:
+            conn.executescript(_SCHEMA_SQL)
+
+        self._queue = queue.SimpleQueue()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._writer, name="prediction-log", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    # ==========================================
+    # JALUR REQUEST
+    # ==========================================
+    def log(self, inputs, result_lr, result_rf=None, model_version=None,
+            latency_ms=None, sekolah=None, kelas=None, ts=None):
+        """Masukkan satu hasil prediksi ke antrian (tidak menyentuh disk)"""
+        ts = time.time() if ts is None else ts
+        result_rf = result_rf or {}
+        self._queue.put((
+            ts,
+            datetime.fromtimestamp(ts).strftime("%Y-%m-%d"),
+            normalize_school(sekolah),
+            kelas,
+            model_version,
+            float(result_lr['probability']),
+            float(result_rf['probability']) if 'probability' in result_rf else None,
+            float(result_lr['threshold']),
+            float(result_rf['threshold']) if 'threshold' in result_rf else None,
+            int(result_lr['prediction']),
+            int(result_rf['prediction']) if 'prediction' in result_rf else None,
+            latency_ms,
+            json.dumps(inputs, default=float)
+        ))
+
+    # ==========================================
+    # THREAD PENULIS
+    # ==========================================
+    def _take_batch(self, timeout):
+        batch = []
+        try:
+            batch.append(self._queue.get(timeout=timeout))
+        except queue.Empty:
+            return batch
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, conn, batch):
+        placeholders = ", ".join("?" for _ in _COLUMNS)
+        with conn:
+            conn.executemany(
+                f"INSERT INTO predictions ({', '.join(_COLUMNS)}) VALUES ({placeholders})",
+                batch
+            )
+
+    def _writer(self):
+        conn = _connect(self.path)
+        try:
+            while not self._stop.is_set():
+                batch = self._take_batch(self.flush_interval)
+                if batch:
+                    try:
+                        self._write(conn, batch)
+                    except sqlite3.Error:
+                        logger.exception("Gagal menulis %d record log prediksi", len(batch))
+            # Tulis sisa antrian sebelum berhenti
+            while True:
+                batch = self._take_batch(0)
+                if not batch:
+                    break
+                self._write(conn, batch)
+        finally:
+            conn.close()
+
+    def close(self):
+        """Hentikan penulis setelah semua record di antrian tersimpan"""
+        if self._thread.is_alive():
+            self._stop.set()
+            self._thread.join()
+
+    # ==========================================
+    # QUERY
+    # ==========================================
+    def query(self, sekolah=None, start=None, end=None, limit=1000):
+        """
+        Ambil log prediksi, memakai index (sekolah, tanggal).
+        start/end: string 'YYYY-MM-DD' (inklusif).
+        """
+        clauses, params = [], []
+        if sekolah is not None:
+            clauses.append("sekolah = ?")
+            params.append(normalize_school(sekolah))
+        if start is not None:
+            clauses.append("tanggal >= ?")
+            params.append(start)
+        if end is not None:
+            clauses.append("tanggal <= ?")
+            params.append(end)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = f"SELECT * FROM predictions {where} ORDER BY tanggal DESC, id DESC LIMIT ?"
+        params.append(limit)
+
+        conn = _connect(self.path)
+        try:
+            frame = pd.read_sql_query(sql, conn, params=params)
+        finally:
+            conn.close()
+        frame['inputs'] = frame['inputs'].map(json.loads)
+        return frame
+
+    def summary_by_school(self, start=None, end=None):
+        """Jumlah prediksi dan jumlah berisiko per sekolah"""
+        clauses, params = [], []
+        if start is not None:
+            clauses.append("tanggal >= ?")
+            params.append(start)
+        if end is not None:
+            clauses.append("tanggal <= ?")
+            params.append(end)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = (
+            "SELECT sekolah, COUNT(*) AS jumlah_prediksi, SUM(pred_lr) AS jumlah_berisiko, "
+            f"AVG(prob_lr) AS rata_probabilitas FROM predictions {where} "
+            "GROUP BY sekolah ORDER BY jumlah_berisiko DESC"
+        )
+        conn = _connect(self.path)
+        try:
+            return pd.read_sql_query(sql, conn, params=params)
+        finally:
+            conn.close()
@@ -0,0 +1,298 @@
+"""
+==========================================================================
+MODEL REGISTRY - HOT RELOAD & A/B ROUTING
+==========================================================================
+Mengawasi folder artifact (default: models/) dan memuat versi baru di
+thread latar belakang. Versi baru dipasang secara atomik (satu assignment
+referensi), sehingga prediksi yang sedang berjalan tetap memakai versi
+lama sampai selesai. Sebagian trafik dapat diarahkan ke model kandidat,
+dengan metrik latency dan skor per versi.
+
+Routing opsional lewat file registry.json di folder artifact:
+    {"active": "model_data.pkl", "candidate": "model_data_v2.pkl", "candidate_share": 0.1}
+Tanpa registry.json, artifact terbaru (mtime) yang cocok dengan pola
+model_data*.pkl menjadi model aktif; salinan cadangan simpan dengan nama
+lain (mis. backup_model_data.pkl) agar tidak ikut dipromosikan.
+Tulis artifact baru ke file sementara lalu os.replace() agar watcher tidak
+membaca file yang setengah tertulis.
+==========================================================================
+"""
+
+import hashlib
+import json
+import logging
+import pickle
+import random
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+import numpy as np
+
+from schema import check_artifact
+
+logger = logging.getLogger(__name__)
+
+ROUTING_FILE = "registry.json"
+
+
+class ModelVersion:
+    """Satu artifact yang sudah dimuat"""
+
+    def __init__(self, path, mtime, model_data):
+        self.path = Path(path)
+        self.mtime = mtime
+        self.model_data = model_data
+        self.version = f"{self.path.stem}-{int(mtime)}"
+        self.loaded_at = time.time()
+        self._resources = {}
+        self._resource_lock = threading.Lock()
+        self._released = False
+
+    def resource(self, name, factory, release=None):
+        """
+        Objek pendamping versi ini (mis. explainer, monitor drift), dibuat sekali
+        dengan factory(model_data). Registry melepasnya (release(obj)) saat versi
+        tidak lagi aktif/kandidat; versi yang sudah dilepas mengembalikan None.
+        """
+        with self._resource_lock:
+            if self._released:
+                return None
+            if name not in self._resources:
+                self._resources[name] = (factory(self.model_data), release)
+            return self._resources[name][0]
+
+    def release(self):
+        """Lepas semua objek pendamping; dipanggil registry setelah versi diganti"""
+        with self._resource_lock:
+            self._released = True
+            resources, self._resources = self._resources, {}
+        for name, (obj, release) in resources.items():
+            if release is None or obj is None:
+                continue
+            try:
+                release(obj)
+            except Exception:
+                logger.exception("Gagal melepas '%s' milik versi %s", name, self.version)
+
+
+def load_artifact(path):
+    """Muat model_data.pkl dan validasi terhadap skema fitur"""
+    with open(path, "rb") as f:
+        model_data = pickle.load(f)
+    for note in check_artifact(model_data):
+        logger.info("%s: %s", path, note)
+    return model_data
+
+
+class _RouteState:
+    """Snapshot routing yang tidak pernah diubah setelah dibuat"""
+
+    def __init__(self, active, candidate=None, candidate_share=0.0):
+        self.active = active
+        self.candidate = candidate
+        self.candidate_share = candidate_share if candidate is not None else 0.0
+
+
+class ModelRegistry:
+    """
+    Registry model dengan hot reload di latar belakang.
+
+    route() hanya membaca satu referensi snapshot sehingga tidak pernah
+    menunggu proses load; record() menyimpan metrik per versi.
+    """
+
+    def __init__(self, artifact_dir, poll_interval=30.0, candidate_share=None,
+                 pattern="model_data*.pkl", latency_window=1000):
+        self.artifact_dir = Path(artifact_dir)
+        self.poll_interval = poll_interval
+        self.default_candidate_share = candidate_share
+        self.pattern = pattern
+        self.latency_window = latency_window
+
+        self._state = None
+        self._refresh_lock = threading.Lock()
+        self._metrics_lock = threading.Lock()
+        self._metrics = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+        self.refresh()
+
+    # ==========================================
+    # PEMUATAN ARTIFACT
+    # ==========================================
+    def _read_routing(self):
+        path = self.artifact_dir / ROUTING_FILE
+        if not path.exists():
+            return {}
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _scan(self):
+        """Daftar (path, mtime) artifact, terbaru di akhir"""
+        files = [(p, p.stat().st_mtime) for p in self.artifact_dir.glob(self.pattern) if p.is_file()]
+        return sorted(files, key=lambda item: item[1])
+
+    def _routed(self, routing, role, files):
+        """Path artifact yang ditunjuk registry.json (boleh di luar pola), dengan validasi"""
+        name = routing.get(role)
+        if not name:
+            return None
+        path = self.artifact_dir / name
+        if path not in files:
+            if not path.is_file():
+                raise FileNotFoundError(
+                    f"{self.artifact_dir / ROUTING_FILE}: artifact {role} '{name}' tidak ditemukan"
+                )
+            files[path] = path.stat().st_mtime
+        return path
+
+    def _resolve(self, loaded, path, mtime):
+        """Pakai versi yang sudah dimuat jika file tidak berubah, selain itu muat ulang"""
+        for entry in loaded:
+            if entry is not None and entry.path == path and entry.mtime == mtime:
+                return entry
+        return ModelVersion(path, mtime, load_artifact(path))
+
+    def refresh(self):
+        """
+        Periksa folder artifact dan pasang versi baru bila ada.
+        Mengembalikan True jika routing berubah.
+        """
+        with self._refresh_lock:
+            files = dict(self._scan())
+            routing = self._read_routing()
+            active_path = self._routed(routing, 'active', files)
+            candidate_path = self._routed(routing, 'candidate', files)
+            if active_path is None:
+                if not files:
+                    if self._state is None:
+                        raise FileNotFoundError(
+                            f"Tidak ada artifact {self.pattern} di {self.artifact_dir}"
+                        )
+                    return False
+                active_path = max(files, key=files.get)
+            share = routing.get('candidate_share', self.default_candidate_share or 0.0)
+
+            current = self._state
+            loaded = [current.active, current.candidate] if current else []
+            if current is not None:
+                same_active = current.active.path == active_path and current.active.mtime == files.get(active_path)
+                same_candidate = (
+                    (candidate_path is None and current.candidate is None)
+                    or (current.candidate is not None and candidate_path == current.candidate.path
+                        and current.candidate.mtime == files.get(candidate_path))
+                )
+                if same_active and same_candidate and current.candidate_share == (share if candidate_path else 0.0):
+                    return False
+
+            active = self._resolve(loaded, active_path, files[active_path])
+            candidate = None
+            if candidate_path is not None and candidate_path != active_path:
+                candidate = self._resolve(loaded, candidate_path, files[candidate_path])
+
+            # Swap atomik: prediksi yang sedang berjalan tetap memegang snapshot lama
+            self._state = _RouteState(active, candidate, share)
+            logger.info(
+                "Registry: aktif=%s kandidat=%s (share=%.2f)",
+                active.version, candidate.version if candidate else "-", self._state.candidate_share
+            )
+            # Versi yang tidak lagi dilayani: lepas explainer/monitor miliknya
+            for entry in loaded:
+                if entry is not None and entry is not active and entry is not candidate:
+                    entry.release()
+            return True
+
+    # ==========================================
+    # WATCHER LATAR BELAKANG
+    # ==========================================
+    def _watch(self):
+        last_missing = None
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.refresh()
+                last_missing = None
+            except FileNotFoundError as e:
+                # registry.json menunjuk file yang belum ada: catat sekali, bukan tiap poll
+                if str(e) != last_missing:
+                    logger.error("%s; tetap memakai versi aktif", e)
+                last_missing = str(e)
+            except Exception:
+                # Artifact rusak/setengah tertulis: tetap pakai versi lama
+                logger.exception("Gagal memuat artifact baru, tetap memakai versi aktif")
+
+    def start(self):
+        """Jalankan watcher di thread daemon (aman dipanggil berulang)"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._watch, name="model-registry", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_interval + 1)
+
+    # ==========================================
+    # ROUTING & METRIK
+    # ==========================================
+    def route(self, key=None):
+        """
+        Pilih versi model untuk satu request. Dengan key (mis. id sesi) pilihan
+        bersifat sticky; tanpa key dipilih acak sesuai candidate_share.
+        """
+        state = self._state
+        if state.candidate is None or state.candidate_share <= 0:
+            return state.active
+        if key is None:
+            u = random.random()
+        else:
+            digest = hashlib.md5(str(key).encode("utf-8")).digest()
+            u = int.from_bytes(digest[:8], "big") / 2 ** 64
+        return state.candidate if u < state.candidate_share else state.active
+
+    @property
+    def active(self):
+        return self._state.active
+
+    @property
+    def candidate(self):
+        return self._state.candidate
+
+    def record(self, version, latency_s, probability, prediction=None):
+        """Catat latency (detik) dan skor satu prediksi untuk versi tertentu"""
+        with self._metrics_lock:
+            m = self._metrics.get(version)
+            if m is None:
+                m = self._metrics[version] = {
+                    'n': 0, 'score_sum': 0.0, 'positive': 0,
+                    'latency': deque(maxlen=self.latency_window)
+                }
+            m['n'] += 1
+            m['score_sum'] += float(probability)
+            m['positive'] += int(prediction or 0)
+            m['latency'].append(latency_s)
+
+    def metrics(self):
+        """Ringkasan metrik per versi (list of dict)"""
+        state = self._state
+        roles = {state.active.version: 'aktif'}
+        if state.candidate is not None:
+            roles[state.candidate.version] = 'kandidat'
+        rows = []
+        with self._metrics_lock:
+            for version, m in self._metrics.items():
+                latency_ms = np.array(m['latency']) * 1000
+                rows.append({
+                    'versi': version,
+                    'peran': roles.get(version, 'lama'),
+                    'jumlah_prediksi': m['n'],
+                    'rata_skor': m['score_sum'] / m['n'],
+                    'rasio_positif': m['positive'] / m['n'],
+                    'latency_p50_ms': float(np.percentile(latency_ms, 50)),
+                    'latency_p95_ms': float(np.percentile(latency_ms, 95))
+                })
+        return rows
@@ -0,0 +1,96 @@
+"""
+==========================================================================
+REGRESI BMI DENGAN INTERVAL PREDIKSI (CONFORMAL)
+==========================================================================
+Memprediksi BMI kontinu dari fitur gaya hidup, bukan hanya BMI >= 25.
+Ridge regression dilatih pada fitur hasil imputasi + scaling notebook;
+interval prediksi berasal dari kuantil residual out-of-fold (split
+conformal, batas bawah dan atas terpisah karena BMI miring ke kanan).
+
+Imputasi median dan StandardScaler dilipat ke koefisien sehingga
+artifact bekerja langsung pada fitur mentah: isi NaN, satu perkalian
+matriks, lalu tambah kuantil residual untuk interval. Satu juta siswa
+dinilai dalam satu pass vektor.
+==========================================================================
+"""
+
+import numpy as np
+from sklearn.linear_model import Ridge
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+from sklearn.model_selection import KFold
+
+
+def fold_preprocessing(coef, intercept, scaler):
+    """
+    Lipat StandardScaler ke koefisien linear:
+    ((x - mean) / scale) @ w + b = x @ (w / scale) + (b - (mean / scale) @ w)
+    """
+    coef_raw = coef / scaler.scale_
+    return coef_raw, float(intercept - np.dot(scaler.mean_, coef_raw))
+
+
+def conformal_offsets(residuals, alpha):
+    """
+    Kuantil residual bertanda (y - prediksi) untuk interval 1 - alpha,
+    alpha/2 di setiap sisi, dengan koreksi sampel terhingga (n + 1).
+    """
+    r = np.sort(np.asarray(residuals, dtype=np.float64))
+    n = len(r)
+    lo = int(np.floor((n + 1) * alpha / 2)) - 1
+    hi = int(np.ceil((n + 1) * (1 - alpha / 2))) - 1
+    return float(r[max(lo, 0)]), float(r[min(hi, n - 1)])
+
+
+def train_bmi_regressor(X, bmi, imputer, scaler, alpha=0.1, ridge_alpha=1.0,
+                        n_splits=5, random_state=42):
+    """
+    Latih regresi BMI dan ekspor ke array.
+    X: fitur mentah (DataFrame skema); imputer/scaler: yang sudah di-fit di notebook.
+    Residual out-of-fold (KFold) menentukan offset interval; model akhir di-fit pada semua X.
+    """
+    X_scaled = scaler.transform(imputer.transform(X))
+    bmi = np.asarray(bmi, dtype=np.float64)
+
+    oof = np.empty_like(bmi)
+    for train_idx, val_idx in KFold(n_splits, shuffle=True, random_state=random_state).split(X_scaled):
+        fold = Ridge(alpha=ridge_alpha).fit(X_scaled[train_idx], bmi[train_idx])
+        oof[val_idx] = fold.predict(X_scaled[val_idx])
+    q_low, q_high = conformal_offsets(bmi - oof, alpha)
+
+    ridge = Ridge(alpha=ridge_alpha).fit(X_scaled, bmi)
+    coef, intercept = fold_preprocessing(ridge.coef_, ridge.intercept_, scaler)
+    return {
+        'coef': coef.astype(np.float64),
+        'intercept': intercept,
+        'fill': np.asarray(imputer.statistics_, dtype=np.float64),
+        'q_low': q_low,
+        'q_high': q_high,
+        'alpha': alpha,
+        'ridge_alpha': ridge_alpha,
+        'mae_oof': float(np.mean(np.abs(bmi - oof))),
+        'n_samples': int(len(bmi))
+    }
+
+
+def predict_bmi(X, model):
+    """
+    BMI titik dan interval untuk fitur mentah (array/DataFrame kolom urut skema).
+    Mengembalikan (prediksi, batas_bawah, batas_atas), masing-masing (n,).
+    """
+    X = np.asarray(X, dtype=np.float64)
+    X = np.where(np.isnan(X), model['fill'], X)
+    point = X @ model['coef'] + model['intercept']
+    return point, point + model['q_low'], point + model['q_high']
+
+
+def regression_report(bmi_true, point, low, high, obesity_threshold=25.0):
+    """MAE, RMSE, R2, cakupan interval, lebar rata-rata dan akurasi BMI >= 25 dari prediksi titik"""
+    bmi_true = np.asarray(bmi_true, dtype=np.float64)
+    return {
+        'mae': mean_absolute_error(bmi_true, point),
+        'rmse': float(np.sqrt(mean_squared_error(bmi_true, point))),
+        'r2': r2_score(bmi_true, point),
+        'cakupan_interval': float(np.mean((bmi_true >= low) & (bmi_true <= high))),
+        'lebar_interval_rata2': float(np.mean(high - low)),
+        'akurasi_obesitas': float(np.mean((point >= obesity_threshold) == (bmi_true >= obesity_threshold)))
+    }
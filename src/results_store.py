@@ -0,0 +1,320 @@
+"""
+==========================================================================
+RESULTS STORE - DATABASE LOKAL UNTUK LAPORAN PER SEKOLAH
+==========================================================================
+Dataset bersih beserta hasil skoring model disimpan satu kali ke file
+SQLite, dengan index pada sekolah, kelas, jenis kelamin dan level risiko.
+Ringkasan per (sekolah, kelas, jenis kelamin, risiko) dimaterialisasi ke
+tabel tersendiri sehingga query laporan dashboard hanya membaca tabel
+ringkasan berukuran kecil, tidak lagi memuat seluruh CSV ke pandas.
+
+prob_lr adalah skor mentah LR (dasar pred_lr dan level risiko, sama
+dengan app); prob_kalibrasi memakai tabel kalibrasi artifact seperti
+probabilitas yang ditampilkan di kartu hasil, dan menjadi dasar
+rata_probabilitas di laporan. Skala tercatat di meta 'skala_probabilitas'.
+
+Bangun ulang store dari CLI:
+    python src/results_store.py --model models/model_data.pkl \
+        --data data/dataset_bersih.csv --output data/results.sqlite
+==========================================================================
+"""
+
+import argparse
+import re
+import sqlite3
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from calibration import calibrate
+from normalizer import normalize_school
+from schema import FEATURE_SCHEMA
+
+RISK_LEVELS = ("RENDAH", "SEDANG", "TINGGI", "SANGAT TINGGI")
+RISK_BAND = 0.2
+
+# Dimensi laporan yang boleh dipakai untuk GROUP BY / filter
+DIMENSIONS = ("sekolah", "kelas", "jenis_kelamin", "risiko")
+
+_RESULT_COLUMNS = ('sekolah', 'kelas', 'jenis_kelamin', 'label_obesitas', 'prob_lr', 'prob_kalibrasi',
+                   'pred_lr', 'risiko')
+
+# Dinaikkan setiap kali struktur tabel berubah (store lama dibangun ulang)
+STORE_FORMAT = "2"
+
+_KELAS_PATTERN = re.compile(r"^\s*(XII|XI|X)\b")
+
+_SCHEMA_SQL = """
+DROP TABLE IF EXISTS hasil;
+DROP TABLE IF EXISTS ringkasan;
+DROP TABLE IF EXISTS meta;
+CREATE TABLE hasil (
+    id INTEGER PRIMARY KEY,
+    sekolah TEXT,
+    kelas TEXT,
+    jenis_kelamin TEXT,
+    label_obesitas INTEGER,
+    prob_lr REAL,
+    prob_kalibrasi REAL,
+    pred_lr INTEGER,
+    risiko TEXT,
+    {features}
+);
+CREATE INDEX idx_hasil_sekolah_kelas ON hasil (sekolah, kelas);
+CREATE INDEX idx_hasil_kelas ON hasil (kelas);
+CREATE INDEX idx_hasil_jenis_kelamin ON hasil (jenis_kelamin);
+CREATE INDEX idx_hasil_risiko ON hasil (risiko, sekolah);
+CREATE TABLE ringkasan (
+    sekolah TEXT,
+    kelas TEXT,
+    jenis_kelamin TEXT,
+    risiko TEXT,
+    jumlah INTEGER,
+    jumlah_obesitas INTEGER,
+    jumlah_berisiko INTEGER,
+    total_probabilitas REAL
+);
+CREATE INDEX idx_ringkasan_sekolah ON ringkasan (sekolah, kelas);
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+
+# ==========================================
+# NORMALISASI & SKORING
+# ==========================================
+def normalize_kelas(values):
+    """'XI (11)' -> 'XI', 'XII (12)' -> 'XII'; nilai lain dipertahankan"""
+    def _one(value):
+        if pd.isna(value):
+            return None
+        match = _KELAS_PATTERN.match(str(value).upper())
+        return match.group(1) if match else str(value).strip()
+    return [_one(v) for v in values]
+
+
+def normalize_gender(values):
+    """Variasi penulisan ('Laki - Laki', 'Laki-Laki') menjadi 'Laki-laki' / 'Perempuan'"""
+    text = pd.Series(values, dtype=object).astype(str).str.lower().str.replace(r"[\s-]", "", regex=True)
+    return np.where(text.str.startswith("laki"), "Laki-laki",
+                    np.where(text.str.startswith("perempuan"), "Perempuan", None)).tolist()
+
+
+def risk_levels(probability, threshold):
+    """Versi vektor get_risk_level di app.py (pita threshold +/- 0.2)"""
+    p = np.asarray(probability, dtype=np.float64)
+    idx = np.searchsorted([threshold - RISK_BAND, threshold, threshold + RISK_BAND], p, side='right')
+    return np.asarray(RISK_LEVELS, dtype=object)[idx]
+
+
+def probability_scale(model_data):
+    """Label skala prob_kalibrasi / rata_probabilitas untuk artifact ini"""
+    calibration = model_data.get('calibration_lr')
+    return f"terkalibrasi ({calibration['method']})" if calibration is not None else "mentah"
+
+
+def score_dataset(df, model_data):
+    """
+    Skor seluruh dataset dengan Logistic Regression (model utama).
+    Mengembalikan DataFrame siap disimpan: dimensi laporan + fitur + hasil.
+    """
+    X = FEATURE_SCHEMA.assemble(df)
+    X_scaled = model_data['scaler'].transform(model_data['imputer'].transform(X))
+    prob = model_data['logreg'].predict_proba(X_scaled)[:, 1]
+    threshold = model_data.get('threshold_lr', 0.5)
+
+    result = pd.DataFrame({
+        'sekolah': normalize_school(df['Asal Sekolah']).to_numpy(),
+        'kelas': normalize_kelas(df['Kelas']),
+        'jenis_kelamin': normalize_gender(df['Jenis Kelamin']),
+        'label_obesitas': df['label_obesitas'].to_numpy() if 'label_obesitas' in df else None,
+        'prob_lr': prob,
+        'prob_kalibrasi': calibrate(prob, model_data.get('calibration_lr')),
+        'pred_lr': (prob >= threshold).astype(int),
+        'risiko': risk_levels(prob, threshold)
+    })
+    # jenis_kelamin sudah tersimpan sebagai dimensi berlabel
+    features = X.drop(columns=[c for c in X.columns if c in result.columns]).reset_index(drop=True)
+    return pd.concat([result, features], axis=1)
+
+
+# ==========================================
+# STORE
+# ==========================================
+class ResultsStore:
+    """
+    Akses baca/tulis ke file SQLite hasil skoring.
+
+    Query laporan (summary) membaca tabel 'ringkasan' yang sudah
+    diagregasi; daftar siswa (students) memakai index pada tabel 'hasil'.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+
+    def _connect(self):
+        conn = sqlite3.connect(str(self.path), timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def meta(self):
+        """Metadata store (versi model, waktu build, jumlah baris)"""
+        if not self.path.exists():
+            return {}
+        conn = self._connect()
+        try:
+            return dict(conn.execute("SELECT key, value FROM meta").fetchall())
+        except sqlite3.OperationalError:
+            return {}
+        finally:
+            conn.close()
+
+    def build(self, df, model_data, model_version):
+        """Skor df, tulis ulang tabel hasil dan materialisasi ringkasan"""
+        start = time.perf_counter()
+        scored = score_dataset(df, model_data)
+        feature_cols = ",\n    ".join(f"{name} REAL" for name in scored.columns[len(_RESULT_COLUMNS):])
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executescript(_SCHEMA_SQL.format(features=feature_cols))
+                columns = list(scored.columns)
+                conn.executemany(
+                    f"INSERT INTO hasil ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})",
+                    scored.astype(object).where(scored.notna(), None).itertuples(index=False, name=None)
+                )
+                self._refresh_summary(conn)
+                conn.executemany("INSERT INTO meta (key, value) VALUES (?, ?)", [
+                    ('model_version', str(model_version)),
+                    ('format', STORE_FORMAT),
+                    ('skala_probabilitas', probability_scale(model_data)),
+                    ('n_rows', str(len(scored))),
+                    ('threshold_lr', str(model_data.get('threshold_lr', 0.5))),
+                    ('built_at', str(time.time())),
+                    ('build_seconds', f"{time.perf_counter() - start:.3f}")
+                ])
+            conn.execute("ANALYZE")
+        finally:
+            conn.close()
+        return self
+
+    @staticmethod
+    def _refresh_summary(conn):
+        """Materialisasi agregat pada granularitas terkecil (sekolah, kelas, jk, risiko)"""
+        conn.execute("DELETE FROM ringkasan")
+        conn.execute(f"""
+            INSERT INTO ringkasan
+            SELECT {', '.join(DIMENSIONS)},
+                   COUNT(*), SUM(label_obesitas), SUM(pred_lr), SUM(prob_kalibrasi)
+            FROM hasil
+            GROUP BY {', '.join(DIMENSIONS)}
+        """)
+
+    def refresh_summary(self):
+        """Hitung ulang tabel ringkasan setelah tabel hasil diubah"""
+        conn = self._connect()
+        try:
+            with conn:
+                self._refresh_summary(conn)
+        finally:
+            conn.close()
+
+    # ==========================================
+    # QUERY LAPORAN
+    # ==========================================
+    @staticmethod
+    def _where(filters):
+        clauses, params = [], []
+        for name, value in filters.items():
+            if value is None:
+                continue
+            if name not in DIMENSIONS:
+                raise ValueError(f"Filter tidak dikenal: {name}")
+            clauses.append(f"{name} = ?")
+            params.append(value)
+        return (f"WHERE {' AND '.join(clauses)}" if clauses else ""), params
+
+    def summary(self, by=("sekolah",), **filters):
+        """
+        Ringkasan risiko dari tabel ringkasan yang sudah dimaterialisasi.
+        by: subset DIMENSIONS untuk GROUP BY; filters: sekolah=, kelas=, ...
+        """
+        by = list(by)
+        unknown = [b for b in by if b not in DIMENSIONS]
+        if unknown:
+            raise ValueError(f"Dimensi tidak dikenal: {unknown}")
+        where, params = self._where(filters)
+        group = f"GROUP BY {', '.join(by)}" if by else ""
+        select = f"{', '.join(by)}, " if by else ""
+        sql = (
+            f"SELECT {select}SUM(jumlah) AS jumlah_siswa, "
+            "SUM(jumlah_berisiko) AS jumlah_berisiko, "
+            "1.0 * SUM(jumlah_berisiko) / SUM(jumlah) AS persen_berisiko, "
+            "SUM(jumlah_obesitas) AS jumlah_obesitas, "
+            "SUM(total_probabilitas) / SUM(jumlah) AS rata_probabilitas "
+            f"FROM ringkasan {where} {group} ORDER BY jumlah_berisiko DESC"
+        )
+        conn = self._connect()
+        try:
+            return pd.read_sql_query(sql, conn, params=params)
+        finally:
+            conn.close()
+
+    def options(self, dimension):
+        """Nilai unik satu dimensi (untuk pilihan filter di dashboard)"""
+        if dimension not in DIMENSIONS:
+            raise ValueError(f"Dimensi tidak dikenal: {dimension}")
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                f"SELECT DISTINCT {dimension} FROM ringkasan WHERE {dimension} IS NOT NULL ORDER BY 1"
+            ).fetchall()
+        finally:
+            conn.close()
+        return [r[0] for r in rows]
+
+    def students(self, limit=500, **filters):
+        """Daftar baris hasil skoring (memakai index), probabilitas tertinggi dahulu"""
+        where, params = self._where(filters)
+        sql = f"SELECT * FROM hasil {where} ORDER BY prob_lr DESC LIMIT ?"
+        conn = self._connect()
+        try:
+            return pd.read_sql_query(sql, conn, params=params + [limit])
+        finally:
+            conn.close()
+
+
+def ensure_store(path, csv_path, model_data, model_version):
+    """Pakai store yang ada bila dibangun dengan versi model dan format yang sama, selain itu bangun ulang"""
+    store = ResultsStore(path)
+    meta = store.meta()
+    if meta.get('model_version') != str(model_version) or meta.get('format') != STORE_FORMAT:
+        store.build(pd.read_csv(csv_path), model_data, model_version)
+    return store
+
+
+# ==========================================
+# CLI
+# ==========================================
+def main():
+    from registry import load_artifact
+
+    root = Path(__file__).resolve().parent.parent
+    parser = argparse.ArgumentParser(description="Bangun results store SQLite dari dataset bersih")
+    parser.add_argument("--model", default=root / "models" / "model_data.pkl", type=Path)
+    parser.add_argument("--data", default=root / "data" / "dataset_bersih.csv", type=Path)
+    parser.add_argument("--output", default=root / "data" / "results.sqlite", type=Path)
+    args = parser.parse_args()
+
+    version = f"{args.model.stem}-{int(args.model.stat().st_mtime)}"
+    store = ResultsStore(args.output).build(pd.read_csv(args.data), load_artifact(args.model), version)
+    meta = store.meta()
+    print(f"{meta['n_rows']} baris ditulis ke {args.output} ({meta['build_seconds']} s)")
+    print(store.summary(by=("sekolah",)).head(10).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+"""
+==========================================================================
+SKEMA FITUR MODEL
+==========================================================================
+Deklarasi tunggal fitur yang dipakai training, artifact dan aplikasi:
+nama, tipe data, rentang nilai yang diizinkan, sumber encoding (MAPPING_*)
+dan versi skema. Kolom selalu disusun berdasarkan NAMA, bukan posisi,
+sehingga fitur duplikat atau urutan yang bergeser terdeteksi saat load.
+==========================================================================
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+SCHEMA_VERSION = "1.0"
+
+
+class SchemaError(ValueError):
+    """Input atau artifact model tidak sesuai dengan skema fitur"""
+
+
+@dataclass(frozen=True)
+class FeatureSpec:
+    """Spesifikasi satu fitur model"""
+    name: str
+    dtype: str
+    min_value: float
+    max_value: float
+    source: str
+    nullable: bool = True
+
+
+FEATURE_SPECS = (
+    FeatureSpec("usia_tahun", "float64", 10, 25, "input numerik (tahun)"),
+    FeatureSpec("jenis_kelamin", "int8", 0, 1, "Laki-laki=1, Perempuan=0"),
+    FeatureSpec("makan_per_hari", "float64", 1, 4, "MAPPING_MAKAN"),
+    FeatureSpec("minuman_manis_per_minggu", "float64", 1, 12, "MAPPING_MINUMAN"),
+    FeatureSpec("fastfood_per_minggu", "float64", 1, 7, "MAPPING_FASTFOOD"),
+    FeatureSpec("jajan_per_minggu", "float64", 1, 12, "MAPPING_JAJAN"),
+    FeatureSpec("aktivitas_fisik", "int8", 1, 5, "MAPPING_AKTIVITAS"),
+    FeatureSpec("durasi_tidur_jam", "float64", 4, 9, "MAPPING_TIDUR"),
+    FeatureSpec("tingkat_stres", "int8", 1, 5, "MAPPING_STRES"),
+    FeatureSpec("pengaruh_teman", "int8", 1, 5, "MAPPING_TEMAN"),
+    FeatureSpec("keluarga_obesitas", "int8", 0, 1, "Iya=1, Tidak=0"),
+    FeatureSpec("makan_setelah_21", "float64", 0, 6, "MAPPING_MAKAN_MALAM"),
+    FeatureSpec("makan_karena_stres", "int8", 1, 5, "MAPPING_MAKAN_STRES"),
+    FeatureSpec("video_makanan", "float64", 0, 12, "MAPPING_VIDEO_MAKANAN"),
+)
+
+
+class FeatureSchema:
+    """Kumpulan FeatureSpec berversi dengan validasi batch dan penyusunan kolom"""
+
+    def __init__(self, specs, version=SCHEMA_VERSION):
+        names = [s.name for s in specs]
+        duplicates = sorted({n for n in names if names.count(n) > 1})
+        if duplicates:
+            raise SchemaError(f"Skema berisi fitur duplikat: {duplicates}")
+        self.specs = tuple(specs)
+        self.version = version
+        self.names = names
+        self._min = np.array([s.min_value for s in specs], dtype=np.float64)
+        self._max = np.array([s.max_value for s in specs], dtype=np.float64)
+        self._nullable = np.array([s.nullable for s in specs])
+
+    def __getitem__(self, name):
+        return self.specs[self.names.index(name)]
+
+    def to_dict(self):
+        """Representasi ringkas untuk disimpan di artifact model"""
+        return {
+            'version': self.version,
+            'features': [
+                {'name': s.name, 'dtype': s.dtype, 'min': s.min_value,
+                 'max': s.max_value, 'source': s.source, 'nullable': s.nullable}
+                for s in self.specs
+            ]
+        }
+
+    # ==========================================
+    # VALIDASI
+    # ==========================================
+    def check_names(self, features):
+        """Pastikan daftar nama fitur (mis. dari artifact) unik dan sama dengan skema"""
+        features = list(features)
+        duplicates = sorted({f for f in features if features.count(f) > 1})
+        if duplicates:
+            raise SchemaError(f"Fitur duplikat: {duplicates}")
+        missing = [n for n in self.names if n not in features]
+        extra = [f for f in features if f not in self.names]
+        if missing or extra:
+            raise SchemaError(f"Fitur tidak sesuai skema v{self.version}. Hilang: {missing}, tidak dikenal: {extra}")
+
+    def bad_values(self, values):
+        """Matriks boolean (n, d) untuk array berurutan skema: di luar rentang atau NaN pada fitur non-nullable"""
+        values = np.asarray(values, dtype=np.float64)
+        bad = (values < self._min) | (values > self._max)
+        bad |= np.isnan(values) & ~self._nullable
+        return bad
+
+    def validate(self, data):
+        """
+        Validasi batch secara vektor. Mengembalikan DataFrame pelanggaran
+        (kolom: fitur, jumlah_baris, contoh_nilai); kosong jika semua valid.
+        """
+        frame = self.assemble(data)
+        values = frame.to_numpy(dtype=np.float64)
+        bad = self.bad_values(values)
+
+        rows = []
+        for j in np.flatnonzero(bad.any(axis=0)):
+            col_bad = bad[:, j]
+            rows.append({
+                'fitur': self.names[j],
+                'jumlah_baris': int(col_bad.sum()),
+                'contoh_nilai': values[col_bad, j][:5].tolist()
+            })
+        return pd.DataFrame(rows, columns=['fitur', 'jumlah_baris', 'contoh_nilai'])
+
+    def assemble(self, data, validate=False, dtype=np.float64):
+        """
+        Susun input menjadi DataFrame dengan kolom sesuai urutan skema,
+        berdasarkan nama kolom. data: dict, list of dict, atau DataFrame.
+        dtype=np.float32 untuk data training ringkas (lihat frames.py).
+        """
+        if isinstance(data, dict):
+            data = [data]
+        frame = data if isinstance(data, pd.DataFrame) else pd.DataFrame(list(data))
+        if not frame.columns.is_unique:
+            dup = sorted(set(frame.columns[frame.columns.duplicated()]))
+            raise SchemaError(f"Input berisi kolom duplikat: {dup}")
+        missing = [n for n in self.names if n not in frame.columns]
+        if missing:
+            raise SchemaError(f"Input tidak memiliki fitur: {missing}")
+        frame = frame[self.names].apply(pd.to_numeric, errors='coerce').astype(dtype)
+
+        if validate:
+            violations = self.validate(frame)
+            if len(violations):
+                detail = "; ".join(
+                    f"{r.fitur} ({r.jumlah_baris} baris, contoh {r.contoh_nilai})"
+                    for r in violations.itertuples()
+                )
+                raise SchemaError(f"Nilai di luar rentang skema: {detail}")
+        return frame
+
+
+FEATURE_SCHEMA = FeatureSchema(FEATURE_SPECS)
+
+
+# ==========================================
+# VALIDASI & MIGRASI ARTIFACT
+# ==========================================
+def _drop_duplicate_columns(model_data, drop):
+    """
+    Gabungkan kolom duplikat yang identik pada artifact lama secara eksak:
+    koefisien LR dijumlahkan, split RF pada kolom duplikat dialihkan ke
+    kolom pertama, lalu kolom duplikat dihapus dari imputer dan scaler.
+    """
+    from sklearn.tree._tree import Tree
+
+    keep_idx = [i for i in range(len(model_data['features'])) if i not in drop]
+    names = [model_data['features'][i] for i in keep_idx]
+    remap = np.full(len(model_data['features']), -1)
+    remap[keep_idx] = np.arange(len(keep_idx))
+    for d, k in drop.items():
+        remap[d] = remap[k]
+
+    logreg = model_data['logreg']
+    coef = logreg.coef_.copy()
+    for d, k in drop.items():
+        coef[:, k] += coef[:, d]
+    logreg.coef_ = coef[:, keep_idx]
+
+    scaler = model_data['scaler']
+    for attr in ('mean_', 'var_', 'scale_'):
+        setattr(scaler, attr, getattr(scaler, attr)[keep_idx])
+    imputer = model_data['imputer']
+    imputer.statistics_ = imputer.statistics_[keep_idx]
+
+    rf = model_data['rf']
+    for estimator in rf.estimators_:
+        state = estimator.tree_.__getstate__()
+        nodes = state['nodes'].copy()
+        internal = nodes['feature'] >= 0
+        nodes['feature'][internal] = remap[nodes['feature'][internal]]
+        state['nodes'] = nodes
+        tree = Tree(len(names), estimator.tree_.n_classes, estimator.tree_.n_outputs)
+        tree.__setstate__(state)
+        estimator.tree_ = tree
+        estimator.n_features_in_ = len(names)
+        estimator.max_features_ = min(estimator.max_features_, len(names))
+
+    for est in (logreg, scaler, imputer, rf, *rf.estimators_):
+        est.n_features_in_ = len(names)
+        if hasattr(est, 'feature_names_in_'):
+            est.feature_names_in_ = np.array(names, dtype=object)
+
+    if 'feature_importance' in model_data:
+        model_data['feature_importance'] = dict(
+            zip(names, rf.feature_importances_)
+        )
+    model_data['features'] = names
+
+
+def check_artifact(model_data, schema=FEATURE_SCHEMA, migrate_duplicates=True):
+    """
+    Validasi model_data terhadap skema saat load.
+
+    Artifact lama yang menyimpan fitur duplikat (mis. 'aktivitas_fisik' dua
+    kali) hanya dimigrasi bila kolom duplikat terbukti identik (statistik
+    imputer dan scaler sama); selain itu SchemaError dilempar.
+    Mengembalikan daftar pesan migrasi yang dilakukan.
+    """
+    notes = []
+    features = list(model_data['features'])
+    seen, drop = {}, {}
+    for i, name in enumerate(features):
+        if name in seen:
+            drop[i] = seen[name]
+        else:
+            seen[name] = i
+
+    if drop:
+        if not migrate_duplicates:
+            raise SchemaError(f"Artifact berisi fitur duplikat: {sorted({features[i] for i in drop})}")
+        imputer, scaler = model_data['imputer'], model_data['scaler']
+        for d, k in drop.items():
+            same = (
+                np.isclose(imputer.statistics_[d], imputer.statistics_[k])
+                and np.isclose(scaler.mean_[d], scaler.mean_[k])
+                and np.isclose(scaler.scale_[d], scaler.scale_[k])
+            )
+            if not same:
+                raise SchemaError(
+                    f"Fitur duplikat '{features[d]}' (kolom {k} dan {d}) tidak identik; "
+                    "artifact harus dilatih ulang"
+                )
+        _drop_duplicate_columns(model_data, drop)
+        notes.append(f"Fitur duplikat digabung: {sorted({features[i] for i in drop})}")
+
+    schema.check_names(model_data['features'])
+    if list(model_data['features']) != schema.names:
+        raise SchemaError("Urutan fitur artifact berbeda dengan skema; artifact harus dilatih ulang")
+
+    stored = model_data.get('schema')
+    if stored is not None and stored.get('version') != schema.version:
+        raise SchemaError(
+            f"Versi skema artifact ({stored.get('version')}) berbeda dengan aplikasi ({schema.version})"
+        )
+    model_data['schema'] = schema.to_dict()
+    return notes
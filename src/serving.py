@@ -0,0 +1,285 @@
+"""
+==========================================================================
+INTI PREDIKSI BERSAMA DENGAN MICRO-BATCHING
+==========================================================================
+Setiap sesi Streamlit berjalan di thread script sendiri. Tanpa inti
+bersama, setiap klik "Prediksi Risiko Obesitas" menjalankan beberapa
+predict_proba satu baris, sehingga overhead per panggilan NumPy/sklearn
+dibayar ratusan kali saat banyak siswa menekan tombol bersamaan.
+
+PredictionBatcher menampung permintaan dalam antrian. Satu thread worker
+mengambil permintaan pertama, menunggu paling lama max_wait_ms untuk
+permintaan berikutnya (atau sampai max_batch_size), lalu menilai semuanya
+dalam satu inferensi matriks per model (score_batch). Hasil dikembalikan
+ke thread pemanggil lewat Future. Permintaan untuk versi model berbeda
+(A/B routing registry) dinilai sebagai batch terpisah; baris yang tidak
+lolos validasi skema hanya menggagalkan permintaan itu sendiri. Error
+lain saat menilai satu kelompok (mis. artifact hot reload yang rusak)
+diteruskan ke semua Future kelompok itu; worker tetap hidup, dan
+predict() memakai timeout terbatas sehingga sesi tidak menunggu selamanya.
+==========================================================================
+"""
+
+import atexit
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError
+
+import numpy as np
+
+from calibration import calibrate
+from conformal import prediction_sets
+from ensemble import combine
+from multiclass import predict_category_proba
+from regression import predict_bmi
+from schema import FEATURE_SCHEMA, SchemaError
+
+logger = logging.getLogger(__name__)
+
+# Batas tunggu default predict() (detik)
+DEFAULT_TIMEOUT = 10.0
+
+
+def input_row(input_data, schema=FEATURE_SCHEMA):
+    """dict nama_fitur -> nilai menjadi array urut skema (nilai non-numerik -> NaN)"""
+    missing = [n for n in schema.names if n not in input_data]
+    if missing:
+        raise SchemaError(f"Input tidak memiliki fitur: {missing}")
+    row = np.empty(len(schema.names), dtype=np.float64)
+    for j, name in enumerate(schema.names):
+        try:
+            row[j] = float(input_data[name])
+        except (TypeError, ValueError):
+            row[j] = np.nan
+    return row
+
+
+# ==========================================
+# INFERENSI BATCH
+# ==========================================
+def score_batch(X, model_data):
+    """
+    Nilai semua model untuk batch X (n, d) fitur mentah urut skema.
+    Mengembalikan list dict per baris dengan kunci logreg, rf, ensemble,
+    bmi_category, bmi_regression (format sama dengan hasil per siswa di app.py).
+    """
+    imputer, scaler = model_data['imputer'], model_data['scaler']
+    X_scaled = scaler.transform(np.where(np.isnan(X), imputer.statistics_, X))
+
+    prob_lr = model_data['logreg'].predict_proba(X_scaled)[:, 1]
+    prob_rf = model_data['rf'].predict_proba(X_scaled)[:, 1]
+    threshold_lr, threshold_rf = model_data['threshold_lr'], model_data['threshold_rf']
+    calibration_lr, calibration_rf = model_data.get('calibration_lr'), model_data.get('calibration_rf')
+    cal_lr = np.asarray(calibrate(prob_lr, calibration_lr), dtype=np.float64)
+    cal_rf = np.asarray(calibrate(prob_rf, calibration_rf), dtype=np.float64)
+
+    conformal = model_data.get('conformal_lr')
+    sets = prediction_sets(prob_lr, conformal, X_scaled) if conformal is not None else None
+
+    ensemble = model_data.get('ensemble')
+    if ensemble is not None:
+        members = {'logreg': prob_lr, 'rf': prob_rf}
+        scores = np.column_stack([
+            members[name] if name in members else model_data[name].predict_proba(X_scaled)[:, 1]
+            for name in ensemble['members']
+        ])
+        prob_ens = combine(scores, ensemble)
+
+    bmi_model = model_data.get('bmi_category')
+    proba_bmi = predict_category_proba(X_scaled, bmi_model) if bmi_model is not None else None
+    regressor = model_data.get('bmi_regression')
+    if regressor is not None:
+        bmi_point, bmi_low, bmi_high = predict_bmi(X, regressor)
+
+    results = []
+    for i in range(len(X)):
+        result = {
+            'logreg': {
+                'probability': float(prob_lr[i]),
+                'prediction': int(prob_lr[i] >= threshold_lr),
+                'threshold': threshold_lr,
+                'calibrated_probability': float(cal_lr[i]),
+                'calibration': calibration_lr,
+                'prediction_set': int(sets[i]) if sets is not None else None,
+                'conformal': conformal
+            },
+            'rf': {
+                'probability': float(prob_rf[i]),
+                'prediction': int(prob_rf[i] >= threshold_rf),
+                'threshold': threshold_rf,
+                'calibrated_probability': float(cal_rf[i]),
+                'calibration': calibration_rf
+            },
+            'ensemble': None,
+            'bmi_category': None,
+            'bmi_regression': None
+        }
+        if ensemble is not None:
+            result['ensemble'] = {
+                'probability': float(prob_ens[i]),
+                'prediction': int(prob_ens[i] >= ensemble['threshold']),
+                'threshold': ensemble['threshold'],
+                'method': ensemble['method']
+            }
+        if proba_bmi is not None:
+            result['bmi_category'] = {
+                'classes': bmi_model['classes'],
+                'probabilities': proba_bmi[i],
+                'category': bmi_model['classes'][int(np.argmax(proba_bmi[i]))]
+            }
+        if regressor is not None:
+            result['bmi_regression'] = {
+                'bmi': float(bmi_point[i]),
+                'low': float(bmi_low[i]),
+                'high': float(bmi_high[i]),
+                'level': 1 - regressor['alpha']
+            }
+        results.append(result)
+    return results
+
+
+# ==========================================
+# ANTRIAN MICRO-BATCH
+# ==========================================
+class PredictionBatcher:
+    """
+    Inti prediksi thread-safe untuk semua sesi dalam satu proses.
+
+    predict() memblokir thread pemanggil sampai batch yang memuat
+    permintaannya selesai dinilai. max_batch_size=1 sama dengan perilaku
+    tanpa batching (tetap lewat satu worker).
+    """
+
+    def __init__(self, max_batch_size=32, max_wait_ms=5.0, schema=FEATURE_SCHEMA):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size minimal 1")
+        self.max_batch_size = int(max_batch_size)
+        self.max_wait = max(float(max_wait_ms), 0.0) / 1000
+        self.schema = schema
+
+        self._queue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._n_requests = 0
+        self._n_batches = 0
+        self._max_seen = 0
+        self._closed = False
+        self._thread = threading.Thread(target=self._worker, name="prediction-batcher", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    # ==========================================
+    # JALUR REQUEST
+    # ==========================================
+    def submit(self, input_data, model_data):
+        """Masukkan satu input (dict fitur) ke antrian; kembalikan Future berisi dict hasil"""
+        future = Future()
+        if self._closed:
+            raise RuntimeError("PredictionBatcher sudah ditutup")
+        if not self._thread.is_alive():
+            raise RuntimeError("Thread worker PredictionBatcher tidak berjalan")
+        self._queue.put((input_row(input_data, self.schema), model_data, future))
+        return future
+
+    def predict(self, input_data, model_data, timeout=DEFAULT_TIMEOUT):
+        """Hasil semua model untuk satu siswa (memblokir sampai batch selesai atau timeout)"""
+        future = self.submit(input_data, model_data)
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            # Belum dinilai: worker akan melewatinya
+            future.cancel()
+            raise
+
+    def stats(self):
+        """Jumlah permintaan dan batch yang sudah dinilai"""
+        with self._lock:
+            return {
+                'permintaan': self._n_requests,
+                'batch': self._n_batches,
+                'ukuran_batch_rata2': self._n_requests / self._n_batches if self._n_batches else 0.0,
+                'ukuran_batch_maks': self._max_seen
+            }
+
+    def close(self, timeout=5.0):
+        """Hentikan worker setelah antrian yang sudah masuk selesai dinilai"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout)
+        # Permintaan yang masuk bersamaan dengan close tidak dibiarkan menunggu selamanya
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None and item[2].set_running_or_notify_cancel():
+                item[2].set_exception(RuntimeError("PredictionBatcher sudah ditutup"))
+
+    # ==========================================
+    # THREAD WORKER
+    # ==========================================
+    def _take_batch(self):
+        """Permintaan pertama (blocking) lalu kumpulkan sampai penuh atau max_wait habis"""
+        first = self._queue.get()
+        if first is None:
+            return [], True
+        batch = [first]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            try:
+                remaining = deadline - time.perf_counter()
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _score(self, items, model_data):
+        # Future yang dibatalkan pemanggil dilewati
+        active = [(row, f) for row, _, f in items if f.set_running_or_notify_cancel()]
+        if not active:
+            return
+        futures = [f for _, f in active]
+        X = np.vstack([row for row, _ in active])
+        bad = self.schema.bad_values(X)
+        valid = ~bad.any(axis=1)
+        for i in np.flatnonzero(~valid):
+            detail = ", ".join(
+                f"{self.schema.names[j]}={X[i, j]}" for j in np.flatnonzero(bad[i])
+            )
+            futures[i].set_exception(SchemaError(f"Nilai di luar rentang skema: {detail}"))
+        if not valid.any():
+            return
+        valid_futures = [f for f, ok in zip(futures, valid) if ok]
+        results = score_batch(X[valid], model_data)
+        for f, result in zip(valid_futures, results):
+            f.set_result(result)
+
+    def _worker(self):
+        stop = False
+        while not stop:
+            batch, stop = self._take_batch()
+            if not batch:
+                continue
+            # Kelompokkan per artifact model (urutan kedatangan dipertahankan)
+            groups = {}
+            for item in batch:
+                groups.setdefault(id(item[1]), []).append(item)
+            for items in groups.values():
+                try:
+                    self._score(items, items[0][1])
+                except Exception as e:
+                    # Seluruh kelompok gagal; Future yang belum selesai menerima error-nya
+                    logger.exception("Gagal menilai batch prediksi")
+                    for _, _, f in items:
+                        if not f.done():
+                            f.set_exception(e)
+            with self._lock:
+                self._n_requests += len(batch)
+                self._n_batches += 1
+                self._max_seen = max(self._max_seen, len(batch))
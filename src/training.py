@@ -0,0 +1,105 @@
+"""
+==========================================================================
+TRAINING PARALEL YANG TETAP DETERMINISTIK
+==========================================================================
+- Random Forest (tahap 7) dilatih paralel dengan n_jobs. Seed setiap pohon
+  diambil berurutan dari random_state SEBELUM pohon dibagi ke worker,
+  sehingga hutan yang dihasilkan identik bit-per-bit untuk n_jobs berapa
+  pun (dicek dengan forest_fingerprint).
+- Logistic Regression (tahap 6) dihitung untuk seluruh jalur regularisasi
+  C sekaligus: C diurutkan dari regularisasi terkuat, setiap fit memakai
+  koefisien C sebelumnya sebagai titik awal (warm start). AUC per C dari
+  validasi silang (fold dijalankan paralel, oversampling per fold).
+==========================================================================
+"""
+
+import hashlib
+
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import StratifiedKFold
+
+# Konfigurasi model notebook tahap 6 - 7
+RF_PARAMS = {'n_estimators': 100, 'class_weight': 'balanced', 'max_depth': 10, 'min_samples_split': 5}
+LR_PARAMS = {'max_iter': 1000, 'class_weight': 'balanced'}
+DEFAULT_CS = np.logspace(-3, 3, 25)
+
+
+def make_forest(n_jobs=None, random_state=42, **overrides):
+    """Random Forest tahap 7; n_jobs tidak mengubah hasil (lihat forest_fingerprint)"""
+    return RandomForestClassifier(**{**RF_PARAMS, **overrides}, random_state=random_state, n_jobs=n_jobs)
+
+
+def make_logreg(C=1.0, random_state=42, **overrides):
+    """Logistic Regression tahap 6"""
+    return LogisticRegression(**{**LR_PARAMS, **overrides}, C=C, random_state=random_state)
+
+
+def forest_fingerprint(rf):
+    """Hash seluruh struktur pohon (fitur, threshold, cabang, nilai leaf)"""
+    h = hashlib.sha256()
+    for estimator in rf.estimators_:
+        tree = estimator.tree_
+        for array in (tree.feature, tree.threshold, tree.children_left, tree.children_right, tree.value):
+            h.update(np.ascontiguousarray(array).tobytes())
+    return h.hexdigest()
+
+
+# ==========================================
+# JALUR REGULARISASI LOGISTIC REGRESSION
+# ==========================================
+def _warm_path(X, y, Cs, random_state):
+    """Fit berurutan untuk setiap C dengan warm start; koefisien (n_C, d) dan intersep"""
+    model = make_logreg(C=Cs[0], random_state=random_state, warm_start=True)
+    coefs, intercepts, n_iter = [], [], []
+    for C in Cs:
+        model.set_params(C=C)
+        model.fit(X, y)
+        coefs.append(model.coef_[0].copy())
+        intercepts.append(float(model.intercept_[0]))
+        n_iter.append(int(model.n_iter_[0]))
+    return np.array(coefs), np.array(intercepts), np.array(n_iter)
+
+
+def _fold_auc(X, y, train_idx, val_idx, Cs, resample, random_state):
+    X_fit, y_fit = X[train_idx], y[train_idx]
+    if resample is not None:
+        X_fit, y_fit = resample(X_fit, y_fit)
+    coefs, intercepts, _ = _warm_path(X_fit, y_fit, Cs, random_state)
+    logits = X[val_idx] @ coefs.T + intercepts
+    return np.array([roc_auc_score(y[val_idx], logits[:, i]) for i in range(len(Cs))])
+
+
+def regularization_path(X, y, Cs=DEFAULT_CS, n_splits=5, resample=None, n_jobs=None, random_state=42):
+    """
+    Jalur regularisasi LR dalam satu panggilan.
+
+    X, y: data training asli (sudah di-scaling); resample(X, y) diterapkan ke
+    setiap fold training dan ke data penuh, seperti oversampling tahap 5.5.
+    Mengembalikan dict: Cs, coef (n_C, d), intercept, n_iter, auc_cv, auc_cv_std, best_C.
+    """
+    X = np.asarray(X, dtype=np.float64)
+    y = np.asarray(y).astype(int)
+    Cs = np.sort(np.asarray(Cs, dtype=np.float64))
+
+    folds = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=random_state).split(X, y)
+    aucs = np.array(Parallel(n_jobs=n_jobs)(
+        delayed(_fold_auc)(X, y, train_idx, val_idx, Cs, resample, random_state)
+        for train_idx, val_idx in folds
+    ))
+
+    X_full, y_full = resample(X, y) if resample is not None else (X, y)
+    coefs, intercepts, n_iter = _warm_path(X_full, y_full, Cs, random_state)
+    mean_auc = aucs.mean(axis=0)
+    return {
+        'Cs': Cs,
+        'coef': coefs,
+        'intercept': intercepts,
+        'n_iter': n_iter,
+        'auc_cv': mean_auc,
+        'auc_cv_std': aucs.std(axis=0),
+        'best_C': float(Cs[np.argmax(mean_auc)])
+    }